@@ -0,0 +1,238 @@
+# ---------------------------------------------------
+# Proyecto: Asteroid
+# Autor: Daryll Lorenzo Alfonso
+# Año: 2025
+# Licencia: MIT License
+# ---------------------------------------------------
+"""
+Línea de comandos para procesar proyectos por lotes, sin ventana.
+
+Cada archivo se procesa en un proceso del pool (Qt en modo offscreen) y el
+resultado se escribe en stdout como una línea JSON:
+
+    {"file": "a.astr", "command": "render", "ok": true, "seconds": 0.41,
+     "output": "out/a.png", "nodes": 12, "edges": 9}
+
+Uso:
+    python -m app.cli validate proyectos/*.astr
+    python -m app.cli convert --to .astrb proyectos/*.astr --output-dir out/
+    python -m app.cli render --format pdf proyectos/*.astr --output-dir out/ --jobs 8
+    python -m app.cli render proyectos/*.astr --profile perfiles/
+    python -m app.cli memory proyecto.astr --cycles 5
+
+El código de salida es 1 si algún archivo falló.
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Any, Dict
+
+from app.core.astr_document import AstrDocument
+from app.log import configure_logging
+from app.profiling import configure_profiling
+
+COMMANDS = ("validate", "convert", "render", "memory")
+
+# Estado de cada proceso del pool (se crea una vez por proceso)
+_worker = {}
+
+
+def _init_worker():
+    """Prepara Qt en modo offscreen; el canvas se crea al primer uso"""
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+
+def _controller():
+    """QApplication, canvas y controller del proceso (reutilizados entre archivos)"""
+    if "controller" not in _worker:
+        _init_worker()
+        from PyQt6.QtWidgets import QApplication
+        from app.ui.canvas import Canvas
+        from app.controllers.canvas_controller import CanvasController
+
+        _worker["app"] = QApplication.instance() or QApplication([])
+        canvas = Canvas()
+        controller = CanvasController(canvas)
+        controller.interactive = False
+        _worker["canvas"] = canvas
+        _worker["controller"] = controller
+    return _worker["controller"]
+
+
+def _output_path(filename: str, output_dir: str, extension: str) -> str:
+    """Ruta de salida: mismo nombre (sin extensiones de proyecto) con la nueva extensión"""
+    name = os.path.basename(filename)
+    for suffix in (".gz", ".xz", ".astrb", ".astr"):
+        if name.endswith(suffix):
+            name = name[:-len(suffix)]
+    directory = output_dir or os.path.dirname(os.path.abspath(filename))
+    return os.path.join(directory, name + extension)
+
+
+def _load(controller, filename: str) -> Dict[str, Any]:
+    controller.last_error = None
+    if not controller.import_from_astr(filename):
+        raise RuntimeError(controller.last_error or "No se pudo cargar el proyecto")
+    return {"nodes": len(controller.nodes), "edges": len(controller.edges)}
+
+
+def _run_validate(filename: str, options: Dict[str, Any]) -> Dict[str, Any]:
+    """Carga el proyecto completo en un canvas offscreen"""
+    controller = _controller()
+    result = _load(controller, filename)
+    controller.hydrate_all_subcanvases()
+    result.update(nodes=len(controller.nodes), edges=len(controller.edges))
+    return result
+
+
+def _run_convert(filename: str, options: Dict[str, Any]) -> Dict[str, Any]:
+    """Reescribe el documento en otro formato (sin Qt)"""
+    from app.utils.astr_format import AstrFormat
+
+    output = _output_path(filename, options["output_dir"], options["to"])
+    if os.path.abspath(output) == os.path.abspath(filename):
+        raise ValueError("El archivo de salida es el mismo que el de entrada")
+
+    scene_data = AstrFormat.read_file(filename)
+    AstrFormat.write_file(scene_data, output)
+    return {
+        "output": output,
+        "nodes": len(scene_data.get("nodes", [])),
+        "edges": len(scene_data.get("edges", [])),
+    }
+
+
+def _run_render(filename: str, options: Dict[str, Any]) -> Dict[str, Any]:
+    """Exporta el diagrama a PNG (export_to_image) o PDF (PDFGenerator)"""
+    controller = _controller()
+    result = _load(controller, filename)
+    output = _output_path(filename, options["output_dir"], "." + options["format"])
+
+    controller.last_error = None
+    if options["format"] == "pdf":
+        from app.utils.pdf_export import PDFGenerator
+        ok = PDFGenerator(controller).export_to_pdf(with_additional_info=options["info"], filename=output)
+    else:
+        ok = controller.export_to_image(output)
+    if not ok:
+        raise RuntimeError(controller.last_error or f"No se pudo exportar {output}")
+
+    result["output"] = output
+    return result
+
+
+def _run_memory(filename: str, options: Dict[str, Any]) -> Dict[str, Any]:
+    """Ciclos cargar -> limpiar: falla si quedan objetos o memoria sin liberar"""
+    from app.utils.memory_diagnostics import MemoryDiagnostics
+
+    report = MemoryDiagnostics.lifecycle(_controller(), filename, options["cycles"])
+    result = {
+        "ok": report["steady"],
+        "steady": report["steady"],
+        "leaked": report["leaked"],
+        "traced_growth_bytes": report["traced_growth_bytes"],
+        "cycles": report["cycles"],
+    }
+    if not report["steady"]:
+        result["top_growth"] = report["top_growth"]
+    return result
+
+
+_RUNNERS = {
+    "validate": _run_validate,
+    "convert": _run_convert,
+    "render": _run_render,
+    "memory": _run_memory,
+}
+
+
+def process_file(command: str, filename: str, options: Dict[str, Any]) -> Dict[str, Any]:
+    """Procesa un archivo y devuelve su línea de resultado (nunca lanza excepciones)"""
+    result = {"file": filename, "command": command}
+    start = time.perf_counter()
+    # Los mensajes del cargador (logging) van a stderr; nada debe mezclarse con las líneas JSON de stdout
+    if options.get("log"):
+        configure_logging(options["log"])
+    if options.get("profile"):
+        configure_profiling(options["profile"])
+    log = sys.stderr if options.get("log") else io.StringIO()
+    try:
+        with contextlib.redirect_stdout(log), contextlib.redirect_stderr(log):
+            result.update(_RUNNERS[command](filename, options))
+        result.setdefault("ok", True)
+    except Exception as e:
+        result["ok"] = False
+        result["error"] = f"{type(e).__name__}: {e}"
+    result["seconds"] = round(time.perf_counter() - start, 4)
+    return result
+
+
+def run(command: str, files, options: Dict[str, Any], jobs: int, out=None) -> int:
+    """Procesa los archivos (en paralelo si jobs > 1). Devuelve cuántos fallaron."""
+    out = out or sys.stdout
+    failures = 0
+
+    def emit(result):
+        nonlocal failures
+        failures += 0 if result["ok"] else 1
+        out.write(json.dumps(result, ensure_ascii=False) + "\n")
+        out.flush()
+
+    if jobs <= 1 or len(files) <= 1:
+        for filename in files:
+            emit(process_file(command, filename, options))
+        return failures
+
+    with ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker) as pool:
+        futures = [pool.submit(process_file, command, filename, options) for filename in files]
+        for future in as_completed(futures):
+            emit(future.result())
+    return failures
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m app.cli", description="Procesa proyectos Asteroid por lotes")
+    parser.add_argument("command", choices=COMMANDS)
+    parser.add_argument("files", nargs="+", help="Proyectos .astr / .astrb (también comprimidos)")
+    parser.add_argument("--jobs", "-j", type=int, default=os.cpu_count() or 1,
+                        help="Procesos en paralelo (por defecto: número de CPUs)")
+    parser.add_argument("--output-dir", "-o", default=None,
+                        help="Directorio de salida (por defecto: junto a cada archivo)")
+    parser.add_argument("--to", default=".astrb",
+                        choices=AstrDocument.EXTENSIONS,
+                        help="convert: formato de destino")
+    parser.add_argument("--format", default="png", choices=("png", "pdf"), help="render: formato de imagen")
+    parser.add_argument("--no-info", dest="info", action="store_false",
+                        help="render --format pdf: sin las tablas de elementos")
+    parser.add_argument("--cycles", type=int, default=3, help="memory: ciclos cargar -> limpiar")
+    parser.add_argument("--verbose", "-v", action="store_const", dest="log", const="info",
+                        help="Mensajes del cargador en stderr (equivale a --log info)")
+    parser.add_argument("--log", default=os.environ.get("ASTEROID_LOG", ""),
+                        help="Niveles de log en stderr, p. ej. 'info' o 'warning,controller=debug'")
+    parser.add_argument("--profile", default=os.environ.get("ASTEROID_PROFILE", ""),
+                        help="Directorio donde escribir perfiles cProfile/tracemalloc de cada operación")
+    args = parser.parse_args(argv)
+
+    if args.output_dir:
+        os.makedirs(args.output_dir, exist_ok=True)
+
+    options = {
+        "output_dir": args.output_dir,
+        "to": args.to,
+        "format": args.format,
+        "info": args.info,
+        "cycles": args.cycles,
+        "log": args.log,
+        "profile": args.profile,
+    }
+    failures = run(args.command, args.files, options, args.jobs)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
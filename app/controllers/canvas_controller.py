@@ -4,17 +4,27 @@
 # Año: 2025
 # Licencia: MIT License
 # ---------------------------------------------------
+from contextlib import contextmanager
 from functools import partial
 from typing import Dict, Tuple
+import copy
+import gc
 import math
 import json
+import time
 from pathlib import Path
-from PyQt6.QtCore import QObject, pyqtSignal, Qt, QPointF
+from PyQt6.QtCore import QObject, pyqtSignal, Qt, QPointF, QThreadPool, QCoreApplication, QTimer
 from PyQt6.QtGui import QKeySequence, QShortcut, QPixmap, QPainter
-from PyQt6.QtWidgets import QFileDialog, QMessageBox
+from PyQt6.QtWidgets import QFileDialog, QMessageBox, QGraphicsScene
 from app.ui.components.entity_item.actor_node_item import ActorNodeItem
 from app.ui.components.entity_item.agent_node_item import AgentNodeItem
 from app.utils.astr_format import AstrFormat
+from app.core.astr_validator import AstrValidator
+from app.log import get_logger
+from app.profiling import profiled, start_session
+from app.utils.change_journal import ChangeJournal
+from app.utils.project_saver import ProjectSaveTask
+from app.utils.project_loader import ProjectLoadTask
 from app.ui.components.dependency_item.simple_edge_item import SimpleArrowItem
 from app.ui.components.dependency_item.dashed_edge_item import DashedArrowItem
 from app.ui.components.dependency_item.dependency_link_edge_item import DependencyLinkArrowItem
@@ -34,6 +44,8 @@ from app.core.models.tropos_element.resource import Resource
 from app.core.models.composite_model_wrapper import CompositeModelWrapper
 from app.ui.components.base_edge_item import BaseEdgeItem
 from app.ui.components.control_point_handle import ControlPointHandle
+from app.ui.node_cache import NodeCache
+from app.ui.edge_update_scheduler import EdgeUpdateScheduler
 
 _NODE_MAP = {
     "actor": ActorNodeItem,
@@ -63,6 +75,33 @@ _ARROW_TYPES = {
     "means_end": MeansEndArrowItem
 }
 
+# Nombres de los formatos en los diálogos
+_FORMAT_NAMES = {
+    ".astr": "Asteroid Files",
+    ".astrb": "Asteroid Binary Files",
+    ".astr.gz": "Asteroid Compressed Files (gzip)",
+    ".astr.xz": "Asteroid Compressed Files (xz)",
+    ".astrb.gz": "Asteroid Compressed Binary Files (gzip)",
+    ".astrb.xz": "Asteroid Compressed Binary Files (xz)",
+}
+
+# Formatos de guardado (extensión -> nombre en el diálogo): los que escribe AstrFormat.write_file
+_SAVE_FORMATS = {extension: _FORMAT_NAMES.get(extension, "Asteroid Files") for extension in AstrFormat.EXTENSIONS}
+
+log = get_logger("controller")
+
+# Carga progresiva: registros por paso y tiempo máximo de cada tramo en el hilo GUI
+_LOAD_STEP = 50
+_LOAD_SLICE_SECONDS = 0.03
+
+# Estado del proyecto que se aparta (y se restaura si la carga falla o se cancela)
+_SCENE_STATE = (
+    "nodes", "edges", "_nodes_by_id", "_edges_by_id",
+    "_collapsed_contents", "_deferred_node_ids", "_deferred_edges", "_deferred_edges_by_node",
+    "_pending_composite_links", "_pending_composite_pairs", "_linked_internal_ids",
+    "journal", "_current_file_path", "_is_modified", "_modification_serial",
+)
+
 class CanvasController(QObject):
     node_selected = pyqtSignal(object)
     selected_node_properties_changed = pyqtSignal(dict)
@@ -71,12 +110,20 @@ class CanvasController(QObject):
     edge_deleted = pyqtSignal(object)
     selection_changed = pyqtSignal(object)
     project_modified = pyqtSignal(bool)
+    save_progress = pyqtSignal(str, int)
+    save_finished = pyqtSignal(str, bool)
+    load_started = pyqtSignal(str)
+    load_progress = pyqtSignal(str, int)
+    load_finished = pyqtSignal(str, bool)
 
     def __init__(self, canvas):
         super().__init__()
         self.canvas = canvas
         self.nodes = []
         self.edges = []
+        # Búsqueda O(1) por id persistente (element_id)
+        self._nodes_by_id: Dict[str, object] = {}
+        self._edges_by_id: Dict[str, object] = {}
 
         # modos
         self.arrow_mode = False
@@ -101,6 +148,41 @@ class CanvasController(QObject):
         self._current_file_path = None
         self._is_modified = False
 
+        # Sin diálogos (herramientas de línea de comandos): los errores quedan en last_error
+        self.interactive = True
+        self.last_error = None
+
+        # Guardado incremental: journal de cambios desde el último snapshot
+        self.journal = ChangeJournal()
+        self.journaled_saves = False
+
+        # Guardado en segundo plano: un solo hilo para que los guardados no se crucen
+        self._save_pool = QThreadPool()
+        self._save_pool.setMaxThreadCount(1)
+        self._save_tasks = set()
+        # Se incrementa con cada modificación; permite saber si hubo cambios durante un guardado
+        self._modification_serial = 0
+
+        # Batch en curso (ver batch()): profundidad y señales pendientes de emitir
+        self._batch_depth = 0
+        self._batch_pending = set()
+        self._batch_index_method = None
+        self._batch_edges_by_node = None  # nodo -> edges (se crea al borrar en un batch)
+
+        # Carga en segundo plano: lectura en un hilo, construcción por tramos en el hilo GUI
+        self._load_pool = QThreadPool()
+        self._load_pool.setMaxThreadCount(1)
+        self._import = None
+
+        # Carga diferida: contenido de subcanvases colapsados que aún no se construyó
+        self._collapsed_contents: Dict[str, list] = {}     # id del contenedor -> registros de nodos
+        self._deferred_node_ids = set()
+        self._deferred_edges: Dict[str, Dict] = {}         # id de edge -> registro
+        self._deferred_edges_by_node: Dict[str, list] = {}
+        self._pending_composite_links: Dict[str, list] = {}  # id del target -> registros composite
+        self._pending_composite_pairs: Dict[str, Dict] = {}  # id del nodo interno -> registro externo
+        self._linked_internal_ids = set()  # Para no vincular el mismo nodo interno dos veces
+
         # conectar señales
         self.canvas.node_dropped.connect(self.add_node)
         self.canvas.arrow_dropped.connect(self.start_arrow_mode)
@@ -111,6 +193,12 @@ class CanvasController(QObject):
         # Configurar atajos de teclado para eliminar
         self._setup_delete_shortcut()
 
+    def report_error(self, message: str):
+        """Muestra un error al usuario (o solo lo registra si no es interactivo)"""
+        self.last_error = message
+        if self.interactive:
+            QMessageBox.critical(self.canvas, "Error", message)
+
     @property
     def is_modified(self):
         return self._is_modified
@@ -119,10 +207,18 @@ class CanvasController(QObject):
     def is_modified(self, value):
         if self._is_modified != value:
             self._is_modified = value
-            self.project_modified.emit(value)
+            self._notify_project_modified()
+
+    def _notify_project_modified(self):
+        """Emite project_modified (en un batch, una sola vez al terminar)"""
+        if self._batch_depth:
+            self._batch_pending.add("modified")
+        else:
+            self.project_modified.emit(self._is_modified)
 
     def mark_as_modified(self):
         """Marca el proyecto como modificado"""
+        self._modification_serial += 1
         self.is_modified = True
 
     def mark_as_saved(self, file_path=None):
@@ -131,6 +227,125 @@ class CanvasController(QObject):
         if file_path:
             self._current_file_path = file_path
 
+    # ---------------------
+    # Transacciones (operaciones en bloque)
+    # ---------------------
+    @contextmanager
+    def batch(self):
+        """
+        Agrupa muchas operaciones sobre la escena:
+
+            with controller.batch():
+                for item in items:
+                    controller.delete_node(item)
+
+        Mientras dura, la escena no mantiene su índice espacial (NoIndex) y
+        project_modified y los cambios de selección se acumulan: al salir se
+        reconstruye el índice una vez y se emite cada señal como mucho una vez.
+        Los batches se pueden anidar.
+        """
+        self._begin_batch()
+        try:
+            yield self
+        finally:
+            self._end_batch()
+
+    def _begin_batch(self):
+        self._batch_depth += 1
+        if self._batch_depth == 1:
+            self._batch_index_method = self.canvas.scene.itemIndexMethod()
+            self.canvas.scene.setItemIndexMethod(QGraphicsScene.ItemIndexMethod.NoIndex)
+
+    def _end_batch(self):
+        self._batch_depth -= 1
+        if self._batch_depth:
+            return
+
+        # Volver al índice original lo reconstruye con todos los items de una vez
+        self.canvas.scene.setItemIndexMethod(self._batch_index_method)
+
+        self._batch_edges_by_node = None
+        pending, self._batch_pending = self._batch_pending, set()
+        if "selection" in pending:
+            self.on_selection_changed()
+        if "modified" in pending:
+            self.project_modified.emit(self._is_modified)
+
+    def wait_for_pending_saves(self):
+        """Bloquea hasta que terminen los guardados en curso y entrega sus resultados"""
+        self._save_pool.waitForDone()
+        QCoreApplication.sendPostedEvents()
+
+    def _on_save_progress(self, filename: str, percent: int):
+        self.save_progress.emit(filename, percent)
+
+    def _on_save_finished(self, task, serial: int, filename: str, success: bool, error: str):
+        """Resultado de un guardado en segundo plano (se ejecuta en el hilo GUI)"""
+        self._save_tasks.discard(task)
+
+        if not success:
+            log.error("❌ Error exportando proyecto: %s", error)
+            # El journal ya se había vaciado contra este snapshot, que no llegó
+            # al disco: sin snapshot, el próximo guardado vuelve a ser completo
+            self.journal.reset(None)
+            self.save_finished.emit(filename, False)
+            self.report_error(f"No se pudo exportar el proyecto:\n{error}")
+            return
+
+        log.info("✅ Proyecto exportado exitosamente: %s", filename)
+        if serial == self._modification_serial:
+            self.mark_as_saved(filename)
+        else:
+            # Hubo cambios mientras se guardaba: el archivo ya es este, pero sigue modificado
+            self._current_file_path = filename
+        self.save_finished.emit(filename, True)
+
+    def set_journaled_saves(self, enabled: bool):
+        """Activa/desactiva el guardado incremental (journal junto al .astr)"""
+        self.journaled_saves = enabled
+
+    def _journal(self, op: str, item):
+        """Anota un cambio de nodo o edge para el próximo guardado incremental"""
+        kind = "edge" if isinstance(item, BaseEdgeItem) else "node"
+        self.journal.record(op, item, kind)
+
+    def get_node(self, element_id):
+        """Devuelve el nodo con ese id persistente (o None)"""
+        return self._nodes_by_id.get(element_id)
+
+    def get_edge(self, element_id):
+        """Devuelve la edge con ese id persistente (o None)"""
+        return self._edges_by_id.get(element_id)
+
+    def _set_element_id(self, item, element_id):
+        """Cambia el id persistente de un item ya registrado (al cargar un archivo)"""
+        table = self._edges_by_id if isinstance(item, BaseEdgeItem) else self._nodes_by_id
+        if table.get(item.element_id) is item:
+            del table[item.element_id]
+        item.element_id = element_id
+        table[element_id] = item
+
+    def _register_node(self, node_item):
+        """Agrega un nodo a la lista del controlador y sigue sus movimientos"""
+        self.nodes.append(node_item)
+        self._nodes_by_id[node_item.element_id] = node_item
+        if hasattr(node_item, "positionChanged"):
+            node_item.positionChanged.connect(partial(self._journal, "move", node_item))
+        self._journal("add", node_item)
+
+    def _register_edge(self, edge_item):
+        """Agrega una edge a la lista del controlador y sigue sus cambios de forma"""
+        self.edges.append(edge_item)
+        self._edges_by_id[edge_item.element_id] = edge_item
+        self._batch_edges_by_node = None
+        edge_item.geometry_edited_callback = partial(self._on_edge_geometry_edited, edge_item)
+        self._journal("add", edge_item)
+
+    def _on_edge_geometry_edited(self, edge_item):
+        """Los control points de una edge cambiaron"""
+        self._journal("move", edge_item)
+        self.mark_as_modified()
+
     def _setup_delete_shortcut(self):
         """Configura el atajo de teclado para eliminar elementos seleccionados"""
         self.delete_shortcut = QShortcut(QKeySequence("Delete"), self.canvas)
@@ -151,6 +366,10 @@ class CanvasController(QObject):
 
     def on_selection_changed(self):
         """Manejar selección considerando subcanvases Y edges - VERSIÓN MEJORADA"""
+        if self._batch_depth:
+            self._batch_pending.add("selection")
+            return
+
         selected_items = self.canvas.scene.selectedItems()
 
         if not selected_items:
@@ -164,7 +383,7 @@ class CanvasController(QObject):
 
         # ✅ VERIFICAR SI ES UN EDGE
         if isinstance(item, BaseEdgeItem):
-            print(f"🔗 Edge seleccionado: {item}")
+            log.debug("🔗 Edge seleccionado: %s", item)
             self.edge_selected.emit(item)
             self.selected_edge = item
             self.selected_node = None
@@ -180,7 +399,7 @@ class CanvasController(QObject):
 
         # ✅ SOLO emitir node_selected si el nodo realmente cambió
         if old_selected_node != item:
-            print(f"🔧 CanvasController: nodo seleccionado cambiado a {item}")
+            log.debug("🔧 CanvasController: nodo seleccionado cambiado a %s", item)
             self.node_selected.emit(item)
 
         # Verificar si el nodo está dentro de un subcanvas
@@ -199,6 +418,7 @@ class CanvasController(QObject):
         if self.current_selection and hasattr(self.current_selection, 'update_properties'):
             # El modelo recibe los cambios (incluyendo content_offset_x/y)
             self.current_selection.update_properties(properties)
+            self._journal("property", self.current_selection)
             
             # Forzamos el redibujado para que el translate en paint() se aplique
             self.current_selection.update() 
@@ -231,12 +451,12 @@ class CanvasController(QObject):
             node_item.model.y = y
         
         self.canvas.scene.addItem(node_item)
-        self.nodes.append(node_item)
+        self._register_node(node_item)
 
         if hasattr(node_item, "properties_changed"):
             node_item.properties_changed.connect(self.on_node_properties_changed)
         else:
-            print(f"⚠️ Advertencia: El nodo {node_type} no tiene señal properties_changed")
+            log.warning("⚠️ Advertencia: El nodo %s no tiene señal properties_changed", node_type)
 
         if hasattr(node_item, "subcanvas_toggled"):
             node_item.subcanvas_toggled.connect(self._on_subcanvas_toggled)
@@ -253,6 +473,8 @@ class CanvasController(QObject):
             
         if node_item == self.selected_node or (hasattr(node_item, '_resizing') and node_item._resizing):
             self.selected_node_properties_changed.emit(properties)
+
+        self._journal("resize" if "radius" in properties else "property", node_item)
         
         # Marcar como modificado cuando cambian las propiedades
         self.mark_as_modified()
@@ -266,20 +488,20 @@ class CanvasController(QObject):
         self._reset_modes()
         self.arrow_mode = True
         self.selected_arrow_type = arrow_type
-        print(f"CanvasController: start global arrow mode '{arrow_type}'")
+        log.debug("CanvasController: start global arrow mode '%s'", arrow_type)
 
     # ---------------------
     # iniciar modo composite (desde sidebar)
     # ---------------------
     def start_composite_dependency_mode(self, node_type: str):
         if node_type not in _NODE_MAP:
-            print(f"CanvasController: unknown composite node_type '{node_type}'")
+            log.debug("CanvasController: unknown composite node_type '%s'", node_type)
             return
         self._reset_modes()
         self.composite_mode = True
         self.composite_node_type = node_type
         self.selected_nodes_for_arrow = []
-        print(f"CanvasController: start composite mode for '{node_type}'. Click two Actor/Agent nodes.")
+        log.debug("CanvasController: start composite mode for '%s'. Click two Actor/Agent nodes.", node_type)
 
     def _reset_modes(self):
         self.arrow_mode = False
@@ -305,7 +527,7 @@ class CanvasController(QObject):
                 node_item = node_item.parentItem()
             
             if node_item is None or not isinstance(node_item, (ActorNodeItem, AgentNodeItem)):
-                print("CanvasController: composite mode - only Actor/Agent selectable; ignored.")
+                log.debug("CanvasController: composite mode - only Actor/Agent selectable; ignored.")
                 return
 
             if node_item not in self.selected_nodes_for_arrow:
@@ -322,7 +544,7 @@ class CanvasController(QObject):
         node_subcanvas = getattr(node_item, "subcanvas_parent", None)
         if self._current_subcanvas:
             if node_subcanvas is not self._current_subcanvas:
-                print("CanvasController: node not in current subcanvas, ignored")
+                log.debug("CanvasController: node not in current subcanvas, ignored")
                 return
 
         if node_item not in self.selected_nodes_for_arrow:
@@ -344,7 +566,7 @@ class CanvasController(QObject):
         self.selected_arrow_type = arrow_type
         self.selected_nodes_for_arrow = []
         self._current_subcanvas = subcanvas
-        print(f"CanvasController: start subarrow mode '{arrow_type}' in {subcanvas}")
+        log.debug("CanvasController: start subarrow mode '%s' in %s", arrow_type, subcanvas)
 
     def create_arrow(self):
         if len(self.selected_nodes_for_arrow) != 2:
@@ -361,11 +583,11 @@ class CanvasController(QObject):
             edge_item.setParentItem(self._current_subcanvas)
             # CRÍTICO: Recalcular después de setParentItem porque el sistema de coordenadas cambia
             edge_item.update_position()
-            print(f"✅ Edge creada dentro de subcanvas: {self._current_subcanvas}")
+            log.info("✅ Edge creada dentro de subcanvas: %s", self._current_subcanvas)
         else:
             self.canvas.scene.addItem(edge_item)
 
-        self.edges.append(edge_item)
+        self._register_edge(edge_item)
 
         self._reset_modes()
         for n in self.nodes:
@@ -388,7 +610,7 @@ class CanvasController(QObject):
         ModelClass = _MODEL_MAP.get(self.composite_node_type)
         
         if not ModelClass:
-            print(f"⚠️ No hay modelo para el tipo '{self.composite_node_type}'")
+            log.warning("⚠️ No hay modelo para el tipo '%s'", self.composite_node_type)
             return None
 
         # Crear nodo externo (canvas principal)
@@ -412,23 +634,22 @@ class CanvasController(QObject):
         # Agregar callback para redibujar nodos cuando cambien propiedades sincronizadas
         def on_model_changed(prop_name, value):
             # Redibujar ambos nodos
-            mid_node.update()
-            if hasattr(internal_node, 'update'):
-                internal_node.update()
+            mid_node.synced_property_changed(prop_name)
+            if hasattr(internal_node, 'synced_property_changed'):
+                internal_node.synced_property_changed(prop_name)
             # Notificar cambio de propiedades para edges conectados
             mid_node.properties_changed.emit(mid_node, {prop_name: value})
         
-        wrapper.add_change_callback(on_model_changed)
-        
         # Crear nodo externo - inicialmente con modelo normal, luego reemplazamos
         mid_node = NodeClass(0, 0)
+        wrapper.add_change_callback(on_model_changed, owner=mid_node)
         mid_node.setPos(mid_x, mid_y)
         # Reemplazar el modelo con el wrapper
         mid_node.model = wrapper
         # ✅ El nodo externo usa el modelo externo como independiente
         mid_node._independent_model = external_model
         self.canvas.scene.addItem(mid_node)
-        self.nodes.append(mid_node)
+        self._register_node(mid_node)
 
         # Crear nodo interno - inicialmente con modelo normal, luego reemplazamos
         internal_node = NodeClass(0, 0)
@@ -442,13 +663,14 @@ class CanvasController(QObject):
         e2 = DependencyLinkArrowItem(mid_node, dst)
         self.canvas.scene.addItem(e1)
         self.canvas.scene.addItem(e2)
-        self.edges.extend([e1, e2])
+        self._register_edge(e1)
+        self._register_edge(e2)
 
         subcanvas = None
         if hasattr(dst, "prepare_subcanvas_for_internal_use"):
             subcanvas = dst.prepare_subcanvas_for_internal_use()
         else:
-            print("⚠️ El nodo destino no soporta subcanvas, se omite la inserción interna.")
+            log.warning("⚠️ El nodo destino no soporta subcanvas, se omite la inserción interna.")
 
         if subcanvas:
             internal_node.setParentItem(subcanvas)
@@ -458,13 +680,15 @@ class CanvasController(QObject):
             internal_node.setVisible(True)
             internal_node.subcanvas_parent = subcanvas
 
-            self.nodes.append(internal_node)
+            self._register_node(internal_node)
+            # El registro del destino ahora incluye su subcanvas
+            self._journal("property", dst)
 
             if not hasattr(dst, "child_nodes"):
                 dst.child_nodes = []
             dst.child_nodes.append(internal_node)
 
-            print(f"✅ Composite: nodo '{self.composite_node_type}' agregado al subcanvas de {dst} en ({offset_x:.1f}, {offset_y:.1f})")
+            log.info("✅ Composite: nodo '%s' agregado al subcanvas de %s en (%.1f, %.1f)", self.composite_node_type, dst, offset_x, offset_y)
 
         for node in self.selected_nodes_for_arrow:
             node.setSelected(False)
@@ -481,14 +705,7 @@ class CanvasController(QObject):
     # ---------------------
     def _on_subcanvas_toggled(self, parent_node_item, subcanvas):
         if subcanvas is None:
-            stored = self._subcanvas_handlers.pop(parent_node_item, None)
-            if stored:
-                prev_subcanvas, handler_node, handler_arrow = stored
-                try:
-                    prev_subcanvas.subnode_dropped.disconnect(handler_node)
-                    prev_subcanvas.subarrow_dropped.disconnect(handler_arrow)
-                except Exception:
-                    pass
+            self._disconnect_subcanvas_handlers(parent_node_item)
             return
 
         stored = self._subcanvas_handlers.get(parent_node_item)
@@ -508,12 +725,27 @@ class CanvasController(QObject):
         subcanvas.subnode_dropped.connect(handler_node)
         subcanvas.subarrow_dropped.connect(handler_arrow)
         self._subcanvas_handlers[parent_node_item] = (subcanvas, handler_node, handler_arrow)
+        self._journal("property", parent_node_item)
 
         try:
             subcanvas.setZValue(parent_node_item.zValue() - 1)
         except Exception:
             pass
 
+        # Primera expansión de un subcanvas cargado colapsado
+        if parent_node_item.element_id in self._collapsed_contents:
+            self._hydrate_subcanvas(parent_node_item)
+
+    def _disconnect_subcanvas_handlers(self, parent_node_item):
+        stored = self._subcanvas_handlers.pop(parent_node_item, None)
+        if stored:
+            prev_subcanvas, handler_node, handler_arrow = stored
+            try:
+                prev_subcanvas.subnode_dropped.disconnect(handler_node)
+                prev_subcanvas.subarrow_dropped.disconnect(handler_arrow)
+            except Exception:
+                pass
+
     def _add_to_subcanvas(self, parent_node_item, subcanvas, item_type: str, local_x: float, local_y: float):
         NodeClass = _NODE_MAP.get(item_type)
         if NodeClass is None:
@@ -528,12 +760,13 @@ class CanvasController(QObject):
         child.setVisible(subcanvas.isVisible())
         child.subcanvas_parent = subcanvas
 
-        self.nodes.append(child)
+        self._register_node(child)
+        self._journal("property", parent_node_item)
 
         if hasattr(child, "properties_changed"):
             child.properties_changed.connect(self.on_node_properties_changed)
         else:
-            print(f"⚠️ Advertencia: nodo interno {item_type} no tiene properties_changed")
+            log.warning("⚠️ Advertencia: nodo interno %s no tiene properties_changed", item_type)
 
         if not hasattr(parent_node_item, "child_nodes"):
             parent_node_item.child_nodes = []
@@ -545,10 +778,8 @@ class CanvasController(QObject):
         return child
 
     def find_node_by_ui(self, ui_item):
-        for n in self.nodes:
-            if n is ui_item:
-                return n
-        return None
+        node = self._nodes_by_id.get(getattr(ui_item, 'element_id', None))
+        return node if node is ui_item else None
 
     # ---------------------
     # Borrado de elementos
@@ -569,13 +800,20 @@ class CanvasController(QObject):
                 self._delete_selected_control_point(item)
                 return
         
+        # Selección múltiple (rubber band): todo en un solo batch
+        removable = [item for item in selected_items
+                     if self.find_node_by_ui(item) is not None or self._edges_by_id.get(getattr(item, 'element_id', None)) is item]
+        if len(removable) > 1:
+            self.delete_items(removable)
+            return
+
         # Comportamiento normal
         if self.selected_edge:
             self.delete_selected_edge()
         elif self.selected_node:
             self.delete_selected_node()
         else:
-            print("⚠️ No hay elemento seleccionado para eliminar")
+            log.warning("⚠️ No hay elemento seleccionado para eliminar")
     
     def _delete_selected_control_point(self, handle: ControlPointHandle):
         """Elimina un control point específico de un edge"""
@@ -591,57 +829,70 @@ class CanvasController(QObject):
             edge.remove_control_point(index)
             # Marcar proyecto como modificado
             self.mark_as_modified()
-            print(f"✅ Control point eliminado del edge {edge}")
+            log.info("✅ Control point eliminado del edge %s", edge)
         except ValueError:
             pass
 
     def delete_selected_node(self):
         """Elimina el nodo actualmente seleccionado"""
         if not self.selected_node:
-            print("⚠️ No hay nodo seleccionado para eliminar")
+            log.warning("⚠️ No hay nodo seleccionado para eliminar")
             return
         
-        print(f"🗑️ Eliminando nodo: {self.selected_node}")
+        log.info("🗑️ Eliminando nodo: %s", self.selected_node)
         self.delete_node(self.selected_node)
 
     def delete_selected_edge(self):
         """Elimina el edge actualmente seleccionado"""
         if not self.selected_edge:
-            print("⚠️ No hay edge seleccionado para eliminar")
+            log.warning("⚠️ No hay edge seleccionado para eliminar")
             return
         
-        print(f"🗑️ Eliminando edge: {self.selected_edge}")
+        log.info("🗑️ Eliminando edge: %s", self.selected_edge)
         self.delete_edge(self.selected_edge)
 
+    def delete_items(self, items):
+        """Elimina varios nodos y edges en un solo batch (primero las edges)"""
+        nodes_before, edges_before = len(self.nodes), len(self.edges)
+        with self.batch():
+            for item in items:
+                if isinstance(item, BaseEdgeItem) and self._edges_by_id.get(item.element_id) is item:
+                    self.delete_edge(item)
+            for item in items:
+                # Los hijos de un nodo ya eliminado desaparecieron con él
+                if not isinstance(item, BaseEdgeItem) and self.find_node_by_ui(item) is not None:
+                    self._delete_node(item)
+        log.info("🗑️ %s nodos y %s edges eliminados", nodes_before - len(self.nodes), edges_before - len(self.edges))
+
     def delete_node(self, node_to_delete):
         """Elimina un nodo específico y todas sus conexiones"""
-        if node_to_delete not in self.nodes:
+        # Las edges y los hijos del nodo se eliminan en el mismo batch
+        with self.batch():
+            self._delete_node(node_to_delete)
+
+    def _delete_node(self, node_to_delete):
+        if self.find_node_by_ui(node_to_delete) is None:
             # Si no está en la lista pero está en la escena, eliminarlo directamente
             if node_to_delete.scene():
-                print(f"✅ Eliminando nodo directamente de la escena (no estaba en lista)")
+                log.debug("✅ Eliminando nodo directamente de la escena (no estaba en lista)")
                 self._remove_node_from_scene(node_to_delete)
                 return
             else:
-                print(f"❌ Nodo no encontrado y no está en escena: {node_to_delete}")
+                log.error("❌ Nodo no encontrado y no está en escena: %s", node_to_delete)
                 return
 
-        print(f"🗑️ Eliminando nodo: {node_to_delete}")
+        log.debug("🗑️ Eliminando nodo: %s", node_to_delete)
 
         # Eliminar todas las flechas conectadas a este nodo
-        edges_to_remove = []
-        for edge in self.edges[:]:
-            if edge.source_node == node_to_delete or edge.dest_node == node_to_delete:
-                edges_to_remove.append(edge)
-        
-        for edge in edges_to_remove:
+        for edge in self._edges_of(node_to_delete):
             self.delete_edge(edge)
 
         # Si el nodo tiene hijos, eliminarlos también
         if hasattr(node_to_delete, 'child_nodes') and node_to_delete.child_nodes:
-            print(f"🔍 Eliminando {len(node_to_delete.child_nodes)} nodos hijos...")
+            log.debug("🔍 Eliminando %s nodos hijos...", len(node_to_delete.child_nodes))
             child_nodes_copy = node_to_delete.child_nodes.copy()
             for child_node in child_nodes_copy:
-                self.delete_node(child_node)
+                self._delete_node(child_node)
 
         # Eliminar subcanvas
         if hasattr(node_to_delete, 'subcanvas') and node_to_delete.subcanvas:
@@ -651,27 +902,48 @@ class CanvasController(QObject):
 
         # Remover el nodo de la escena y de la lista
         self._remove_node_from_scene(node_to_delete)
+        self._release_node(node_to_delete)
         
-        if node_to_delete in self.nodes:
+        if self._nodes_by_id.get(node_to_delete.element_id) is node_to_delete:
+            del self._nodes_by_id[node_to_delete.element_id]
             self.nodes.remove(node_to_delete)
+            self._drop_collapsed_contents(node_to_delete.element_id)
+        self._journal("delete", node_to_delete)
 
         # Limpiar selección
         if node_to_delete == self.selected_node:
             self.selected_node = None
             self.current_selection = None
-            self.node_selected.emit(None)
-            self.selection_changed.emit(None)
+            if self._batch_depth:
+                self._batch_pending.add("selection")
+            else:
+                self.node_selected.emit(None)
+                self.selection_changed.emit(None)
 
         self.node_deleted.emit(node_to_delete)
         
         # Marcar como modificado
         self.mark_as_modified()
         
-        print(f"✅ Nodo eliminado exitosamente: {node_to_delete}")
+        log.debug("✅ Nodo eliminado exitosamente: %s", node_to_delete)
+
+    def _edges_of(self, node):
+        """Edges conectadas a un nodo (en un batch, con un índice que se construye una vez)"""
+        if self._batch_edges_by_node is None:
+            if not self._batch_depth:
+                return [edge for edge in self.edges if edge.source_node == node or edge.dest_node == node]
+            self._batch_edges_by_node = {}
+            for edge in self.edges:
+                self._batch_edges_by_node.setdefault(edge.source_node, []).append(edge)
+                self._batch_edges_by_node.setdefault(edge.dest_node, []).append(edge)
+
+        # El índice conserva las edges ya eliminadas en este batch
+        return [edge for edge in self._batch_edges_by_node.get(node, ())
+                if self._edges_by_id.get(edge.element_id) is edge]
 
     def delete_edge(self, edge_to_delete):
         """Elimina una flecha específica"""
-        if edge_to_delete in self.edges:
+        if self._edges_by_id.get(edge_to_delete.element_id) is edge_to_delete:
             # Limpiar handles y desconectar señales primero
             if hasattr(edge_to_delete, 'cleanup'):
                 edge_to_delete.cleanup()
@@ -679,22 +951,27 @@ class CanvasController(QObject):
             if edge_to_delete.scene():
                 edge_to_delete.scene().removeItem(edge_to_delete)
             self.edges.remove(edge_to_delete)
+            del self._edges_by_id[edge_to_delete.element_id]
+            self._journal("delete", edge_to_delete)
 
             # Limpiar selección
             if edge_to_delete == self.selected_edge:
                 self.selected_edge = None
                 self.current_selection = None
-                self.edge_selected.emit(None)
-                self.selection_changed.emit(None)
+                if self._batch_depth:
+                    self._batch_pending.add("selection")
+                else:
+                    self.edge_selected.emit(None)
+                    self.selection_changed.emit(None)
 
             self.edge_deleted.emit(edge_to_delete)
 
             # Marcar como modificado
             self.mark_as_modified()
 
-            print(f"✅ Flecha eliminada: {edge_to_delete}")
+            log.debug("✅ Flecha eliminada: %s", edge_to_delete)
         else:
-            print(f"⚠️ Edge no encontrado en la lista: {edge_to_delete}")
+            log.warning("⚠️ Edge no encontrado en la lista: %s", edge_to_delete)
     
     def straighten_edge(self, edge):
         """
@@ -703,267 +980,730 @@ class CanvasController(QObject):
         if edge and hasattr(edge, 'clear_control_points'):
             edge.clear_control_points()
             self.mark_as_modified()
-            print(f"✅ Flecha enderezada: {edge}")
+            log.info("✅ Flecha enderezada: %s", edge)
 
     def _remove_node_from_scene(self, node):
         """Elimina un nodo de la escena de forma segura"""
         if node.scene():
             node.scene().removeItem(node)
 
+    def _release_items(self, nodes, edges):
+        """Suelta las referencias de nodos y edges que se descartan (ver _release_node)"""
+        for edge in edges:
+            edge.cleanup()
+        for node in nodes:
+            self._release_node(node)
+
+    def _release_node(self, node):
+        """
+        Suelta lo que mantiene vivo a un nodo eliminado: las conexiones a sus
+        señales (los partial/closures conectados los guarda Qt, fuera del
+        alcance del gc), los handlers de su subcanvas y sus callbacks del
+        CompositeModelWrapper.
+        """
+        self._disconnect_subcanvas_handlers(node)
+        for signal_name in ("positionChanged", "properties_changed", "subcanvas_toggled"):
+            signal = getattr(node, signal_name, None)
+            if signal is None:
+                continue
+            try:
+                signal.disconnect()
+            except TypeError:
+                pass  # Sin conexiones
+
+        model = getattr(node, "model", None)
+        if hasattr(model, "remove_change_callbacks"):
+            model.remove_change_callbacks(node)
+
     # ---------------------
     # Export/Import
     # ---------------------
+    @profiled("save")
     def export_to_astr(self, filename: str = None) -> bool:
-        """Exporta el estado actual del canvas a archivo .astr"""
+        """
+        Exporta el estado actual del canvas a archivo .astr.
+
+        En modo de guardado incremental, si el archivo es el snapshot actual solo
+        se añaden al journal los cambios desde el último guardado.
+
+        El guardado completo termina en segundo plano: devuelve True cuando se
+        inició, y el resultado llega por save_finished / mark_as_saved.
+        """
         try:
             if not filename:
-                filename, _ = QFileDialog.getSaveFileName(
+                filename, selected_filter = QFileDialog.getSaveFileName(
                     self.canvas, 
                     "Exportar como .astr", 
                     "", 
-                    "Asteroid Files (*.astr)"
+                    ";;".join(f"{name} (*{extension})" for extension, name in _SAVE_FORMATS.items())
                 )
                 if not filename:
                     return False
                 
-                if not filename.endswith('.astr'):
-                    filename += '.astr'
-            
-            # Serializar escena
-            scene_data = AstrFormat.serialize_scene(self.nodes, self.edges)
-            
-            # Guardar archivo
-            with open(filename, 'w', encoding='utf-8') as f:
-                json.dump(scene_data, f, indent=2, ensure_ascii=False)
-            
-            print(f"✅ Proyecto exportado exitosamente: {filename}")
-            
-            # Marcar como guardado
-            self.mark_as_saved(filename)
+                if not filename.endswith(tuple(_SAVE_FORMATS)):
+                    extension = next((ext for ext in _SAVE_FORMATS if f"(*{ext})" in selected_filter), '.astr')
+                    filename += extension
             
+            # Un guardado completo pendiente reemplaza el snapshot y borra su journal
+            self.wait_for_pending_saves()
+
+            if self.journaled_saves and self.journal.can_append(filename):
+                written = self.journal.append_pending()
+                if self.journal.needs_compaction():
+                    self.journal.compact_in_background()
+                log.info("✅ %s cambios añadidos al journal de %s", written, filename)
+                self.mark_as_saved(filename)
+                return True
+
+            # No reescribir el snapshot mientras se compacta
+            self.journal.wait_for_compaction()
+
+            # Snapshot de datos planos en el hilo GUI (lo único que necesita los items)
+            scene_data = self.serialize_scene()
+
+            # Los cambios posteriores se anotan contra este snapshot
+            self.journal.reset(filename)
+
+            # Codificar, escribir, fsync y rename en segundo plano
+            task = ProjectSaveTask(scene_data, filename)
+            task.signals.progress.connect(self._on_save_progress)
+            task.signals.finished.connect(partial(self._on_save_finished, task, self._modification_serial))
+            self._save_tasks.add(task)
+            self._save_pool.start(task)
+
+            log.info("🔧 Guardando proyecto en segundo plano: %s", filename)
             return True
             
         except Exception as e:
-            print(f"❌ Error exportando proyecto: {e}")
-            QMessageBox.critical(self.canvas, "Error", f"No se pudo exportar el proyecto:\n{e}")
+            log.error("❌ Error exportando proyecto: %s", e)
+            self.report_error(f"No se pudo exportar el proyecto:\n{e}")
             return False
 
+    @profiled("load")
     def import_from_astr(self, filename: str = None) -> bool:
         """Importa un proyecto desde archivo .astr - VERSIÓN MEJORADA CON JERARQUÍA COMPLETA"""
         try:
             if not filename:
-                filename, _ = QFileDialog.getOpenFileName(
-                    self.canvas,
-                    "Cargar proyecto .astr",
-                    "",
-                    "Asteroid Files (*.astr)"
-                )
+                filename = self._ask_project_to_open()
                 if not filename:
                     return False
 
-            print(f"🔧 Cargando proyecto desde: {filename}")
+            log.info("🔧 Cargando proyecto desde: %s", filename)
 
-            # Cargar archivo
-            with open(filename, 'r', encoding='utf-8') as f:
-                scene_data = json.load(f)
+            # Cargar archivo (JSON o binario) con los cambios de su journal, validarlo e indexarlo
+            self.wait_for_pending_saves()
+            self.journal.wait_for_compaction()
+            prepared = ProjectLoadTask.prepare(filename)
+            if not self._check_prepared_project(prepared):
+                return False
 
-            print(f"📊 Proyecto contiene: {len(scene_data.get('nodes', []))} nodos, {len(scene_data.get('edges', []))} edges")
+            # ✅ Construir la escena nueva; si algo falla se restaura la anterior
+            gc_was_enabled = self._pause_gc()
+            try:
+                with self.batch():
+                    previous = self._detach_scene()
+                    try:
+                        for _ in self._build_project(filename, prepared):
+                            pass
+                    except Exception:
+                        self._restore_scene(previous)
+                        raise
+                    self._release_items(previous["nodes"], previous["edges"])
+            finally:
+                self._resume_gc(gc_was_enabled)
+            return True
 
-            # Limpiar canvas actual
-            self.clear_canvas()
+        except Exception as e:
+            log.exception("❌ Error cargando proyecto: %s", e)
+            self.report_error(f"No se pudo cargar el proyecto:\n{e}")
+            return False
 
-            # ✅ PRIMERA PASADA: Crear todos los nodos
-            node_map = {}
-            parent_child_map = {}  # Mapeo de padres a hijos
+    def import_from_astr_async(self, filename: str = None) -> bool:
+        """
+        Importa un proyecto sin bloquear la interfaz.
 
-            for node_data in scene_data.get('nodes', []):
-                print(f"🔧 Procesando nodo {node_data['id']} de tipo {node_data['type']}")
-                node = self._create_node_from_data(node_data)
-                if node:
-                    node_map[node_data['id']] = node
+        La lectura, validación e indexado se hacen en un hilo (ProjectLoadTask);
+        los items se construyen después en el hilo GUI por tramos de
+        _LOAD_SLICE_SECONDS con un QTimer. Devuelve True si la carga empezó; el
+        avance llega por load_progress y el resultado por load_finished.
+        cancel_import() la detiene y deja la escena anterior como estaba.
+        """
+        if self._import is not None:
+            return False
 
-                    # ✅ Guardar información de jerarquía para segunda pasada
-                    parent_id = node_data.get('parent_id')
-                    if parent_id is not None:
-                        if parent_id not in parent_child_map:
-                            parent_child_map[parent_id] = []
-                        parent_child_map[parent_id].append(node_data['id'])
-                        print(f"✅ Nodo {node_data['id']} es hijo de nodo {parent_id}")
+        if not filename:
+            filename = self._ask_project_to_open()
+            if not filename:
+                return False
 
-            # ✅ SEGUNDA PASADA: Establecer jerarquía (nodos en subcanvas)
-            for parent_id, child_ids in parent_child_map.items():
-                parent_node = node_map.get(parent_id)
-                if parent_node and hasattr(parent_node, 'subcanvas'):
-                    print(f"🔧 Moviendo {len(child_ids)} nodos al subcanvas de nodo {parent_id}")
-                    for child_id in child_ids:
-                        child_node = node_map.get(child_id)
-                        if child_node:
-                            self._move_node_to_subcanvas(child_node, parent_node)
-
-            # ✅ TERCERA PASADA: Reconstruir edges (TODAS, incluyendo las de subcanvas)
-            edge_count = 0
-            edge_parent_map = {}  # ✅ Nuevo: mapeo de edges a sus padres
-
-            for edge_data in scene_data.get('edges', []):
-                edge = self._create_edge_from_data(edge_data, node_map)
-                if edge:
-                    edge_count += 1
-
-                    # ✅ Guardar información de parentezco de edges para cuarta pasada
-                    parent_id = edge_data.get('parent_id')
-                    if parent_id is not None:
-                        edge_parent_map[edge] = parent_id
-                        print(f"✅ Edge conecta {edge_data['source_id']}->{edge_data['target_id']} en subcanvas de {parent_id}")
-
-            # ✅ CUARTA PASADA: Mover edges a subcanvas si es necesario
-            for edge, parent_id in edge_parent_map.items():
-                parent_node = node_map.get(parent_id)
+        log.info("🔧 Cargando proyecto en segundo plano: %s", filename)
+        self.wait_for_pending_saves()
+        self.journal.wait_for_compaction()
+
+        task = ProjectLoadTask(filename)
+        task.signals.prepared.connect(partial(self._on_import_prepared, task))
+        task.signals.failed.connect(partial(self._on_import_failed, task))
+        self._import = {"filename": filename, "task": task, "steps": None, "previous": None, "gc": None,
+                        "profile": None}
+        self.load_started.emit(filename)
+        self._load_pool.start(task)
+        return True
+
+    @property
+    def is_importing(self) -> bool:
+        return self._import is not None
+
+    def cancel_import(self):
+        """Cancela la carga en curso; la escena anterior queda intacta"""
+        load = self._import
+        if load is None:
+            return
+
+        log.info("⚠️ Carga cancelada: %s", load['filename'])
+        if load["steps"] is not None:
+            load["steps"].close()
+            self._restore_scene(load["previous"])
+        # Si aún se está leyendo, el documento preparado se ignora al llegar
+        self._finish_import(False)
+
+    def _ask_project_to_open(self):
+        filename, _ = QFileDialog.getOpenFileName(
+            self.canvas,
+            "Cargar proyecto .astr",
+            "",
+            "Asteroid Files (" + " ".join(f"*{extension}" for extension in _SAVE_FORMATS) + ")"
+        )
+        return filename
+
+    def _check_prepared_project(self, prepared: Dict) -> bool:
+        """Informa de los problemas del documento; False si no se puede cargar"""
+        scene_data = prepared["scene_data"]
+        log.info("📊 Proyecto contiene: %s nodos, %s edges", len(scene_data.get('nodes', [])), len(scene_data.get('edges', [])))
+
+        # ✅ Validado antes de tocar el canvas: un archivo dañado no debe
+        # dejar la escena actual borrada ni a medio construir
+        issues = prepared["issues"]
+        errors = AstrValidator.errors(issues)
+        for issue in issues:
+            if issue["severity"] == "warning":
+                log.warning("⚠️ %s", AstrValidator.format_issue(issue))
+        if errors:
+            details = "\n".join(AstrValidator.format_issue(issue) for issue in errors[:10])
+            if len(errors) > 10:
+                details += f"\n... y {len(errors) - 10} errores más"
+            self.report_error(f"El proyecto no es válido ({len(errors)} errores):\n{details}")
+            return False
+        return True
+
+    def _on_import_prepared(self, task, filename: str, prepared: Dict):
+        """Documento leído en el hilo de carga: empieza la construcción por tramos"""
+        load = self._import
+        if load is None or load["task"] is not task:
+            return  # Carga cancelada mientras se leía (aunque se reabra el mismo archivo)
+
+        if not self._check_prepared_project(prepared):
+            self._finish_import(False)
+            return
+
+        # El batch (y el perfil, con ASTEROID_PROFILE) dura todos los tramos (termina en _finish_import)
+        load["profile"] = start_session("load")
+        self._begin_batch()
+        load["previous"] = self._detach_scene()
+        load["gc"] = self._pause_gc()
+        load["steps"] = self._build_project(filename, prepared)
+        self._continue_import()
+
+    def _on_import_failed(self, task, filename: str, error: str):
+        load = self._import
+        if load is None or load["task"] is not task:
+            return
+
+        log.error("❌ Error cargando proyecto: %s", error)
+        self._finish_import(False)
+        self.report_error(f"No se pudo cargar el proyecto:\n{error}")
+
+    def _continue_import(self):
+        """Construye items durante un tramo y cede el hilo GUI hasta el siguiente"""
+        load = self._import
+        if load is None or load["steps"] is None:
+            return
+
+        deadline = time.perf_counter() + _LOAD_SLICE_SECONDS
+        fraction = 0.0
+        try:
+            while time.perf_counter() < deadline:
+                fraction = next(load["steps"])
+        except StopIteration:
+            self._release_items(load["previous"]["nodes"], load["previous"]["edges"])
+            self._finish_import(True)
+            return
+        except Exception as e:
+            log.error("❌ Error cargando proyecto: %s", e)
+            self._restore_scene(load["previous"])
+            self._finish_import(False)
+            self.report_error(f"No se pudo cargar el proyecto:\n{e}")
+            return
+
+        self.load_progress.emit(load["filename"], int(fraction * 100))
+        QTimer.singleShot(0, self._continue_import)
+
+    def _finish_import(self, success: bool):
+        load, self._import = self._import, None
+        if load["gc"] is not None:
+            self._resume_gc(load["gc"])
+            self._end_batch()
+        if load["profile"] is not None:
+            load["profile"].stop()
+        self.load_finished.emit(load["filename"], success)
+
+    def _build_project(self, filename: str, prepared: Dict):
+        """
+        Construye la escena de un documento preparado (ProjectLoadTask.prepare)
+        sobre un canvas vacío. Es un generador: cada _LOAD_STEP registros cede
+        el control con la fracción construida.
+        """
+        scene_data, index = prepared["scene_data"], prepared["index"]
+
+        # ✅ El contenido de los subcanvases colapsados queda como registros
+        # hasta que se expandan (ver _hydrate_subcanvas)
+        self._defer_collapsed_contents(scene_data, index)
+        node_records = [n for n in scene_data.get('nodes', []) if n['id'] not in self._deferred_node_ids]
+        edge_records = [e for e in scene_data.get('edges', []) if e['id'] not in self._deferred_edges]
+
+        # Los nodos se crean, se colocan en su subcanvas y luego se crean las edges
+        total = 2 * len(node_records) + len(edge_records) or 1
+        done = 0
+
+        # ✅ Crear nodos (con su jerarquía) y edges
+        created = []
+        for start in range(0, len(node_records), _LOAD_STEP):
+            created.extend(self._create_nodes_from_records(node_records[start:start + _LOAD_STEP]))
+            done += len(node_records[start:start + _LOAD_STEP])
+            yield done / total
+        for start in range(0, len(created), _LOAD_STEP):
+            self._place_nodes_in_subcanvases(created[start:start + _LOAD_STEP])
+            done += len(created[start:start + _LOAD_STEP])
+            yield done / total
+        edge_count = 0
+        for start in range(0, len(edge_records), _LOAD_STEP):
+            edge_count += self._build_edges_from_records(edge_records[start:start + _LOAD_STEP])
+            done += len(edge_records[start:start + _LOAD_STEP])
+            yield done / total
+
+        # ✅ Vincular nodos composite internos con externos
+        # Esto debe hacerse DESPUÉS de crear los edges para poder buscar el target
+        self._link_composite_nodes(index)
+
+        log.info("✅ Proyecto cargado exitosamente: %s", filename)
+        log.info("📊 Resumen: %s nodos, %s edges reconstruidos (%s nodos en subcanvases colapsados)", len(created), edge_count, len(self._deferred_node_ids))
+
+        # Marcar como guardado (no modificado)
+        self.mark_as_saved(filename)
+
+        # Los próximos guardados incrementales referencian los ids del archivo.
+        # Un archivo antiguo (ids numéricos) necesita primero un guardado completo.
+        self.journal.reset(filename if prepared["stable_ids"] else None)
+
+    def _detach_scene(self) -> Dict:
+        """
+        Saca de la escena el proyecto actual sin destruirlo y deja el controller
+        como con un canvas vacío. Devuelve lo necesario para _restore_scene.
+        """
+        previous = {name: getattr(self, name) for name in _SCENE_STATE}
+        previous["items"] = [item for item in self.canvas.scene.items() if item.parentItem() is None]
+        for item in previous["items"]:
+            self.canvas.scene.removeItem(item)
+
+        for name in _SCENE_STATE:
+            value = previous[name]
+            setattr(self, name, type(value)() if isinstance(value, (list, dict, set)) else None)
+        self.journal = ChangeJournal()
+        self._is_modified = False
+        self._modification_serial = 0
+        self.selected_node = None
+        self.selected_edge = None
+        self.current_selection = None
+        self._notify_project_modified()
+        return previous
+
+    def _restore_scene(self, previous: Dict):
+        """Descarta lo construido y vuelve a poner el proyecto apartado por _detach_scene"""
+        self._release_items(self.nodes, self.edges)
+        for item in [item for item in self.canvas.scene.items() if item.parentItem() is None]:
+            self.canvas.scene.removeItem(item)
+        for item in previous["items"]:
+            self.canvas.scene.addItem(item)
+
+        for name in _SCENE_STATE:
+            setattr(self, name, previous[name])
+        self.selected_node = None
+        self.selected_edge = None
+        self.current_selection = None
+        self._notify_project_modified()
+
+    @staticmethod
+    def _pause_gc() -> bool:
+        """Pausa el recolector de ciclos durante la creación masiva de items"""
+        was_enabled = gc.isenabled()
+        gc.disable()
+        return was_enabled
+
+    @staticmethod
+    def _resume_gc(was_enabled: bool):
+        if was_enabled:
+            gc.enable()
+
+    def _build_nodes_from_records(self, node_records) -> list:
+        """Crea los nodos de los registros y los coloca en el subcanvas de su padre"""
+        created = self._create_nodes_from_records(node_records)
+        self._place_nodes_in_subcanvases(created)
+        return [node for node, _ in created]
+
+    def _create_nodes_from_records(self, node_records) -> list:
+        """Crea los nodos de los registros; devuelve [(nodo, parent_id)]"""
+        created = []
+        for node_data in node_records:
+            log.debug("🔧 Procesando nodo %s de tipo %s", node_data['id'], node_data['type'])
+            node = self._create_node_from_data(node_data)
+            if node:
+                self._set_element_id(node, node_data['id'])
+                created.append((node, node_data.get('parent_id')))
+        return created
+
+    def _place_nodes_in_subcanvases(self, created):
+        """✅ Establecer jerarquía (nodos en subcanvas)"""
+        for node, parent_id in created:
+            if parent_id is not None:
+                parent_node = self._nodes_by_id.get(parent_id)
                 if parent_node and hasattr(parent_node, 'subcanvas'):
-                    self._move_edge_to_subcanvas(edge, parent_node)
+                    self._move_node_to_subcanvas(node, parent_node)
+
+    def _build_edges_from_records(self, edge_records) -> int:
+        """Crea las edges de los registros (incluidas las de subcanvas) y las mueve a su subcanvas"""
+        edge_count = 0
+        for edge_data in edge_records:
+            edge = self._create_edge_from_data(edge_data, self._nodes_by_id)
+            if edge:
+                edge_count += 1
+                self._set_element_id(edge, edge_data['id'])
+
+                parent_id = edge_data.get('parent_id')
+                if parent_id is not None:
+                    parent_node = self._nodes_by_id.get(parent_id)
+                    if parent_node and hasattr(parent_node, 'subcanvas'):
+                        self._move_edge_to_subcanvas(edge, parent_node)
+        return edge_count
 
-            # ✅ QUINTA PASADA: Vincular nodos composite internos con externos
-            # Esto debe hacerse DESPUÉS de crear los edges para poder buscar el target
-            composite_nodes = {}  # id -> node_data mapping
-            
-            for node_data in scene_data.get('nodes', []):
-                model_props = node_data.get('model_properties', {})
-                if model_props.get('is_composite', False):
-                    # ✅ Solo considerar nodos externos (los que NO tienen parent_id)
-                    parent_id = node_data.get('parent_id')
-                    if parent_id is None:
-                        composite_nodes[node_data['id']] = node_data
-            
-            # Para cada nodo composite externo, buscar su interno y vincularlos
-            linked_internal_nodes = set()  # Para evitar vincular el mismo nodo interno dos veces
-            
-            for node_id, node_data in composite_nodes.items():
-                external_node = node_map.get(node_id)
-                if not external_node:
-                    continue
-                
-                model_props = node_data.get('model_properties', {})
-                
-                # ✅ El nodo interno está en el subcanvas del DESTINO de la flecha (target)
-                # Necesitamos encontrar el edge que sale de este nodo composite para saber el destino
-                target_node = None
-                for edge in self.edges:
-                    if edge.source_node == external_node:
-                        target_node = edge.dest_node
-                        break
-                
-                if not target_node:
-                    print(f"⚠️ No se encontró edge saliente para nodo composite {node_id}")
+    # ---------------------
+    # Subcanvases colapsados (carga diferida)
+    # ---------------------
+    def _defer_collapsed_contents(self, scene_data: Dict, index: Dict):
+        """
+        Aparta los registros que están dentro de subcanvases colapsados.
+
+        Cada nodo diferido se agrupa bajo su ancestro colapsado más cercano, y
+        las edges que tocan algún nodo diferido esperan a que existan todos sus
+        extremos.
+        """
+        nodes_by_id = index['nodes_by_id']
+        collapsed = {
+            node_id for node_id, node_data in nodes_by_id.items()
+            if node_data.get('subcanvas') and not node_data['subcanvas'].get('visible', False)
+        }
+        if not collapsed:
+            return
+
+        # node_id -> ancestro colapsado más cercano (None si no hay)
+        holder = {}
+
+        def collapsed_ancestor(node_id):
+            path = []
+            current = node_id
+            while current not in holder:
+                parent_id = nodes_by_id[current].get('parent_id')
+                if parent_id not in nodes_by_id or current in path:
+                    holder[current] = None
+                    break
+                path.append(current)
+                if parent_id in collapsed:
+                    holder[current] = parent_id
+                    break
+                current = parent_id
+            for path_id in reversed(path):
+                if path_id not in holder:
+                    parent_id = nodes_by_id[path_id]['parent_id']
+                    holder[path_id] = holder.get(parent_id)
+            return holder[node_id]
+
+        for node_data in scene_data.get('nodes', []):
+            ancestor = collapsed_ancestor(node_data['id'])
+            if ancestor is not None:
+                self._collapsed_contents.setdefault(ancestor, []).append(node_data)
+                self._deferred_node_ids.add(node_data['id'])
+
+        for edge_data in scene_data.get('edges', []):
+            refs = [edge_data.get(key) for key in ('source_id', 'target_id', 'parent_id')]
+            if any(ref in self._deferred_node_ids for ref in refs):
+                self._deferred_edges[edge_data['id']] = edge_data
+                for ref in refs:
+                    if ref is not None:
+                        self._deferred_edges_by_node.setdefault(ref, []).append(edge_data['id'])
+
+    def _hydrate_subcanvas(self, container):
+        """Construye los items de un subcanvas que se cargó colapsado"""
+        records = self._collapsed_contents.pop(container.element_id, None)
+        if records is None:
+            return
+
+        # Construir el contenido no es una modificación del proyecto
+        was_modified, serial = self._is_modified, self._modification_serial
+        log.info("🔧 Construyendo %s nodos del subcanvas colapsado de %s", len(records), container)
+
+        with self.batch():
+            for node_data in records:
+                self._deferred_node_ids.discard(node_data['id'])
+            nodes = self._build_nodes_from_records(records)
+
+            # Edges que ya tienen todos sus extremos construidos
+            ready = []
+            for node_data in records:
+                for edge_id in self._deferred_edges_by_node.pop(node_data['id'], []):
+                    edge_data = self._deferred_edges.get(edge_id)
+                    if edge_data is None:
+                        continue
+                    refs = [edge_data.get(key) for key in ('source_id', 'target_id', 'parent_id')]
+                    if any(ref in self._deferred_node_ids for ref in refs):
+                        continue
+                    del self._deferred_edges[edge_id]
+                    ready.append(edge_data)
+            edges_before = len(self.edges)
+            self._build_edges_from_records(ready)
+
+            # Composite cuyo nodo externo o interno estaba en este subcanvas
+            self._run_pending_composite_links()
+
+            self.journal.forget(nodes + self.edges[edges_before:])
+            self._modification_serial = serial
+            self.is_modified = was_modified
+
+    def _drop_collapsed_contents(self, node_id):
+        """Descarta los registros diferidos de un nodo eliminado (y de sus descendientes)"""
+        dropped = [node_id]
+        stack = [node_id]
+        while stack:
+            for node_data in self._collapsed_contents.pop(stack.pop(), []):
+                self._deferred_node_ids.discard(node_data['id'])
+                dropped.append(node_data['id'])
+                stack.append(node_data['id'])
+
+        for dropped_id in dropped:
+            self._pending_composite_links.pop(dropped_id, None)
+            self._pending_composite_pairs.pop(dropped_id, None)
+            for edge_id in self._deferred_edges_by_node.pop(dropped_id, []):
+                self._deferred_edges.pop(edge_id, None)
+
+    def hydrate_all_subcanvases(self):
+        """Construye todo el contenido diferido, dejando los subcanvases colapsados"""
+        while self._collapsed_contents:
+            ready = [self._nodes_by_id[node_id] for node_id in list(self._collapsed_contents) if node_id in self._nodes_by_id]
+            if not ready:
+                break
+            for container in ready:
+                if container.element_id in self._collapsed_contents:
+                    container.ensure_subcanvas_visible()
+                    container._toggle_subcanvas()
+
+    def serialize_scene(self) -> Dict:
+        """Documento de la escena, incluidos los registros de subcanvases aún sin construir"""
+        scene_data = AstrFormat.serialize_scene(self.nodes, self.edges)
+        if self._collapsed_contents or self._deferred_edges:
+            # Copias: el snapshot se codifica en otro hilo mientras el GUI puede
+            # construir (y consumir) esos registros al expandir un subcanvas
+            for records in self._collapsed_contents.values():
+                scene_data["nodes"].extend(copy.deepcopy(records))
+            scene_data["edges"].extend(copy.deepcopy(list(self._deferred_edges.values())))
+            scene_data["metadata"]["node_count"] = len(scene_data["nodes"])
+            scene_data["metadata"]["edge_count"] = len(scene_data["edges"])
+        return scene_data
+
+    def _link_composite_nodes(self, index: Dict):
+        """
+        Vincula cada nodo composite externo con su nodo interno.
+
+        Los archivos nuevos guardan el id del gemelo (composite_pair) y el vínculo
+        es directo. En los antiguos el nodo interno se busca en el subcanvas del
+        DESTINO del primer edge que sale del nodo externo. Si alguno de los dos
+        está en un subcanvas colapsado, el vínculo se hace cuando se construya.
+        """
+        pairs = index['composite_pairs']
+        # Los internos con par explícito no son candidatos de la heurística
+        self._linked_internal_ids.update(pairs.values())
+
+        for node_id, internal_id in pairs.items():
+            external_node = self._nodes_by_id.get(node_id)
+            internal_node = self._nodes_by_id.get(internal_id)
+            if external_node and internal_node:
+                self._link_composite_pair(external_node, internal_node, index['nodes_by_id'][node_id])
+            elif node_id in self._nodes_by_id or node_id in self._deferred_node_ids:
+                self._pending_composite_pairs[internal_id] = index['nodes_by_id'][node_id]
+
+        for node_id in index['composite_external_ids']:
+            if node_id in pairs:
+                continue
+
+            external_node = self._nodes_by_id.get(node_id)
+            if not external_node and node_id not in self._deferred_node_ids:
+                continue
+
+            node_data = index['nodes_by_id'][node_id]
+
+            # ✅ Primer edge saliente (en orden del archivo) cuyo destino existe
+            target_id = None
+            for edge_data in index['edges_by_source'].get(node_id, []):
+                if edge_data['target_id'] in self._nodes_by_id or edge_data['target_id'] in self._deferred_node_ids:
+                    target_id = edge_data['target_id']
+                    break
+
+            if target_id is None:
+                log.warning("⚠️ No se encontró edge saliente para nodo composite %s", node_id)
+                continue
+
+            if external_node is None or target_id in self._deferred_node_ids or target_id in self._collapsed_contents:
+                # Alguno de los dos todavía no está construido
+                self._pending_composite_links.setdefault(target_id, []).append(node_data)
+                continue
+
+            children = [self._nodes_by_id.get(child_id) for child_id in index['children_by_parent'].get(target_id, [])]
+            self._link_composite_into(external_node, node_data, self._nodes_by_id[target_id], children)
+
+    def _run_pending_composite_links(self):
+        """Vincula los composite diferidos cuyos dos extremos ya están construidos"""
+        for internal_id in list(self._pending_composite_pairs):
+            internal_node = self._nodes_by_id.get(internal_id)
+            node_data = self._pending_composite_pairs[internal_id]
+            external_node = self._nodes_by_id.get(node_data['id'])
+            if internal_node and external_node:
+                del self._pending_composite_pairs[internal_id]
+                self._link_composite_pair(external_node, internal_node, node_data)
+
+        for target_id in list(self._pending_composite_links):
+            target_node = self._nodes_by_id.get(target_id)
+            if target_node is None or target_id in self._collapsed_contents:
+                continue
+
+            waiting = []
+            for node_data in self._pending_composite_links.pop(target_id):
+                external_node = self._nodes_by_id.get(node_data['id'])
+                if external_node is None:
+                    waiting.append(node_data)
                     continue
-                
-                # Buscar el nodo interno en el subcanvas del target
-                if hasattr(target_node, 'subcanvas') and target_node.subcanvas:
-                    # Buscar el nodo interno en el subcanvas
-                    internal_node = None
-                    
-                    # ✅ Obtener posición interna esperada (puede ser diferente para cada nodo)
-                    expected_x = target_node.subcanvas.radius * float(model_props.get('internal_position_in_subcanvas_x', 0.6))
-                    expected_y = target_node.subcanvas.radius * float(model_props.get('internal_position_in_subcanvas_y', 0.0))
-                    
-                    # ✅ Buscar todos los nodos del mismo tipo en el subcanvas
-                    candidates = []
-                    for child in target_node.subcanvas.childItems():
-                        # ✅ Evitar nodos ya vinculados
-                        if id(child) in linked_internal_nodes:
-                            continue
-                        
-                        if isinstance(child, type(external_node)) and hasattr(child, 'model'):
-                            candidates.append(child)
-                    
-                    # ✅ Si hay múltiples candidatos, buscar el más cercano a la posición esperada
-                    if len(candidates) == 1:
-                        internal_node = candidates[0]
-                        print(f"🔍 Nodo interno encontrado (único candidato) en subcanvas de {target_node}")
-                    elif len(candidates) > 1:
-                        # Buscar el más cercano a la posición esperada
-                        min_dist = float('inf')
-                        for candidate in candidates:
-                            dist = abs(candidate.pos().x() - expected_x) + abs(candidate.pos().y() - expected_y)
-                            if dist < min_dist:
-                                min_dist = dist
-                                internal_node = candidate
-                        print(f"🔍 Nodo interno encontrado en subcanvas de {target_node} (distancia={min_dist:.1f})")
-                    else:
-                        print(f"⚠️ No se encontraron nodos del tipo {type(external_node).__name__} en subcanvas de {target_node}")
-                    
-                    if internal_node:
-                        # Marcar como vinculado
-                        linked_internal_nodes.add(id(internal_node))
-                        
-                        # Crear wrapper y vincular ambos nodos
-                        ModelClass = _MODEL_MAP.get(node_data['type'])
-                        if ModelClass:
-                            # ✅ PRESERVAR radio interno antes de crear el wrapper
-                            internal_radius = internal_node._independent_model.radius if hasattr(internal_node, '_independent_model') else getattr(internal_node.model, 'radius', 50)
-                            
-                            # Crear modelo interno con los datos serializados
-                            new_internal_model = ModelClass(0, 0)
-                            new_internal_model.position_in_subcanvas_x = float(model_props.get('internal_position_in_subcanvas_x', 0.6))
-                            new_internal_model.position_in_subcanvas_y = float(model_props.get('internal_position_in_subcanvas_y', 0.0))
-                            # ✅ Preservar radio interno
-                            new_internal_model.radius = internal_radius
-                            
-                            # El modelo externo es el que ya tiene el nodo externo
-                            external_model = external_node.model
-                            
-                            # Crear wrapper
-                            wrapper = CompositeModelWrapper(external_model, new_internal_model)
-                            
-                            # Actualizar ambos nodos con el wrapper
-                            external_node.model = wrapper
-                            external_node._independent_model = external_model
-                            
-                            internal_node.model = wrapper
-                            internal_node._independent_model = new_internal_model
-                            
-                            # ✅ Actualizar propiedades sincronizadas a través del wrapper
-                            wrapper.label = model_props.get('label', '')
-                            wrapper.color = model_props.get('color', '#3498db')
-                            wrapper.border_color = model_props.get('border_color', '#2980b9')
-                            wrapper.text_color = model_props.get('text_color', '#ffffff')
-                            
-                            # ✅ Actualizar radio independiente del nodo externo
-                            external_model.radius = float(model_props.get('radius', 50))
-                            
-                            # Forzar redibujado inicial
-                            external_node.update()
-                            internal_node.update()
-                            
-                            # Agregar callbacks
-                            def on_external_changed(prop_name, value):
-                                external_node.update()
-                                external_node.properties_changed.emit(external_node, {prop_name: value})
-                            
-                            def on_internal_changed(prop_name, value):
-                                internal_node.update()
-                            
-                            wrapper.add_change_callback(on_external_changed)
-                            wrapper.add_change_callback(on_internal_changed)
-                            
-                            print(f"✅ Nodo composite interno vinculado con externo (radio externo={external_model.radius}, interno={internal_radius})")
-                    else:
-                        print(f"⚠️ No se encontró nodo interno en subcanvas de {target_node}")
-                else:
-                    print(f"⚠️ Target {target_node} no tiene subcanvas")
+                children = [
+                    child for child in (target_node.subcanvas.childItems() if target_node.subcanvas else [])
+                    if self._nodes_by_id.get(getattr(child, 'element_id', None)) is child
+                ]
+                self._link_composite_into(external_node, node_data, target_node, children)
+            if waiting:
+                self._pending_composite_links[target_id] = waiting
+
+    def _link_composite_into(self, external_node, node_data: Dict, target_node, children):
+        """Busca entre los hijos del target el nodo interno de un composite y los vincula"""
+        if not (hasattr(target_node, 'subcanvas') and target_node.subcanvas):
+            log.warning("⚠️ Target %s no tiene subcanvas", target_node)
+            return
 
-            print(f"✅ Proyecto cargado exitosamente: {filename}")
-            print(f"📊 Resumen: {len(node_map)} nodos, {edge_count} edges reconstruidos")
+        model_props = node_data.get('model_properties', {})
+
+        # ✅ Obtener posición interna esperada (puede ser diferente para cada nodo)
+        expected_x = target_node.subcanvas.radius * float(model_props.get('internal_position_in_subcanvas_x', 0.6))
+        expected_y = target_node.subcanvas.radius * float(model_props.get('internal_position_in_subcanvas_y', 0.0))
+
+        # ✅ Candidatos: hijos del target del mismo tipo que no estén vinculados
+        candidates = []
+        for child in children:
+            if child is None or child.element_id in self._linked_internal_ids:
+                continue
+            if isinstance(child, type(external_node)) and hasattr(child, 'model'):
+                candidates.append(child)
+
+        # ✅ Si hay múltiples candidatos, buscar el más cercano a la posición esperada
+        internal_node = None
+        if len(candidates) == 1:
+            internal_node = candidates[0]
+            log.debug("🔍 Nodo interno encontrado (único candidato) en subcanvas de %s", target_node)
+        elif len(candidates) > 1:
+            min_dist = float('inf')
+            for candidate in candidates:
+                dist = abs(candidate.pos().x() - expected_x) + abs(candidate.pos().y() - expected_y)
+                if dist < min_dist:
+                    min_dist = dist
+                    internal_node = candidate
+            log.debug("🔍 Nodo interno encontrado en subcanvas de %s (distancia=%.1f)", target_node, min_dist)
+        else:
+            log.warning("⚠️ No se encontraron nodos del tipo %s en subcanvas de %s", type(external_node).__name__, target_node)
 
-            # Marcar como guardado (no modificado)
-            self.mark_as_saved(filename)
+        if internal_node:
+            self._linked_internal_ids.add(internal_node.element_id)
+            self._link_composite_pair(external_node, internal_node, node_data)
+        else:
+            log.warning("⚠️ No se encontró nodo interno en subcanvas de %s", target_node)
 
-            return True
+    def _link_composite_pair(self, external_node, internal_node, node_data: Dict):
+        """Crea el CompositeModelWrapper compartido por un nodo externo y su interno"""
+        ModelClass = _MODEL_MAP.get(node_data['type'])
+        if not ModelClass:
+            return
 
-        except Exception as e:
-            print(f"❌ Error cargando proyecto: {e}")
-            import traceback
-            traceback.print_exc()
-            QMessageBox.critical(self.canvas, "Error", f"No se pudo cargar el proyecto:\n{e}")
-            return False
+        model_props = node_data.get('model_properties', {})
+
+        # ✅ PRESERVAR radio interno antes de crear el wrapper
+        internal_radius = internal_node._independent_model.radius if hasattr(internal_node, '_independent_model') else getattr(internal_node.model, 'radius', 50)
+
+        # Crear modelo interno con los datos serializados (conservando el id del nodo interno)
+        new_internal_model = ModelClass(0, 0)
+        new_internal_model.id = internal_node.element_id
+        new_internal_model.position_in_subcanvas_x = float(model_props.get('internal_position_in_subcanvas_x', 0.6))
+        new_internal_model.position_in_subcanvas_y = float(model_props.get('internal_position_in_subcanvas_y', 0.0))
+        # ✅ Preservar radio interno
+        new_internal_model.radius = internal_radius
+
+        # El modelo externo es el que ya tiene el nodo externo
+        external_model = external_node.model
+
+        # Crear wrapper
+        wrapper = CompositeModelWrapper(external_model, new_internal_model)
+
+        # Actualizar ambos nodos con el wrapper
+        external_node.model = wrapper
+        external_node._independent_model = external_model
+
+        internal_node.model = wrapper
+        internal_node._independent_model = new_internal_model
+
+        # ✅ Actualizar propiedades sincronizadas a través del wrapper
+        wrapper.label = model_props.get('label', '')
+        wrapper.color = model_props.get('color', '#3498db')
+        wrapper.border_color = model_props.get('border_color', '#2980b9')
+        wrapper.text_color = model_props.get('text_color', '#ffffff')
+
+        # ✅ Actualizar radio independiente del nodo externo
+        external_model.radius = float(model_props.get('radius', 50))
+
+        # Forzar redibujado inicial
+        external_node.update()
+        internal_node.update()
+
+        # Agregar callbacks
+        def on_external_changed(prop_name, value):
+            external_node.synced_property_changed(prop_name)
+            external_node.properties_changed.emit(external_node, {prop_name: value})
+
+        def on_internal_changed(prop_name, value):
+            internal_node.synced_property_changed(prop_name)
+
+        wrapper.add_change_callback(on_external_changed, owner=external_node)
+        wrapper.add_change_callback(on_internal_changed, owner=internal_node)
+
+        log.debug("✅ Nodo composite interno vinculado con externo (radio externo=%s, interno=%s)", external_model.radius, internal_radius)
 
     def _move_node_to_subcanvas(self, child_node, parent_node):
         """Mueve un nodo al subcanvas de otro nodo padre"""
@@ -971,7 +1711,7 @@ class CanvasController(QObject):
             # Preparar subcanvas del padre
             subcanvas = parent_node.ensure_subcanvas_visible()
             if not subcanvas:
-                print(f"❌ No se pudo obtener subcanvas del nodo padre {parent_node}")
+                log.error("❌ No se pudo obtener subcanvas del nodo padre %s", parent_node)
                 return False
             
             # Remover nodo hijo de la escena principal
@@ -992,11 +1732,11 @@ class CanvasController(QObject):
             if child_node not in parent_node.child_nodes:
                 parent_node.child_nodes.append(child_node)
             
-            print(f"✅ Nodo movido al subcanvas de {parent_node} en posición {current_pos}")
+            log.debug("✅ Nodo movido al subcanvas de %s en posición %s", parent_node, current_pos)
             return True
 
         except Exception as e:
-            print(f"❌ Error moviendo nodo a subcanvas: {e}")
+            log.error("❌ Error moviendo nodo a subcanvas: %s", e)
             return False
 
     def _create_composite_internal_node(self, parent_node, model_props):
@@ -1005,7 +1745,7 @@ class CanvasController(QObject):
             # Preparar subcanvas del padre
             subcanvas = parent_node.ensure_subcanvas_visible()
             if not subcanvas:
-                print(f"❌ No se pudo obtener subcanvas para composite interno de {parent_node}")
+                log.error("❌ No se pudo obtener subcanvas para composite interno de %s", parent_node)
                 return False
 
             # Obtener el modelo interno del wrapper
@@ -1027,9 +1767,9 @@ class CanvasController(QObject):
             # Agregar callback para redibujar nodo interno cuando cambien propiedades sincronizadas
             wrapper = parent_node.model
             def on_model_changed(prop_name, value):
-                internal_node.update()
+                internal_node.synced_property_changed(prop_name)
             
-            wrapper.add_change_callback(on_model_changed)
+            wrapper.add_change_callback(on_model_changed, owner=internal_node)
 
             # Posicionar en el subcanvas
             internal_node.setParentItem(subcanvas)
@@ -1039,21 +1779,20 @@ class CanvasController(QObject):
             internal_node.setVisible(True)
             internal_node.subcanvas_parent = subcanvas
 
-            self.nodes.append(internal_node)
+            self._register_node(internal_node)
 
             if not hasattr(parent_node, "child_nodes"):
                 parent_node.child_nodes = []
             parent_node.child_nodes.append(internal_node)
 
-            print(f"✅ Nodo composite interno '{node_type}' creado en subcanvas de {parent_node} en ({offset_x:.1f}, {offset_y:.1f})")
+            log.info("✅ Nodo composite interno '%s' creado en subcanvas de %s en (%.1f, %.1f)", node_type, parent_node, offset_x, offset_y)
             return True
 
         except Exception as e:
-            print(f"❌ Error creando nodo composite interno: {e}")
-            import traceback
-            traceback.print_exc()
+            log.exception("❌ Error creando nodo composite interno: %s", e)
             return False
 
+    @profiled("export-image")
     def export_to_image(self, filename: str = None) -> bool:
         """Exporta el canvas como imagen PNG"""
         try:
@@ -1070,6 +1809,9 @@ class CanvasController(QObject):
                 if not filename.endswith('.png'):
                     filename += '.png'
 
+            # Edges con actualización pendiente (nodos recién movidos)
+            EdgeUpdateScheduler.flush()
+
             # Obtener el rectángulo que contiene todos los items
             rect = self.canvas.scene.itemsBoundingRect()
             
@@ -1080,54 +1822,74 @@ class CanvasController(QObject):
             # Renderizar escena en el pixmap
             painter = QPainter(pixmap)
             painter.setRenderHint(QPainter.RenderHint.Antialiasing)
-            self.canvas.scene.render(painter, source=rect)
+            with NodeCache.uncached(self.canvas.scene.items()):
+                self.canvas.scene.render(painter, source=rect)
             painter.end()
             
             # Guardar imagen
-            pixmap.save(filename)
+            if not pixmap.save(filename):
+                raise IOError(f"No se pudo escribir {filename}")
             
-            print(f"✅ Imagen exportada exitosamente: {filename}")
+            log.info("✅ Imagen exportada exitosamente: %s", filename)
             return True
             
         except Exception as e:
-            print(f"❌ Error exportando imagen: {e}")
-            QMessageBox.critical(self.canvas, "Error", f"No se pudo exportar la imagen:\n{e}")
+            log.error("❌ Error exportando imagen: %s", e)
+            self.report_error(f"No se pudo exportar la imagen:\n{e}")
             return False
 
     def clear_canvas(self):
         """Limpia completamente el canvas"""
-        # Limpiar selecciones
-        self.selected_node = None
-        self.selected_edge = None
-        self.current_selection = None
-        
-        # Remover todos los edges
-        for edge in self.edges[:]:
-            if edge.scene():
-                edge.scene().removeItem(edge)
-        self.edges.clear()
-        
-        # Remover todos los nodos
-        for node in self.nodes[:]:
-            if node.scene():
-                node.scene().removeItem(node)
-        self.nodes.clear()
-        
-        # Limpiar selección de la escena
-        self.canvas.scene.clearSelection()
-        
-        # Marcar como no modificado (proyecto nuevo)
-        self.is_modified = False
-        self._current_file_path = None
-        
-        print("✅ Canvas limpiado")
+        # Un solo batch: sin índice espacial ni señales por cada item
+        with self.batch():
+            # Limpiar selecciones
+            self.selected_node = None
+            self.selected_edge = None
+            self.current_selection = None
+
+            # Sin snapshot asociado ya no hay journal que continuar
+            self.journal.reset()
+            self._nodes_by_id.clear()
+            self._edges_by_id.clear()
+            self._collapsed_contents.clear()
+            self._deferred_node_ids.clear()
+            self._deferred_edges.clear()
+            self._deferred_edges_by_node.clear()
+            self._pending_composite_links.clear()
+            self._pending_composite_pairs.clear()
+            self._linked_internal_ids.clear()
+
+            # Sin conexiones ni callbacks que mantengan vivos los items eliminados
+            self._release_items(self.nodes, self.edges)
+
+            # Remover todos los edges
+            for edge in self.edges[:]:
+                if edge.scene():
+                    edge.scene().removeItem(edge)
+            self.edges.clear()
+
+            # Remover todos los nodos
+            for node in self.nodes[:]:
+                if node.scene():
+                    node.scene().removeItem(node)
+            self.nodes.clear()
+            self._subcanvas_handlers.clear()
+
+            # Limpiar selección de la escena
+            self.canvas.scene.clearSelection()
+
+            # Marcar como no modificado (proyecto nuevo)
+            self.is_modified = False
+            self._current_file_path = None
+
+            log.info("✅ Canvas limpiado")
 
     def _create_node_from_data(self, node_data: Dict) -> object:
         """Crea un nodo a partir de datos serializados - VERSIÓN CON SOPORTE DE POSICIÓN EN SUBCANVAS"""
         node_type = node_data['type']
         pos_data = node_data['position']
 
-        print(f"🔧 Creando nodo {node_type} en posición ({pos_data['x']}, {pos_data['y']})")
+        log.debug("🔧 Creando nodo %s en posición (%s, %s)", node_type, pos_data['x'], pos_data['y'])
 
         # ✅ CREAR el nodo en la posición CERO primero
         node = self.add_node(node_type, 0, 0)
@@ -1149,6 +1911,8 @@ class CanvasController(QObject):
                     ModelClass = _MODEL_MAP.get(node_type)
                     if ModelClass:
                         internal_model = ModelClass(0, 0)
+                        # Conservar el par explícito aunque el vínculo quede pendiente
+                        internal_model.id = model_props.get('composite_pair') or internal_model.id
                         internal_model.position_in_subcanvas_x = float(model_props.get('internal_position_in_subcanvas_x', 0.6))
                         internal_model.position_in_subcanvas_y = float(model_props.get('internal_position_in_subcanvas_y', 0.0))
 
@@ -1163,10 +1927,10 @@ class CanvasController(QObject):
 
                         # Agregar callback para redibujar nodos cuando cambien propiedades sincronizadas
                         def on_model_changed(prop_name, value):
-                            node.update()
+                            node.synced_property_changed(prop_name)
                             node.properties_changed.emit(node, {prop_name: value})
 
-                        wrapper.add_change_callback(on_model_changed)
+                        wrapper.add_change_callback(on_model_changed, owner=node)
                     
                     # ✅ Actualizar propiedades sincronizadas a través del wrapper
                     wrapper.label = model_props.get('label', '')
@@ -1213,7 +1977,11 @@ class CanvasController(QObject):
 
         # ✅ RESTAURAR estado del subcanvas (Lógica existente mantenida)
         subcanvas_data = node_data.get('subcanvas')
-        if subcanvas_data:
+        if subcanvas_data and not subcanvas_data.get('visible', False) and hasattr(node, 'collapsed_subcanvas_state'):
+            # Subcanvas colapsado: se construye la primera vez que se expanda
+            node.collapsed_subcanvas_state = dict(subcanvas_data)
+            node.model.show_subcanvas = False
+        elif subcanvas_data:
             if not hasattr(node, 'subcanvas') or node.subcanvas is None:
                 node.prepare_subcanvas_for_internal_use()
 
@@ -1234,7 +2002,8 @@ class CanvasController(QObject):
                     node.subcanvas._update_handle_pos()
 
         # ✅ APLICAR propiedades adicionales y forzar actualización visual
-        properties = node_data.get('properties', {})
+        # (sobre una copia: el registro puede estar en un snapshot de guardado)
+        properties = dict(node_data.get('properties', {}))
         if hasattr(node, 'update_properties'):
             properties['x'] = float(pos_data['x'])
             properties['y'] = float(pos_data['y'])
@@ -1256,7 +2025,7 @@ class CanvasController(QObject):
         # Forzar el redibujado
         node.update()
 
-        print(f"✅ Nodo {node_type} creado y posicionado. Posición en subcanvas: ({node.model.position_in_subcanvas_x}, {node.model.position_in_subcanvas_y})")
+        log.debug("✅ Nodo %s creado y posicionado. Posición en subcanvas: (%s, %s)", node_type, node.model.position_in_subcanvas_x, node.model.position_in_subcanvas_y)
         return node
 
     def _create_edge_from_data(self, edge_data: Dict, node_map: Dict):
@@ -1269,20 +2038,20 @@ class CanvasController(QObject):
         target_node = node_map.get(target_id)
 
         if not source_node or not target_node:
-            print(f"⚠️ No se pudo crear edge: nodos fuente({source_id}) o destino({target_id}) no encontrados")
+            log.warning("⚠️ No se pudo crear edge: nodos fuente(%s) o destino(%s) no encontrados", source_id, target_id)
             return None
 
         # Crear edge
         ArrowClass = _ARROW_TYPES.get(edge_type)
         if not ArrowClass:
-            print(f"⚠️ Tipo de edge desconocido: {edge_type}")
+            log.warning("⚠️ Tipo de edge desconocido: %s", edge_type)
             return None
 
         edge_item = ArrowClass(source_node, target_node)
 
         # ✅ POR AHORA agregar a la escena principal, luego se moverá si es necesario
         self.canvas.scene.addItem(edge_item)
-        self.edges.append(edge_item)
+        self._register_edge(edge_item)
 
         # Aplicar propiedades
         properties = edge_data.get('properties', {})
@@ -1311,7 +2080,7 @@ class CanvasController(QObject):
             # Preparar subcanvas del padre
             subcanvas = parent_node.ensure_subcanvas_visible()
             if not subcanvas:
-                print(f"❌ No se pudo obtener subcanvas del nodo padre {parent_node}")
+                log.error("❌ No se pudo obtener subcanvas del nodo padre %s", parent_node)
                 return False
 
             # Remover edge de la escena principal
@@ -1321,9 +2090,9 @@ class CanvasController(QObject):
             # Agregar edge al subcanvas
             edge.setParentItem(subcanvas)
 
-            print(f"✅ Edge movida al subcanvas de {parent_node}")
+            log.debug("✅ Edge movida al subcanvas de %s", parent_node)
             return True
 
         except Exception as e:
-            print(f"❌ Error moviendo edge a subcanvas: {e}")
+            log.error("❌ Error moviendo edge a subcanvas: %s", e)
             return False
\ No newline at end of file
@@ -0,0 +1,439 @@
+# ---------------------------------------------------
+# Proyecto: Asteroid
+# Autor: Daryll Lorenzo Alfonso
+# Año: 2025
+# Licencia: MIT License
+# ---------------------------------------------------
+"""
+Contenedor binario columnar para proyectos Asteroid (.astrb).
+
+Guarda el mismo documento que AstrFormat.serialize_scene, pero por columnas:
+
+    [8 bytes]  MAGIC
+    [4 bytes]  longitud del header (uint32, little endian)
+    [N bytes]  header JSON: tablas de tipos y descriptores de columnas
+    [padding]  hasta múltiplo de 8
+    [datos]    columnas numpy alineadas a 8 bytes
+
+- Tipos de nodo/edge: códigos uint8 sobre una tabla declarada en el header.
+- Posiciones, radios y demás números reales: columnas float32 (float64 si la
+  columna mezcla enteros y reales, para no perder los enteros grandes).
+- Labels, colores y demás strings: índices uint32 a una tabla de strings
+  deduplicada (blob UTF-8 + offsets).
+- Jerarquía y edges: arrays int32 de índices de fila (-1 = sin referencia).
+- Control points: un único array float32 (x, y) + offsets uint32 por edge.
+
+Cada clave del documento JSON se convierte en una columna (las claves anidadas
+se aplanan con '.'), así que las claves largas se escriben una sola vez en el
+header en lugar de una vez por nodo. Las columnas con filas ausentes o nulas
+llevan una máscara uint8 (0 = ausente, 1 = presente, 2 = null).
+
+JSON (.astr) sigue siendo el formato de intercambio; este formato es para
+proyectos grandes donde importa el tamaño y el tiempo de carga.
+"""
+import json
+import mmap
+from typing import Any, Dict, List
+
+import numpy as np
+
+MAGIC = b"ASTRBIN1"
+_ALIGN = 8
+_INT32_MIN, _INT32_MAX = -(2 ** 31), 2 ** 31 - 1
+
+_ABSENT, _PRESENT, _NULL = 0, 1, 2
+
+# Todas las columnas se guardan en little endian
+_F4 = np.dtype("<f4")
+_F8 = np.dtype("<f8")
+_I4 = np.dtype("<i4")
+_U4 = np.dtype("<u4")
+
+# Claves que se codifican como columnas dedicadas en lugar de genéricas
+_NODE_SPECIAL_KEYS = {"type", "parent_id"}
+_EDGE_SPECIAL_KEYS = {"type", "source_id", "target_id", "parent_id", "control_points"}
+
+
+class AstrBinaryFormat:
+    EXTENSION = ".astrb"
+
+    # ==================== ESCRITURA ====================
+
+    @staticmethod
+    def encode(scene_data: Dict[str, Any]) -> bytes:
+        """Codifica un documento de escena (dict) al contenedor binario"""
+        nodes = scene_data.get("nodes", [])
+        edges = scene_data.get("edges", [])
+        writer = _ColumnWriter()
+
+        row_by_id = {}
+        for row, node_data in enumerate(nodes):
+            row_by_id.setdefault(node_data.get("id"), row)
+
+        # ---- Nodos ----
+        node_types = _TypeTable()
+        writer.add_array("@type", np.array([node_types.code(n.get("type")) for n in nodes], dtype=np.uint8))
+        parents, node_rows = [], []
+        for node_data in nodes:
+            generic = {k: v for k, v in node_data.items() if k not in _NODE_SPECIAL_KEYS}
+            parent_id = node_data.get("parent_id")
+            if parent_id is None:
+                parents.append(-1)
+            elif parent_id in row_by_id:
+                parents.append(row_by_id[parent_id])
+            else:
+                # Referencia colgante: se conserva tal cual en una columna genérica
+                parents.append(-1)
+                generic["parent_id"] = parent_id
+            node_rows.append(generic)
+        writer.add_array("@parent", np.array(parents, dtype=_I4))
+        node_columns = writer.add_generic_columns(node_rows)
+
+        # ---- Edges ----
+        edge_types = _TypeTable()
+        sources, targets, edge_parents, edge_rows = [], [], [], []
+        cp_offsets, cp_xy = [0], []
+        for edge_data in edges:
+            generic = {k: v for k, v in edge_data.items() if k not in _EDGE_SPECIAL_KEYS}
+            for key, column in (("source_id", sources), ("target_id", targets), ("parent_id", edge_parents)):
+                ref = edge_data.get(key)
+                if ref is None:
+                    column.append(-1)
+                    if key != "parent_id":
+                        generic[key] = ref
+                elif ref in row_by_id:
+                    column.append(row_by_id[ref])
+                else:
+                    column.append(-1)
+                    generic[key] = ref
+
+            for point in edge_data.get("control_points") or []:
+                cp_xy.append(point["x"])
+                cp_xy.append(point["y"])
+            cp_offsets.append(len(cp_xy) // 2)
+            edge_rows.append(generic)
+
+        writer.add_array("@edge_type", np.array([edge_types.code(e.get("type")) for e in edges], dtype=np.uint8))
+        writer.add_array("@source", np.array(sources, dtype=_I4))
+        writer.add_array("@target", np.array(targets, dtype=_I4))
+        writer.add_array("@edge_parent", np.array(edge_parents, dtype=_I4))
+        writer.add_array("@cp_offsets", np.array(cp_offsets, dtype=_U4))
+        writer.add_array("@cp_xy", np.array(cp_xy, dtype=_F4))
+        edge_columns = writer.add_generic_columns(edge_rows)
+
+        document = {k: v for k, v in scene_data.items() if k not in ("nodes", "edges")}
+        strings_offset, string_offsets_offset, string_count = writer.add_string_table()
+
+        header = {
+            "document": document,
+            "node_count": len(nodes),
+            "edge_count": len(edges),
+            "node_types": node_types.names,
+            "edge_types": edge_types.names,
+            "arrays": writer.arrays,
+            "node_columns": node_columns,
+            "edge_columns": edge_columns,
+            "strings": {"data": strings_offset, "offsets": string_offsets_offset, "count": string_count},
+        }
+        header_bytes = json.dumps(header, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        prefix = MAGIC + np.array([len(header_bytes)], dtype=_U4).tobytes() + header_bytes
+        prefix += b"\0" * (-len(prefix) % _ALIGN)
+        return prefix + writer.data()
+
+    @staticmethod
+    def write(scene_data: Dict[str, Any], filename: str):
+        """Escribe el documento a disco en formato binario"""
+        with open(filename, "wb") as f:
+            f.write(AstrBinaryFormat.encode(scene_data))
+
+    # ==================== LECTURA ====================
+
+    @staticmethod
+    def is_binary(buffer) -> bool:
+        return bytes(buffer[:len(MAGIC)]) == MAGIC
+
+    @staticmethod
+    def read(filename: str) -> Dict[str, Any]:
+        """Lee un archivo .astrb mapeándolo en memoria (mmap)"""
+        with open(filename, "rb") as f:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                return AstrBinaryFormat.decode(mm)
+
+    @staticmethod
+    def decode(buffer) -> Dict[str, Any]:
+        """Decodifica el contenedor binario a un documento de escena (dict)"""
+        if not AstrBinaryFormat.is_binary(buffer):
+            raise ValueError("No es un archivo binario de Asteroid")
+
+        header_len = int(np.frombuffer(buffer, dtype=_U4, count=1, offset=len(MAGIC))[0])
+        header_start = len(MAGIC) + 4
+        header = json.loads(bytes(buffer[header_start:header_start + header_len]).decode("utf-8"))
+        data_start = header_start + header_len
+        data_start += -data_start % _ALIGN
+
+        reader = _ColumnReader(buffer, data_start, header)
+        node_count = header["node_count"]
+        edge_count = header["edge_count"]
+
+        # ---- Nodos ----
+        node_rows = reader.generic_rows(header["node_columns"], node_count)
+        node_types = header["node_types"]
+        type_codes = reader.array("@type").tolist()
+        parents = reader.array("@parent").tolist()
+        ids = [row.get("id", i) for i, row in enumerate(node_rows)]
+
+        nodes = []
+        for i, row in enumerate(node_rows):
+            node_data = {"id": row.pop("id", ids[i]), "type": node_types[type_codes[i]]}
+            node_data.update(row)
+            if "parent_id" not in node_data:
+                node_data["parent_id"] = ids[parents[i]] if parents[i] >= 0 else None
+            nodes.append(node_data)
+
+        # ---- Edges ----
+        edge_rows = reader.generic_rows(header["edge_columns"], edge_count)
+        edge_types = header["edge_types"]
+        edge_codes = reader.array("@edge_type").tolist()
+        sources = reader.array("@source").tolist()
+        targets = reader.array("@target").tolist()
+        edge_parents = reader.array("@edge_parent").tolist()
+        cp_offsets = reader.array("@cp_offsets").tolist()
+        cp_xy = reader.array("@cp_xy").tolist()
+
+        edges = []
+        for i, row in enumerate(edge_rows):
+            edge_data = {"type": edge_types[edge_codes[i]]}
+            for key, column in (("source_id", sources), ("target_id", targets), ("parent_id", edge_parents)):
+                if key not in row:
+                    edge_data[key] = ids[column[i]] if column[i] >= 0 else None
+            edge_data.update(row)
+            first, last = cp_offsets[i], cp_offsets[i + 1]
+            edge_data["control_points"] = [
+                {"x": cp_xy[2 * k], "y": cp_xy[2 * k + 1]} for k in range(first, last)
+            ] if last > first else []
+            edges.append(edge_data)
+
+        scene_data = dict(header["document"])
+        scene_data["nodes"] = nodes
+        scene_data["edges"] = edges
+        return scene_data
+
+
+class _TypeTable:
+    """Tabla de nombres de tipo -> código uint8"""
+
+    def __init__(self):
+        self.names: List[str] = []
+        self._codes: Dict[str, int] = {}
+
+    def code(self, name) -> int:
+        if name not in self._codes:
+            if len(self.names) >= 256:
+                raise ValueError("Demasiados tipos distintos para un código uint8")
+            self._codes[name] = len(self.names)
+            self.names.append(name)
+        return self._codes[name]
+
+
+class _ColumnWriter:
+    """Acumula columnas alineadas y la tabla de strings deduplicada"""
+
+    def __init__(self):
+        self._chunks: List[bytes] = []
+        self._size = 0
+        self.arrays: Dict[str, Dict[str, Any]] = {}
+        self._strings: Dict[str, int] = {}
+
+    def _append(self, array: np.ndarray) -> int:
+        offset = self._size
+        raw = np.ascontiguousarray(array).tobytes()
+        raw += b"\0" * (-len(raw) % _ALIGN)
+        self._chunks.append(raw)
+        self._size += len(raw)
+        return offset
+
+    def add_array(self, name: str, array: np.ndarray):
+        self.arrays[name] = {"dtype": array.dtype.str, "offset": self._append(array), "count": int(array.size)}
+
+    def string_index(self, value: str) -> int:
+        index = self._strings.get(value)
+        if index is None:
+            index = self._strings[value] = len(self._strings)
+        return index
+
+    def add_string_table(self):
+        encoded = [s.encode("utf-8") for s in self._strings]
+        offsets = np.zeros(len(encoded) + 1, dtype=_U4)
+        if encoded:
+            np.cumsum([len(b) for b in encoded], out=offsets[1:])
+        data_offset = self._append(np.frombuffer(b"".join(encoded), dtype=np.uint8))
+        offsets_offset = self._append(offsets)
+        return data_offset, offsets_offset, len(encoded)
+
+    def add_generic_columns(self, rows: List[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+        """Aplana las filas en columnas tipadas y devuelve sus descriptores"""
+        count = len(rows)
+        values: Dict[str, List[Any]] = {}
+        for row_index, row in enumerate(rows):
+            self._flatten(row, "", row_index, values, count)
+
+        columns = {}
+        for name, column in values.items():
+            kind = _infer_kind(column)
+            mask = np.array([
+                _ABSENT if v is _MISSING else _NULL if v is None else _PRESENT for v in column
+            ], dtype=np.uint8)
+
+            descriptor = {"kind": kind, "mask": None, "offset": None}
+            if not (mask == _PRESENT).all():
+                descriptor["mask"] = self._append(mask)
+
+            if kind in ("f4", "f8"):
+                filled = [0.0 if v is _MISSING or v is None else v for v in column]
+                descriptor["offset"] = self._append(np.array(filled, dtype=_F4 if kind == "f4" else _F8))
+            elif kind == "i4":
+                filled = [0 if v is _MISSING or v is None else v for v in column]
+                descriptor["offset"] = self._append(np.array(filled, dtype=_I4))
+            elif kind == "b1":
+                filled = [False if v is _MISSING or v is None else v for v in column]
+                descriptor["offset"] = self._append(np.array(filled, dtype=np.uint8))
+            elif kind == "str":
+                filled = [0 if v is _MISSING or v is None else self.string_index(v) for v in column]
+                descriptor["offset"] = self._append(np.array(filled, dtype=_U4))
+            elif kind == "json":
+                filled = [0 if v is _MISSING or v is None else
+                          self.string_index(json.dumps(v, ensure_ascii=False, separators=(",", ":")))
+                          for v in column]
+                descriptor["offset"] = self._append(np.array(filled, dtype=_U4))
+            # kind == "dict": solo la máscara de presencia
+            columns[name] = descriptor
+        return columns
+
+    def _flatten(self, value: Dict[str, Any], prefix: str, row_index: int, values, count: int):
+        for key, item in value.items():
+            name = f"{prefix}{key}"
+            column = values.get(name)
+            if column is None:
+                column = values[name] = [_MISSING] * count
+            if isinstance(item, dict):
+                column[row_index] = _DICT
+                self._flatten(item, f"{name}.", row_index, values, count)
+            else:
+                column[row_index] = item
+
+    def data(self) -> bytes:
+        return b"".join(self._chunks)
+
+
+class _Sentinel:
+    def __init__(self, name):
+        self._name = name
+
+    def __repr__(self):
+        return self._name
+
+
+_MISSING = _Sentinel("MISSING")
+_DICT = _Sentinel("DICT")
+
+
+def _infer_kind(column: List[Any]) -> str:
+    kinds = set()
+    for v in column:
+        if v is _MISSING or v is None:
+            continue
+        if v is _DICT:
+            kinds.add("dict")
+        elif isinstance(v, bool):
+            kinds.add("b1")
+        elif isinstance(v, int):
+            kinds.add("i4" if _INT32_MIN <= v <= _INT32_MAX else "json")
+        elif isinstance(v, float):
+            kinds.add("f4")
+        elif isinstance(v, str):
+            kinds.add("str")
+        else:
+            kinds.add("json")
+
+    if not kinds:
+        return "json"
+    if len(kinds) == 1:
+        return kinds.pop()
+    if kinds == {"i4", "f4"}:
+        # float64 representa exactamente cualquier int32 (float32 solo hasta 2^24)
+        return "f8"
+    if "dict" in kinds:
+        raise ValueError("Una clave no puede ser un objeto en unas filas y un valor en otras")
+    # Mezcla de tipos escalares: se conserva cada valor como JSON
+    return "json"
+
+
+class _ColumnReader:
+    """Lee columnas del contenedor con np.frombuffer (sin copiar el buffer)"""
+
+    def __init__(self, buffer, data_start: int, header: Dict[str, Any]):
+        self._buffer = buffer
+        self._data_start = data_start
+        self._arrays = header["arrays"]
+
+        strings = header["strings"]
+        count = strings["count"]
+        offsets = self._view(_U4, strings["offsets"], count + 1).tolist()
+        blob = bytes(self._view(np.uint8, strings["data"], offsets[-1] if offsets else 0))
+        self._strings = [blob[offsets[i]:offsets[i + 1]].decode("utf-8") for i in range(count)]
+
+    def _view(self, dtype, offset: int, count: int) -> np.ndarray:
+        return np.frombuffer(self._buffer, dtype=dtype, count=count, offset=self._data_start + offset)
+
+    def array(self, name: str) -> np.ndarray:
+        descriptor = self._arrays[name]
+        return self._view(np.dtype(descriptor["dtype"]), descriptor["offset"], descriptor["count"])
+
+    def generic_rows(self, columns: Dict[str, Dict[str, Any]], count: int) -> List[Dict[str, Any]]:
+        rows = [{} for _ in range(count)]
+        # prefijo -> lista de dicts contenedores por fila (None si la fila no tiene ese dict)
+        containers = {"": rows}
+
+        for name, descriptor in columns.items():
+            kind = descriptor["kind"]
+            prefix, _, key = name.rpartition(".")
+            parents = containers[prefix]
+            mask = None
+            if descriptor["mask"] is not None:
+                mask = self._view(np.uint8, descriptor["mask"], count).tolist()
+
+            if kind == "dict":
+                children = [
+                    {} if parent is not None and (mask is None or mask[i] == _PRESENT) else None
+                    for i, parent in enumerate(parents)
+                ]
+                column = children
+                containers[name] = children
+            elif kind in ("f4", "f8"):
+                column = self._view(_F4 if kind == "f4" else _F8, descriptor["offset"], count).tolist()
+            elif kind == "i4":
+                column = self._view(_I4, descriptor["offset"], count).tolist()
+            elif kind == "b1":
+                column = self._view(np.uint8, descriptor["offset"], count).astype(bool).tolist()
+            else:
+                # Las filas ausentes o nulas llevan un índice de relleno (0) que no
+                # es un valor: solo se resuelven (y se decodifican) las presentes
+                strings = self._strings
+                indices = self._view(_U4, descriptor["offset"], count).tolist()
+                if mask is None:
+                    column = [strings[i] for i in indices]
+                else:
+                    column = [strings[i] if state == _PRESENT else None for i, state in zip(indices, mask)]
+                if kind == "json":
+                    column = [None if v is None else json.loads(v) for v in column]
+
+            if mask is None:
+                for parent, value in zip(parents, column):
+                    if parent is not None:
+                        parent[key] = value
+            else:
+                for parent, state, value in zip(parents, mask, column):
+                    if parent is None or state == _ABSENT:
+                        continue
+                    parent[key] = None if state == _NULL else value
+        return rows
@@ -0,0 +1,215 @@
+# ---------------------------------------------------
+# Proyecto: Asteroid
+# Autor: Daryll Lorenzo Alfonso
+# Año: 2025
+# Licencia: MIT License
+# ---------------------------------------------------
+"""
+Proyectos comprimidos (.astr.gz / .astr.xz, también .astrb.gz / .astrb.xz).
+
+La compresión se elige por la extensión al guardar y se detecta por los
+magic bytes al abrir, así que un archivo renombrado se sigue leyendo bien.
+
+Al leer JSON comprimido no se guarda el texto descomprimido completo: se
+descomprime por bloques y los registros de "nodes" y "edges" se decodifican
+uno a uno, descartando el texto ya leído. En memoria solo queda el documento
+final (los diccionarios) más un bloque de texto.
+"""
+import codecs
+import gzip
+import json
+import lzma
+import re
+from typing import Any, Dict, IO
+
+from app.core.astr_binary import AstrBinaryFormat, MAGIC as BINARY_MAGIC
+
+GZIP_MAGIC = b"\x1f\x8b"
+XZ_MAGIC = b"\xfd7zXZ\x00"
+
+# Sufijo -> tipo de compresión
+SUFFIXES = {".gz": "gzip", ".xz": "xz"}
+
+_WHITESPACE = re.compile(r"\s*")
+
+
+class AstrCompressedFormat:
+    # Tamaño del bloque de texto descomprimido que se procesa cada vez
+    READ_CHUNK_SIZE = 256 * 1024
+
+    # ==================== DETECCIÓN ====================
+
+    @staticmethod
+    def compression_for(filename: str):
+        """Tipo de compresión que corresponde a la extensión (None si no va comprimido)"""
+        for suffix, kind in SUFFIXES.items():
+            if filename.endswith(suffix):
+                return kind
+        return None
+
+    @staticmethod
+    def inner_filename(filename: str) -> str:
+        """Nombre sin el sufijo de compresión (decide JSON o binario)"""
+        for suffix in SUFFIXES:
+            if filename.endswith(suffix):
+                return filename[:-len(suffix)]
+        return filename
+
+    @staticmethod
+    def detect(head: bytes):
+        """Tipo de compresión según los primeros bytes del archivo"""
+        if head.startswith(GZIP_MAGIC):
+            return "gzip"
+        if head.startswith(XZ_MAGIC):
+            return "xz"
+        return None
+
+    # ==================== ESCRITURA ====================
+
+    @staticmethod
+    def compress(payload: bytes, kind: str) -> bytes:
+        if kind == "gzip":
+            return gzip.compress(payload, compresslevel=6)
+        if kind == "xz":
+            return lzma.compress(payload, preset=6)
+        raise ValueError(f"Compresión no soportada: {kind}")
+
+    # ==================== LECTURA ====================
+
+    @staticmethod
+    def open(filename: str, kind: str) -> IO[bytes]:
+        """Abre el archivo como un stream de bytes ya descomprimidos"""
+        if kind == "gzip":
+            return gzip.open(filename, 'rb')
+        if kind == "xz":
+            return lzma.open(filename, 'rb')
+        raise ValueError(f"Compresión no soportada: {kind}")
+
+    @staticmethod
+    def read(filename: str, kind: str) -> Dict[str, Any]:
+        """Lee un documento comprimido (JSON en streaming o binario)"""
+        with AstrCompressedFormat.open(filename, kind) as raw:
+            if raw.peek(len(BINARY_MAGIC))[:len(BINARY_MAGIC)] == BINARY_MAGIC:
+                # El formato columnar necesita el buffer completo
+                return AstrBinaryFormat.decode(raw.read())
+
+            return _JsonStreamReader(raw, AstrCompressedFormat.READ_CHUNK_SIZE).read_document()
+
+
+class _JsonStreamReader:
+    """
+    Decodifica el objeto JSON de un documento a partir de un stream de bytes.
+
+    Las listas de primer nivel ("nodes", "edges") se decodifican elemento a
+    elemento; el resto de valores de primer nivel son pequeños y se decodifican
+    de una vez. El texto ya consumido se descarta.
+    """
+
+    def __init__(self, raw: IO[bytes], chunk_size: int):
+        self._raw = raw
+        self._chunk_size = chunk_size
+        self._decoder = codecs.getincrementaldecoder("utf-8")()
+        self._buffer = ""
+        self._pos = 0
+        self._eof = False
+
+        # Cada registro se decodifica por separado, así que las claves se
+        # comparten a mano (json.load lo hace dentro de un mismo documento)
+        keys = {}
+        self._scanner = json.JSONDecoder(
+            object_pairs_hook=lambda pairs: {keys.setdefault(key, key): value for key, value in pairs}
+        )
+
+    def read_document(self) -> Dict[str, Any]:
+        document = {}
+        self._expect("{")
+        if self._peek() == "}":
+            self._pos += 1
+            return document
+
+        while True:
+            key = self._decode_value()
+            self._expect(":")
+            if self._peek() == "[":
+                document[key] = self._decode_list()
+            else:
+                document[key] = self._decode_value()
+
+            separator = self._next_char()
+            if separator == "}":
+                return document
+            if separator != ",":
+                raise ValueError(f"JSON inválido: se esperaba ',' o '}}' y se encontró {separator!r}")
+
+    def _decode_list(self) -> list:
+        items = []
+        self._expect("[")
+        if self._peek() == "]":
+            self._pos += 1
+            return items
+
+        while True:
+            items.append(self._decode_value())
+            separator = self._next_char()
+            if separator == "]":
+                return items
+            if separator != ",":
+                raise ValueError(f"JSON inválido: se esperaba ',' o ']' y se encontró {separator!r}")
+
+    def _decode_value(self):
+        """Decodifica un valor completo; si el bloque lo corta, lee más texto"""
+        self._skip_whitespace()
+        while True:
+            try:
+                value, end = self._scanner.raw_decode(self._buffer, self._pos)
+            except json.JSONDecodeError:
+                if self._eof:
+                    raise
+                self._fill()
+                continue
+
+            # Un número al final del bloque puede continuar en el siguiente
+            if end >= len(self._buffer) and not self._eof:
+                self._fill()
+                continue
+
+            self._pos = end
+            return value
+
+    def _expect(self, char: str):
+        found = self._next_char()
+        if found != char:
+            raise ValueError(f"JSON inválido: se esperaba {char!r} y se encontró {found!r}")
+
+    def _next_char(self) -> str:
+        char = self._peek()
+        self._pos += 1
+        return char
+
+    def _peek(self) -> str:
+        self._skip_whitespace()
+        while self._pos >= len(self._buffer):
+            if self._eof:
+                raise ValueError("JSON inválido: fin de archivo inesperado")
+            self._fill()
+            self._skip_whitespace()
+        return self._buffer[self._pos]
+
+    def _skip_whitespace(self):
+        while True:
+            self._pos = _WHITESPACE.match(self._buffer, self._pos).end()
+            if self._pos < len(self._buffer) or self._eof:
+                return
+            self._fill()
+
+    def _fill(self):
+        """Añade un bloque descomprimido al buffer, descartando lo ya consumido"""
+        chunk = self._raw.read(self._chunk_size)
+        if not chunk:
+            self._eof = True
+            text = self._decoder.decode(b"", final=True)
+        else:
+            text = self._decoder.decode(chunk)
+        self._buffer = self._buffer[self._pos:] + text
+        self._pos = 0
+
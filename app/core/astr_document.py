@@ -0,0 +1,208 @@
+# ---------------------------------------------------
+# Proyecto: Asteroid
+# Autor: Daryll Lorenzo Alfonso
+# Año: 2025
+# Licencia: MIT License
+# ---------------------------------------------------
+"""
+Documento .astr / .astrb como datos planos (diccionarios y listas).
+
+Lectura, escritura atómica, codificación e índices del documento. No depende
+de PyQt6: lo usan tanto la interfaz (AstrFormat, que serializa los items de
+la escena) como las herramientas que trabajan solo con modelos (AstrScene).
+"""
+import json
+import os
+import uuid
+from typing import Any, Callable, Dict, List, Tuple
+from app.core.astr_binary import AstrBinaryFormat, MAGIC as BINARY_MAGIC
+from app.core.astr_compressed import AstrCompressedFormat, SUFFIXES as COMPRESSION_SUFFIXES
+
+
+class AstrDocument:
+    # Versión del documento que se escribe
+    VERSION = "1.5"
+
+    # Desde 1.5 los ids de nodos y edges son strings persistentes (y existe
+    # composite_pair); los documentos anteriores usan índices numéricos
+    STABLE_IDS_VERSION = (1, 5)
+
+    # Extensiones que se pueden guardar: JSON, binario y ambos comprimidos
+    EXTENSIONS = (".astr", AstrBinaryFormat.EXTENSION) + tuple(
+        base + suffix for base in (".astr", AstrBinaryFormat.EXTENSION) for suffix in COMPRESSION_SUFFIXES
+    )
+
+    # Tamaño de bloque al escribir (para poder informar del progreso)
+    WRITE_CHUNK_SIZE = 1 << 20
+
+    @staticmethod
+    def encode(scene_data: Dict[str, Any], filename: str) -> bytes:
+        """
+        Codifica el documento: binario si la extensión es .astrb, JSON en otro
+        caso, comprimido si además termina en .gz o .xz (p. ej. proyecto.astr.gz)
+        """
+        compression = AstrCompressedFormat.compression_for(filename)
+        if compression:
+            inner_filename = AstrCompressedFormat.inner_filename(filename)
+            return AstrCompressedFormat.compress(AstrDocument.encode(scene_data, inner_filename), compression)
+
+        if filename.endswith(AstrBinaryFormat.EXTENSION):
+            return AstrBinaryFormat.encode(scene_data)
+        return json.dumps(scene_data, indent=2, ensure_ascii=False).encode('utf-8')
+
+    @staticmethod
+    def write_file(scene_data: Dict[str, Any], filename: str, progress: Callable[[float], None] = None):
+        """
+        Escribe el documento de forma atómica: archivo temporal junto al destino,
+        fsync y rename. Si algo falla, el archivo anterior queda intacto.
+
+        Args:
+            progress: callback opcional con la fracción completada (0.0 - 1.0)
+
+        Raises:
+            ValueError: si la extensión no es una de EXTENSIONS (el formato se elige por ella)
+        """
+        if not filename.endswith(AstrDocument.EXTENSIONS):
+            raise ValueError(f"Extensión no soportada: {os.path.basename(filename)} "
+                             f"(se admite {', '.join(AstrDocument.EXTENSIONS)})")
+
+        payload = AstrDocument.encode(scene_data, filename)
+        if progress:
+            progress(0.5)
+
+        temp_path = filename + ".tmp"
+        try:
+            with open(temp_path, 'wb') as f:
+                view = memoryview(payload)
+                total = max(len(view), 1)
+                for start in range(0, len(view), AstrDocument.WRITE_CHUNK_SIZE):
+                    end = start + AstrDocument.WRITE_CHUNK_SIZE
+                    f.write(view[start:end])
+                    if progress:
+                        progress(0.5 + 0.5 * min(end, total) / total)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temp_path, filename)
+        except BaseException:
+            try:
+                os.remove(temp_path)
+            except OSError:
+                pass
+            raise
+
+    @staticmethod
+    def read_file(filename: str) -> Dict[str, Any]:
+        """Lee un documento detectando el formato (binario, comprimido o JSON) por su cabecera"""
+        with open(filename, 'rb') as f:
+            head = f.read(len(BINARY_MAGIC))
+
+        if head == BINARY_MAGIC:
+            return AstrBinaryFormat.read(filename)
+
+        compression = AstrCompressedFormat.detect(head)
+        if compression:
+            return AstrCompressedFormat.read(filename, compression)
+
+        with open(filename, 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    @staticmethod
+    def new_document(node_records: List[Dict[str, Any]] = None, edge_records: List[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Documento con la cabecera estándar y los registros indicados"""
+        node_records = node_records if node_records is not None else []
+        edge_records = edge_records if edge_records is not None else []
+        return {
+            "version": AstrDocument.VERSION,
+            "metadata": {
+                "created_by": "Asteroid",
+                "node_count": len(node_records),
+                "edge_count": len(edge_records)
+            },
+            "nodes": node_records,
+            "edges": edge_records
+        }
+
+    @staticmethod
+    def version_of(scene_data: Dict[str, Any]) -> Tuple[int, ...]:
+        """Versión del documento como tupla comparable ((0,) si falta o no se entiende)"""
+        try:
+            return tuple(int(part) for part in str(scene_data.get('version', '')).split('.'))
+        except ValueError:
+            return (0,)
+
+    @staticmethod
+    def has_stable_ids(scene_data: Dict[str, Any]) -> bool:
+        """True si la versión del documento garantiza ids persistentes en nodos y edges"""
+        return AstrDocument.version_of(scene_data) >= AstrDocument.STABLE_IDS_VERSION
+
+    @staticmethod
+    def assign_fresh_ids(scene_data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Reemplaza los ids de un documento antiguo (anterior a STABLE_IDS_VERSION)
+        por ids persistentes nuevos, actualizando parent_id/source_id/target_id,
+        y lo marca con la versión actual. Las referencias colgantes se dejan tal cual.
+        """
+        id_map = {}
+        for node_data in scene_data.get('nodes', []):
+            id_map[node_data.get('id')] = uuid.uuid4().hex
+            node_data['id'] = id_map[node_data.get('id')]
+
+        for node_data in scene_data.get('nodes', []):
+            node_data['parent_id'] = id_map.get(node_data.get('parent_id'), node_data.get('parent_id'))
+            model_props = node_data.get('model_properties', {})
+            if 'composite_pair' in model_props:
+                model_props['composite_pair'] = id_map.get(model_props['composite_pair'])
+
+        for edge_data in scene_data.get('edges', []):
+            edge_data['id'] = uuid.uuid4().hex
+            for key in ('source_id', 'target_id', 'parent_id'):
+                edge_data[key] = id_map.get(edge_data.get(key), edge_data.get(key))
+
+        scene_data['version'] = AstrDocument.VERSION
+        return scene_data
+
+    @staticmethod
+    def index_scene(scene_data: Dict[str, Any]) -> Dict[str, Dict]:
+        """
+        Construye en una sola pasada los índices que necesita el cargador.
+
+        Returns:
+            Diccionario con:
+                - nodes_by_id: id -> node_data
+                - children_by_parent: parent_id -> [node_id, ...]
+                - edges_by_source: source_id -> [edge_data, ...]
+                - composite_external_ids: ids de nodos composite externos
+                - composite_pairs: id externo -> id interno (archivos con composite_pair)
+        """
+        nodes_by_id = {}
+        children_by_parent = {}
+        edges_by_source = {}
+        composite_external_ids = []
+        composite_pairs = {}
+
+        for node_data in scene_data.get('nodes', []):
+            node_id = node_data['id']
+            nodes_by_id[node_id] = node_data
+
+            parent_id = node_data.get('parent_id')
+            if parent_id is not None:
+                children_by_parent.setdefault(parent_id, []).append(node_id)
+            elif node_data.get('model_properties', {}).get('is_composite', False):
+                # Solo los nodos composite externos (sin parent_id)
+                composite_external_ids.append(node_id)
+
+        for node_id in composite_external_ids:
+            pair_id = nodes_by_id[node_id]['model_properties'].get('composite_pair')
+            if pair_id in nodes_by_id and pair_id != node_id:
+                composite_pairs[node_id] = pair_id
+
+        for edge_data in scene_data.get('edges', []):
+            edges_by_source.setdefault(edge_data['source_id'], []).append(edge_data)
+
+        return {
+            "nodes_by_id": nodes_by_id,
+            "children_by_parent": children_by_parent,
+            "edges_by_source": edges_by_source,
+            "composite_external_ids": composite_external_ids,
+            "composite_pairs": composite_pairs,
+        }
@@ -0,0 +1,290 @@
+# ---------------------------------------------------
+# Proyecto: Asteroid
+# Autor: Daryll Lorenzo Alfonso
+# Año: 2025
+# Licencia: MIT License
+# ---------------------------------------------------
+"""
+Proyecto .astr como modelos puros (BaseNode / BaseEdge), sin PyQt6.
+
+Pensado para herramientas (conversiones, scripts, procesos por lotes) que
+necesitan leer, modificar y escribir proyectos sin crear una QApplication:
+
+    scene = AstrScene.read("proyecto.astr")
+    for node in scene.nodes.values():
+        node.label = node.label.upper()
+    scene.write("proyecto.astrb")
+
+Los modelos llevan lo que representan (posición, radio, textos, colores...);
+lo demás de cada registro (estado del subcanvas, control points, datos del
+par composite, propiedades extra) se conserva tal cual al volver a escribir.
+"""
+from typing import Any, Callable, Dict, List
+
+from app.core.astr_document import AstrDocument
+from app.core.models.base_edge import BaseEdge
+from app.core.models.base_node import BaseNode
+from app.core.models.entity.actor import Actor
+from app.core.models.entity.agent import Agent
+from app.core.models.tropos_element.hard_goal import HardGoal
+from app.core.models.tropos_element.soft_goal import SoftGoal
+from app.core.models.tropos_element.plan import Plan
+from app.core.models.tropos_element.resource import Resource
+from app.core.models.dependency.simple_edge import SimpleEdge
+from app.core.models.dependency.dashed_edge import DashedEdge
+from app.core.models.dependency.dependency_link_edge import DependencyLinkEdge
+from app.core.models.dependency.why_link_edge import WhyLinkEdge
+from app.core.models.dependency.or_decomposition_edge import OrDecompositionEdge
+from app.core.models.dependency.and_decomposition_edge import AndDecompositionEdge
+from app.core.models.dependency.contribution_edge import ContributionEdge
+from app.core.models.dependency.means_end_edge import MeansEndEdge
+from app.log import get_logger
+
+log = get_logger("scene")
+
+NODE_MODELS = {
+    "actor": Actor,
+    "agent": Agent,
+    "hard_goal": HardGoal,
+    "soft_goal": SoftGoal,
+    "plan": Plan,
+    "resource": Resource,
+}
+
+EDGE_MODELS = {
+    "simple": SimpleEdge,
+    "dashed": DashedEdge,
+    "dependency_link": DependencyLinkEdge,
+    "why_link": WhyLinkEdge,
+    "or_decomposition": OrDecompositionEdge,
+    "and_decomposition": AndDecompositionEdge,
+    "contribution": ContributionEdge,
+    "means_end": MeansEndEdge,
+}
+
+# Campos del modelo que se guardan en model_properties
+_MODEL_FIELDS = (
+    "x", "y", "radius", "label", "color", "border_color", "text_color",
+    "position_in_subcanvas_x", "position_in_subcanvas_y",
+    "content_offset_x", "content_offset_y",
+    "text_width", "text_align", "show_subcanvas",
+)
+
+# Campos del modelo que también aparecen en "properties"
+_PROPERTY_FIELDS = (
+    "radius", "label", "color", "border_color", "text_color",
+    "font_size", "text_width", "text_align",
+)
+
+_FLOAT_FIELDS = {
+    "x", "y", "radius", "position_in_subcanvas_x", "position_in_subcanvas_y",
+    "content_offset_x", "content_offset_y", "text_width",
+}
+
+
+class AstrScene:
+    def __init__(self):
+        self.nodes: Dict[str, BaseNode] = {}
+        self.edges: Dict[str, BaseEdge] = {}
+        # id de nodo/edge -> id del nodo en cuyo subcanvas está
+        self.parents: Dict[str, str] = {}
+        # id -> registro leído (base para volver a escribir lo que no está en el modelo)
+        self._records: Dict[str, Dict[str, Any]] = {}
+
+    # ---------------------
+    # Archivos
+    # ---------------------
+    @staticmethod
+    def read(filename: str) -> "AstrScene":
+        """Lee un proyecto (.astr o .astrb) aplicando su journal si existe"""
+        # El journal vive en app.utils pero no depende de la interfaz
+        from app.utils.change_journal import ChangeJournal
+        return AstrScene.from_document(ChangeJournal.read_scene(filename))
+
+    def write(self, filename: str, progress: Callable[[float], None] = None):
+        """Escribe el proyecto de forma atómica (el formato lo decide la extensión)"""
+        AstrDocument.write_file(self.to_document(), filename, progress=progress)
+
+    # ---------------------
+    # Documento <-> modelos
+    # ---------------------
+    @staticmethod
+    def from_document(scene_data: Dict[str, Any]) -> "AstrScene":
+        """
+        Construye los modelos de un documento ya leído. Los documentos
+        anteriores a STABLE_IDS_VERSION reciben ids persistentes nuevos.
+        """
+        if not AstrDocument.has_stable_ids(scene_data):
+            AstrDocument.assign_fresh_ids(scene_data)
+
+        scene = AstrScene()
+        for node_data in scene_data.get('nodes', []):
+            ModelClass = NODE_MODELS.get(node_data.get('type'))
+            if ModelClass is None:
+                log.warning("⚠️ Tipo de nodo desconocido, se omite: %s", node_data.get('type'))
+                continue
+
+            model = ModelClass()
+            model.id = node_data['id']
+            AstrScene._apply_record(model, node_data)
+            scene.nodes[model.id] = model
+            scene._records[model.id] = node_data
+
+        for node_data in scene_data.get('nodes', []):
+            parent_id = node_data.get('parent_id')
+            if node_data['id'] in scene.nodes and parent_id in scene.nodes:
+                scene.parents[node_data['id']] = parent_id
+                scene.nodes[parent_id].child_nodes.append(scene.nodes[node_data['id']])
+
+        for edge_data in scene_data.get('edges', []):
+            EdgeClass = EDGE_MODELS.get(edge_data.get('type'))
+            source = scene.nodes.get(edge_data.get('source_id'))
+            target = scene.nodes.get(edge_data.get('target_id'))
+            if EdgeClass is None or source is None or target is None:
+                log.warning("⚠️ Edge %s omitida (tipo o extremos inválidos)", edge_data.get('id'))
+                continue
+
+            edge = EdgeClass(source, target)
+            edge.id = edge_data['id']
+            scene.edges[edge.id] = edge
+            scene._records[edge.id] = edge_data
+            if edge_data.get('parent_id') in scene.nodes:
+                scene.parents[edge.id] = edge_data['parent_id']
+
+        return scene
+
+    def to_document(self) -> Dict[str, Any]:
+        """Documento con el estado actual de los modelos"""
+        node_records = [self.node_record(model) for model in self.nodes.values()]
+        edge_records = [
+            self.edge_record(edge) for edge in self.edges.values()
+            if edge.source.id in self.nodes and edge.target.id in self.nodes
+        ]
+        return AstrDocument.new_document(node_records, edge_records)
+
+    def node_record(self, model: BaseNode) -> Dict[str, Any]:
+        """Registro de un nodo: el leído (si lo hay) actualizado con el modelo"""
+        loaded = self._records.get(model.id)
+        record = AstrScene._copy_record(loaded) if loaded else {
+            "id": model.id,
+            "type": model.node_type(),
+            "position": {"x": float(model.x), "y": float(model.y)},
+            "properties": {},
+            "model_properties": {},
+        }
+        model_props = record.setdefault("model_properties", {})
+
+        # Si el modelo se movió, la posición del item se desplaza lo mismo
+        for axis in ("x", "y"):
+            if axis in model_props:
+                delta = float(getattr(model, axis)) - float(model_props[axis])
+                if delta:
+                    record["position"][axis] = float(record["position"][axis]) + delta
+                    if axis in record.get("properties", {}):
+                        record["properties"][axis] = float(record["properties"][axis]) + delta
+
+        for field in _MODEL_FIELDS:
+            model_props[field] = AstrScene._field_value(model, field)
+        properties = record.setdefault("properties", {})
+        for field in _PROPERTY_FIELDS:
+            if field in properties or loaded is None:
+                properties[field] = AstrScene._field_value(model, field)
+
+        record["parent_id"] = self.parents.get(model.id)
+        return record
+
+    def edge_record(self, edge: BaseEdge) -> Dict[str, Any]:
+        """Registro de una edge: el leído (si lo hay) con los extremos actuales"""
+        loaded = self._records.get(edge.id)
+        record = AstrScene._copy_record(loaded) if loaded else {
+            "id": edge.id,
+            "type": edge.edge_type(),
+            "properties": {},
+            "control_points": [],
+        }
+        record["source_id"] = edge.source.id
+        record["target_id"] = edge.target.id
+        record["parent_id"] = self.parents.get(edge.id)
+        return record
+
+    @staticmethod
+    def _copy_record(record: Dict[str, Any]) -> Dict[str, Any]:
+        """Copia un registro hasta el segundo nivel (lo que se modifica al escribir)"""
+        return {
+            key: dict(value) if isinstance(value, dict) else list(value) if isinstance(value, list) else value
+            for key, value in record.items()
+        }
+
+    @staticmethod
+    def _apply_record(model: BaseNode, node_data: Dict[str, Any]):
+        """Copia al modelo los campos guardados en el registro"""
+        model_props = node_data.get('model_properties', {})
+        properties = node_data.get('properties', {})
+        position = node_data.get('position', {})
+
+        model.x = float(model_props.get('x', position.get('x', 0.0)))
+        model.y = float(model_props.get('y', position.get('y', 0.0)))
+        for field in _MODEL_FIELDS[2:]:
+            if field in model_props:
+                setattr(model, field, model_props[field])
+            elif field in properties:
+                setattr(model, field, properties[field])
+        if 'font_size' in properties:
+            model.font_size = properties['font_size']
+
+    @staticmethod
+    def _field_value(model: BaseNode, field: str):
+        value = getattr(model, field)
+        return float(value) if field in _FLOAT_FIELDS else value
+
+    # ---------------------
+    # Edición
+    # ---------------------
+    def add_node(self, model: BaseNode, parent: BaseNode = None) -> str:
+        """Añade un nodo (opcionalmente dentro del subcanvas de `parent`)"""
+        self.nodes[model.id] = model
+        if parent is not None:
+            self.parents[model.id] = parent.id
+            parent.child_nodes.append(model)
+        return model.id
+
+    def add_edge(self, edge: BaseEdge, parent: BaseNode = None) -> str:
+        """Añade una edge entre dos nodos de la escena"""
+        self.edges[edge.id] = edge
+        if parent is not None:
+            self.parents[edge.id] = parent.id
+        return edge.id
+
+    def remove_edge(self, edge_id: str):
+        self.edges.pop(edge_id, None)
+        self.parents.pop(edge_id, None)
+        self._records.pop(edge_id, None)
+
+    def remove_node(self, node_id: str):
+        """Elimina un nodo con sus descendientes y las edges que los tocan"""
+        removed = set()
+        stack = [node_id]
+        while stack:
+            current = stack.pop()
+            model = self.nodes.pop(current, None)
+            if model is None:
+                continue
+            removed.add(current)
+            stack.extend(child.id for child in model.child_nodes)
+
+        parent = self.nodes.get(self.parents.get(node_id))
+        if parent is not None:
+            parent.child_nodes = [child for child in parent.child_nodes if child.id != node_id]
+
+        for edge_id, edge in list(self.edges.items()):
+            if edge.source.id in removed or edge.target.id in removed or self.parents.get(edge_id) in removed:
+                self.remove_edge(edge_id)
+
+        for removed_id in removed:
+            self.parents.pop(removed_id, None)
+            self._records.pop(removed_id, None)
+
+    def children(self, node_id: str) -> List[BaseNode]:
+        """Nodos que están directamente en el subcanvas de un nodo"""
+        return [self.nodes[child_id] for child_id, parent_id in self.parents.items()
+                if parent_id == node_id and child_id in self.nodes]
@@ -0,0 +1,229 @@
+# ---------------------------------------------------
+# Proyecto: Asteroid
+# Autor: Daryll Lorenzo Alfonso
+# Año: 2025
+# Licencia: MIT License
+# ---------------------------------------------------
+"""
+Validación previa de documentos .astr (sin Qt).
+
+Se ejecuta sobre el documento ya leído y antes de tocar el canvas, así que un
+archivo dañado no deja la escena a medio construir. Recorre nodos y edges una
+sola vez y devuelve cada problema con su ubicación:
+
+    [{"severity": "error", "path": "edges[12].target_id",
+      "message": "referencia a un nodo inexistente: '5f0c...'"}]
+
+- "error": el documento no se puede cargar tal cual.
+- "warning": se carga, pero algo se ignorará (p. ej. un par composite roto).
+"""
+from typing import Any, Dict, List
+
+from app.core.astr_document import AstrDocument
+from app.core.astr_scene import NODE_MODELS, EDGE_MODELS
+
+# Tipos de nodo que tienen subcanvas (pueden ser parent_id de otros elementos)
+CONTAINER_TYPES = {"actor", "agent"}
+
+# Tipos aceptados como número (bool queda fuera a propósito)
+_NUMBER_TYPES = (int, float)
+
+# Campos numéricos que el cargador convierte con float()
+_NUMERIC_MODEL_FIELDS = (
+    "x", "y", "radius",
+    "position_in_subcanvas_x", "position_in_subcanvas_y",
+    "content_offset_x", "content_offset_y",
+    "internal_position_in_subcanvas_x", "internal_position_in_subcanvas_y",
+)
+
+
+class AstrValidator:
+    # Máximo de problemas que se informan (un archivo muy dañado no necesita más)
+    MAX_ISSUES = 200
+
+    @staticmethod
+    def validate(scene_data: Any) -> List[Dict[str, str]]:
+        """Devuelve la lista de problemas del documento (vacía si es válido)"""
+        issues = []
+
+        def report(severity, path, message):
+            if len(issues) < AstrValidator.MAX_ISSUES:
+                issues.append({"severity": severity, "path": path, "message": message})
+
+        if not isinstance(scene_data, dict):
+            report("error", "$", "el documento no es un objeto JSON")
+            return issues
+
+        nodes = scene_data.get("nodes", [])
+        edges = scene_data.get("edges", [])
+        if not isinstance(nodes, list):
+            report("error", "nodes", "debe ser una lista")
+            nodes = []
+        if not isinstance(edges, list):
+            report("error", "edges", "debe ser una lista")
+            edges = []
+
+        # Desde STABLE_IDS_VERSION los ids son strings y toda edge tiene id;
+        # antes valen los índices numéricos y las edges sin id
+        version = AstrDocument.version_of(scene_data)
+        stable_ids = version >= AstrDocument.STABLE_IDS_VERSION
+        if version > AstrDocument.version_of({"version": AstrDocument.VERSION}):
+            report("warning", "version", f"documento de una versión más nueva: {scene_data.get('version')!r}")
+
+        # ---- Nodos: ids, tipos y campos (una pasada) ----
+        node_types = {}    # id -> tipo
+        parents = {}       # id -> (parent_id, path)
+        pairs = []         # (path, id del par)
+        for index, node_data in enumerate(nodes):
+            path = f"nodes[{index}]"
+            if not isinstance(node_data, dict):
+                report("error", path, "el nodo no es un objeto")
+                continue
+
+            node_id = node_data.get("id")
+            if not AstrValidator._is_id(node_id, stable_ids):
+                report("error", f"{path}.id", f"id ausente o inválido: {node_id!r}")
+                continue
+            if node_id in node_types:
+                report("error", f"{path}.id", f"id duplicado: {node_id!r}")
+                continue
+
+            node_type = node_data.get("type")
+            node_types[node_id] = node_type
+            if node_type not in NODE_MODELS:
+                report("error", f"{path}.type", f"tipo de nodo desconocido: {node_type!r}")
+
+            AstrValidator._check_point(node_data.get("position"), f"{path}.position", report)
+
+            model_props = node_data.get("model_properties", {})
+            if not isinstance(model_props, dict):
+                report("error", f"{path}.model_properties", "debe ser un objeto")
+                model_props = {}
+            for field in _NUMERIC_MODEL_FIELDS:
+                if field in model_props and type(model_props[field]) not in _NUMBER_TYPES:
+                    report("error", f"{path}.model_properties.{field}", f"no es un número: {model_props[field]!r}")
+            if model_props.get("composite_pair") is not None:
+                pairs.append((f"{path}.model_properties.composite_pair", model_props["composite_pair"]))
+
+            subcanvas = node_data.get("subcanvas")
+            if subcanvas is not None:
+                if not isinstance(subcanvas, dict):
+                    report("error", f"{path}.subcanvas", "debe ser un objeto")
+                else:
+                    for field in ("radius", "original_radius"):
+                        if field in subcanvas and not AstrValidator._is_number(subcanvas[field]):
+                            report("error", f"{path}.subcanvas.{field}", f"no es un número: {subcanvas[field]!r}")
+
+            parent_id = node_data.get("parent_id")
+            if parent_id is not None:
+                parents[node_id] = (parent_id, f"{path}.parent_id")
+
+        # ---- Jerarquía: referencias y ciclos ----
+        for node_id, (parent_id, path) in parents.items():
+            if parent_id not in node_types:
+                report("error", path, f"referencia a un nodo inexistente: {parent_id!r}")
+            elif parent_id == node_id:
+                report("error", path, "el nodo es su propio padre")
+            elif node_types[parent_id] not in CONTAINER_TYPES:
+                report("warning", path, f"el padre es de tipo {node_types[parent_id]!r}, que no tiene subcanvas")
+
+        for path, cycle in AstrValidator._find_cycles(parents):
+            report("error", path, "ciclo en parent_id: " + " -> ".join(repr(node_id) for node_id in cycle))
+
+        for path, pair_id in pairs:
+            if pair_id not in node_types:
+                report("warning", path, f"par composite inexistente: {pair_id!r} (se usará la heurística)")
+
+        # ---- Edges ----
+        edge_ids = set()
+        for index, edge_data in enumerate(edges):
+            path = f"edges[{index}]"
+            if not isinstance(edge_data, dict):
+                report("error", path, "la edge no es un objeto")
+                continue
+
+            edge_id = edge_data.get("id")
+            if edge_id is None and stable_ids:
+                report("error", f"{path}.id", "id ausente")
+            elif edge_id is not None:
+                if not AstrValidator._is_id(edge_id, stable_ids):
+                    report("error", f"{path}.id", f"id inválido: {edge_id!r}")
+                elif edge_id in edge_ids:
+                    report("error", f"{path}.id", f"id duplicado: {edge_id!r}")
+                else:
+                    edge_ids.add(edge_id)
+
+            edge_type = edge_data.get("type")
+            if edge_type not in EDGE_MODELS:
+                report("error", f"{path}.type", f"tipo de edge desconocido: {edge_type!r}")
+
+            for key in ("source_id", "target_id"):
+                if edge_data.get(key) not in node_types:
+                    report("error", f"{path}.{key}", f"referencia a un nodo inexistente: {edge_data.get(key)!r}")
+
+            parent_id = edge_data.get("parent_id")
+            if parent_id is not None and parent_id not in node_types:
+                report("error", f"{path}.parent_id", f"referencia a un nodo inexistente: {parent_id!r}")
+
+            control_points = edge_data.get("control_points", [])
+            if not isinstance(control_points, list):
+                report("error", f"{path}.control_points", "debe ser una lista")
+            else:
+                for point_index, point in enumerate(control_points):
+                    AstrValidator._check_point(point, f"{path}.control_points[{point_index}]", report)
+
+        return issues
+
+    @staticmethod
+    def errors(issues: List[Dict[str, str]]) -> List[Dict[str, str]]:
+        return [issue for issue in issues if issue["severity"] == "error"]
+
+    @staticmethod
+    def format_issue(issue: Dict[str, str]) -> str:
+        return f"{issue['path']}: {issue['message']}"
+
+    # ---------------------
+    # Auxiliares
+    # ---------------------
+    @staticmethod
+    def _is_id(value, stable_ids: bool = True) -> bool:
+        # Ids persistentes (str) o, en archivos antiguos, índices (int)
+        if isinstance(value, str):
+            return value != ""
+        return not stable_ids and isinstance(value, int) and not isinstance(value, bool)
+
+    @staticmethod
+    def _is_number(value) -> bool:
+        return type(value) in _NUMBER_TYPES
+
+    @staticmethod
+    def _check_point(point, path: str, report):
+        if type(point) is not dict:
+            report("error", path, "debe ser un objeto {x, y}")
+            return
+        if type(point.get("x")) in _NUMBER_TYPES and type(point.get("y")) in _NUMBER_TYPES:
+            return
+        for axis in ("x", "y"):
+            if type(point.get(axis)) not in _NUMBER_TYPES:
+                report("error", f"{path}.{axis}", f"no es un número: {point.get(axis)!r}")
+
+    @staticmethod
+    def _find_cycles(parents: Dict[Any, tuple]):
+        """Ciclos en parent_id: devuelve (path del primer nodo, [ids del ciclo])"""
+        state = {}  # id -> 1 en el camino actual, 2 ya resuelto
+        for start in parents:
+            if start in state:
+                continue
+            chain = []
+            current = start
+            while current in parents and current not in state:
+                state[current] = 1
+                chain.append(current)
+                current = parents[current][0]
+
+            if state.get(current) == 1:
+                cycle = chain[chain.index(current):]
+                if len(cycle) > 1:
+                    yield parents[cycle[0]][1], cycle + [cycle[0]]
+            for node_id in chain:
+                state[node_id] = 2
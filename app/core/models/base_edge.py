@@ -6,11 +6,14 @@
 # ---------------------------------------------------
 
 from abc import ABC, abstractmethod
+import uuid
 
 class BaseEdge(ABC):
     """Modelo lógico de una arista entre dos nodos."""
 
     def __init__(self, source, target):
+        # Id persistente: se guarda en el .astr y se conserva entre sesiones
+        self.id = uuid.uuid4().hex
         self.source = source
         self.target = target
 
@@ -5,9 +5,12 @@
 # Licencia: MIT License
 # ---------------------------------------------------
 from abc import ABC, abstractmethod
+import uuid
 
 class BaseNode(ABC):
     def __init__(self, x=0, y=0, radius=50):
+        # Id persistente: se guarda en el .astr y se conserva entre sesiones
+        self.id = uuid.uuid4().hex
         self.x = x
         self.y = y
         self.radius = radius
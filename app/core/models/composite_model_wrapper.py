@@ -41,15 +41,29 @@ class CompositeModelWrapper:
     
     def _notify_change(self, prop_name, value):
         """Notifica a los callbacks que una propiedad cambió"""
-        for callback in self._on_change_callbacks:
+        for _, callback in self._on_change_callbacks:
             try:
                 callback(prop_name, value)
             except Exception:
                 pass
     
-    def add_change_callback(self, callback):
-        """Agrega un callback que se llama cuando una propiedad sincronizada cambia"""
-        self._on_change_callbacks.append(callback)
+    def add_change_callback(self, callback, owner=None):
+        """
+        Agrega un callback que se llama cuando una propiedad sincronizada cambia.
+        `owner` es el nodo que lo registra (ver remove_change_callbacks).
+        """
+        self._on_change_callbacks.append((owner, callback))
+
+    def remove_change_callbacks(self, owner):
+        """Quita los callbacks de un nodo eliminado (sus closures lo mantendrían vivo)"""
+        self._on_change_callbacks[:] = [
+            (callback_owner, callback) for callback_owner, callback in self._on_change_callbacks
+            if callback_owner is not owner
+        ]
+
+    @property
+    def change_callback_count(self) -> int:
+        return len(self._on_change_callbacks)
     
     # ==================== PROPIEDADES SINCRONIZADAS ====================
     
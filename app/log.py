@@ -0,0 +1,86 @@
+# ---------------------------------------------------
+# Proyecto: Asteroid
+# Autor: Daryll Lorenzo Alfonso
+# Año: 2025
+# Licencia: MIT License
+# ---------------------------------------------------
+"""
+Loggers de Asteroid (jerarquía "asteroid").
+
+Cada módulo pide el suyo con un nombre corto:
+
+    log = get_logger("controller")        # -> "asteroid.controller"
+    log.debug("Nodo %s creado", node_id)  # se formatea solo si se va a emitir
+
+Por defecto no se escribe nada: "asteroid" tiene un NullHandler, nivel
+WARNING y no propaga al logger raíz, así que un log.debug() en un bucle
+cuesta una comparación de nivel. Para ver mensajes:
+
+    ASTEROID_LOG=info python main.py
+    ASTEROID_LOG=warning,controller=debug,format=info python main.py
+
+o configure_logging("debug") desde código (la CLI lo usa con --verbose).
+"""
+import logging
+import os
+import sys
+from typing import Dict
+
+ROOT_LOGGER = "asteroid"
+ENV_VARIABLE = "ASTEROID_LOG"
+
+_FORMAT = "%(asctime)s %(levelname)-7s %(name)s: %(message)s"
+
+_root = logging.getLogger(ROOT_LOGGER)
+_root.addHandler(logging.NullHandler())
+_root.setLevel(logging.WARNING)
+_root.propagate = False
+
+# Handler instalado por configure_logging (para no duplicarlo al reconfigurar)
+_handler = None
+
+
+def get_logger(name: str) -> logging.Logger:
+    """Logger "asteroid.<name>" de un módulo"""
+    return logging.getLogger(f"{ROOT_LOGGER}.{name}")
+
+
+def parse_levels(spec: str) -> Dict[str, int]:
+    """
+    "info,controller=debug" -> {"": INFO, "controller": DEBUG}
+    ("" es el nivel de toda la jerarquía)
+    """
+    levels = {}
+    for part in spec.split(","):
+        part = part.strip()
+        if not part:
+            continue
+        name, _, level = part.rpartition("=")
+        value = logging.getLevelName(level.strip().upper())
+        if not isinstance(value, int):
+            raise ValueError(f"Nivel de log desconocido: {level!r}")
+        levels[name.strip()] = value
+    return levels
+
+
+def configure_logging(spec: str = None, stream=None):
+    """
+    Activa la salida de los loggers de Asteroid en `stream` (stderr por defecto).
+    `spec` usa el formato de ASTEROID_LOG; sin spec se lee la variable de entorno
+    y, si no está definida, todo sigue en silencio.
+    """
+    global _handler
+    spec = spec if spec is not None else os.environ.get(ENV_VARIABLE, "")
+    levels = parse_levels(spec)
+    if not levels:
+        return
+
+    if _handler is not None:
+        _root.removeHandler(_handler)
+    _handler = logging.StreamHandler(stream or sys.stderr)
+    _handler.setFormatter(logging.Formatter(_FORMAT, datefmt="%H:%M:%S"))
+    _root.addHandler(_handler)
+
+    _root.setLevel(levels.pop("", logging.WARNING))
+    for name, level in levels.items():
+        get_logger(name).setLevel(level)
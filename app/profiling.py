@@ -0,0 +1,215 @@
+# ---------------------------------------------------
+# Proyecto: Asteroid
+# Autor: Daryll Lorenzo Alfonso
+# Año: 2025
+# Licencia: MIT License
+# ---------------------------------------------------
+"""
+Perfilado opcional de cargas, guardados, exportaciones y pintado.
+
+Se activa con la variable de entorno o con --profile (main.py y la CLI):
+
+    ASTEROID_PROFILE=perfiles/ python main.py
+    python main.py --profile perfiles/
+
+Cada operación perfilada escribe en ese directorio dos archivos con el
+mismo prefijo (fecha, pid y nombre):
+
+    20250612-101502-123-4242-load.prof        # cProfile (snakeviz, pstats...)
+    20250612-101502-123-4242-load-alloc.txt   # tracemalloc: pico y top-N
+
+El pintado del Canvas se acumula en una sola sesión ("render") que se
+escribe al cerrar la aplicación (flush_render_profile).
+
+Sin activar, cada punto perfilado solo comprueba una variable del módulo.
+"""
+import cProfile
+import os
+import time
+import tracemalloc
+from datetime import datetime
+from functools import wraps
+
+from app.log import get_logger
+
+log = get_logger("profile")
+
+ENV_VARIABLE = "ASTEROID_PROFILE"
+
+# Líneas del informe de asignaciones
+TOP_ALLOCATIONS = 25
+# Frames de tracemalloc guardados por asignación
+TRACE_FRAMES = 5
+
+# Directorio de salida (None: perfilado desactivado)
+_directory = None
+# Sesión con el profiler activo (en Python 3.12 solo puede haber uno)
+_active = None
+# Sesión acumulada del pintado del Canvas
+_render = None
+
+
+def configure_profiling(directory: str = None):
+    """
+    Activa el perfilado escribiendo en `directory` (sin argumento se usa
+    ASTEROID_PROFILE; si tampoco está definida, todo sigue desactivado).
+    """
+    global _directory
+    directory = directory if directory is not None else os.environ.get(ENV_VARIABLE, "")
+    if not directory:
+        return None
+
+    os.makedirs(directory, exist_ok=True)
+    _directory = os.path.abspath(directory)
+    if not tracemalloc.is_tracing():
+        tracemalloc.start(TRACE_FRAMES)
+    log.info("Perfilado activado: %s", _directory)
+    return _directory
+
+
+def is_enabled() -> bool:
+    return _directory is not None
+
+
+def profiled(name: str):
+    """
+    Decorador: perfila cada llamada como una operación `name`. Si ya hay otra
+    operación perfilándose (p. ej. un export dentro de un render), la llamada
+    queda incluida en esa.
+    """
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            if _directory is None:
+                return func(*args, **kwargs)
+            session = start_session(name)
+            try:
+                return func(*args, **kwargs)
+            finally:
+                if session is not None:
+                    session.stop()
+        return wrapper
+    return decorator
+
+
+def start_session(name: str):
+    """Empieza a perfilar una operación; None si está desactivado o ya hay una en curso"""
+    if _directory is None or _active is not None:
+        return None
+    session = ProfileSession(name)
+    return session if session.start() else None
+
+
+def render_frame_begin():
+    """Reanuda la sesión acumulada del pintado (desde Canvas.paintEvent)"""
+    global _render
+    if _directory is None or _active is not None:
+        return False
+    if _render is None:
+        _render = ProfileSession("render")
+    return _render.resume()
+
+
+def render_frame_end():
+    _render.pause()
+
+
+def flush_render_profile():
+    """Escribe la sesión acumulada del pintado (al cerrar la aplicación)"""
+    global _render
+    if _render is not None and _render.frames:
+        _render.write()
+    _render = None
+
+
+def _snapshot():
+    """Snapshot de tracemalloc sin el propio tracemalloc ni el sistema de imports"""
+    return tracemalloc.take_snapshot().filter_traces((
+        tracemalloc.Filter(False, tracemalloc.__file__),
+        tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+        tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+    ))
+
+
+class ProfileSession:
+    def __init__(self, name: str):
+        self.name = name
+        self.profiler = cProfile.Profile()
+        self.frames = 0
+        self.seconds = 0.0
+        self._started = None
+        self._baseline = None
+
+    # ---------------------
+    # Operaciones sueltas (start/stop) y sesión acumulada (resume/pause)
+    # ---------------------
+    def start(self) -> bool:
+        self._baseline = _snapshot()
+        tracemalloc.reset_peak()
+        if not self.resume():
+            log.warning("No se pudo perfilar %s: ya hay otro profiler activo en el proceso", self.name)
+            return False
+        return True
+
+    def stop(self):
+        self.pause()
+        self.write()
+
+    def resume(self) -> bool:
+        global _active
+        try:
+            self.profiler.enable()
+        except ValueError:
+            # Otro profiler del proceso (p. ej. python -m cProfile main.py)
+            return False
+        _active = self
+        self._started = time.perf_counter()
+        return True
+
+    def pause(self):
+        global _active
+        self.profiler.disable()
+        self.seconds += time.perf_counter() - self._started
+        self.frames += 1
+        _active = None
+
+    # ---------------------
+    # Salida
+    # ---------------------
+    def write(self):
+        """Escribe el .prof y el informe de asignaciones; devuelve sus rutas"""
+        prefix = os.path.join(
+            _directory,
+            f"{datetime.now().strftime('%Y%m%d-%H%M%S-%f')[:-3]}-{os.getpid()}-{self.name}"
+        )
+        prof_path = prefix + ".prof"
+        alloc_path = prefix + "-alloc.txt"
+        try:
+            self.profiler.dump_stats(prof_path)
+            with open(alloc_path, "w", encoding="utf-8") as report:
+                report.write(self._allocation_report())
+        except OSError as e:
+            log.error("❌ No se pudo escribir el perfil de %s: %s", self.name, e)
+            return None
+
+        log.info("📊 Perfil de %s (%.3f s): %s", self.name, self.seconds, prof_path)
+        return prof_path, alloc_path
+
+    def _allocation_report(self) -> str:
+        current, peak = tracemalloc.get_traced_memory()
+        snapshot = _snapshot()
+
+        lines = [
+            f"Operación: {self.name}",
+            f"Duración: {self.seconds:.3f} s" + (f" en {self.frames} frames" if self._baseline is None else ""),
+            f"Memoria trazada: actual {current / 2**20:.1f} MiB, pico {peak / 2**20:.1f} MiB",
+            "",
+        ]
+        if self._baseline is not None:
+            lines.append(f"Top {TOP_ALLOCATIONS} asignaciones retenidas por la operación:")
+            stats = snapshot.compare_to(self._baseline, "lineno")
+        else:
+            lines.append(f"Top {TOP_ALLOCATIONS} asignaciones vivas:")
+            stats = snapshot.statistics("lineno")
+        lines.extend(str(stat) for stat in stats[:TOP_ALLOCATIONS])
+        return "\n".join(lines) + "\n"
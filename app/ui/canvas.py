@@ -5,13 +5,22 @@
 # Licencia: MIT License
 # ---------------------------------------------------
 
+import time
+
 from PyQt6.QtWidgets import QGraphicsScene, QGraphicsView
 from PyQt6.QtGui import QPainter, QWheelEvent, QCursor
-from PyQt6.QtCore import Qt, pyqtSignal, QPointF
+from PyQt6.QtCore import Qt, pyqtSignal, QPointF, QTimer
 
 from app.ui.components.base_edge_item import BaseEdgeItem
 from app.ui.components.subcanvas_item import SubCanvasItem
 from app.ui.components.control_point_handle import ControlPointHandle
+from app.ui.perf_hud import PerfHud
+from app.ui.node_cache import NodeCache
+from app.ui.edge_update_scheduler import EdgeUpdateScheduler
+from app import profiling
+from app.log import get_logger
+
+log = get_logger("canvas")
 
 
 class Canvas(QGraphicsView):
@@ -22,6 +31,10 @@ class Canvas(QGraphicsView):
     arrow_dropped = pyqtSignal(str)        # tipo de flecha
     node_clicked = pyqtSignal(object)      # para controladores
 
+    # Edges pendientes en un evento de arrastre a partir de las que la escena
+    # deja de mantener su índice espacial hasta soltar el ratón
+    DRAG_NOINDEX_EDGES = 100
+
     def __init__(self):
         super().__init__()
         self.scene = QGraphicsScene()
@@ -41,11 +54,54 @@ class Canvas(QGraphicsView):
         self.min_zoom = 0.1
         self.max_zoom = 5.0
 
+        # Caché de pintado de los nodos: suspendida mientras dura el zoom
+        NodeCache.configure()
+        self._zoom_settle_timer = QTimer(self)
+        self._zoom_settle_timer.setSingleShot(True)
+        self._zoom_settle_timer.setInterval(NodeCache.ZOOM_SETTLE_MS)
+        self._zoom_settle_timer.timeout.connect(self._zoom_settled)
+        # Método de índice de la escena guardado mientras dura un arrastre grande
+        self._drag_index_method = None
+
         # Configuración de vista
         self.setDragMode(QGraphicsView.DragMode.RubberBandDrag)
         self.setTransformationAnchor(QGraphicsView.ViewportAnchor.AnchorUnderMouse)
         self.setResizeAnchor(QGraphicsView.ViewportAnchor.AnchorUnderMouse)
 
+        # HUD de rendimiento (oculto por defecto)
+        self.hud = PerfHud(self)
+
+    # ---------------------
+    # HUD de rendimiento
+    # ---------------------
+    def set_hud_visible(self, visible: bool):
+        self.hud.set_enabled(visible)
+
+    def paintEvent(self, event):
+        # Con ASTEROID_PROFILE los frames se acumulan en la sesión "render"
+        profiling_frame = profiling.is_enabled() and profiling.render_frame_begin()
+        try:
+            if not self.hud.enabled:
+                super().paintEvent(event)
+                return
+            started = time.perf_counter()
+            super().paintEvent(event)
+            self.hud.end_frame(started, event.rect())
+        finally:
+            if profiling_frame:
+                profiling.render_frame_end()
+
+    def drawForeground(self, painter, rect):
+        super().drawForeground(painter, rect)
+        if self.hud.enabled:
+            self.hud.draw(painter)
+
+    def scrollContentsBy(self, dx, dy):
+        super().scrollContentsBy(dx, dy)
+        # El desplazamiento copia píxeles: el HUD (fijo en el viewport) se repinta
+        if self.hud.enabled:
+            self.hud.refresh()
+
     # ---------------------
     # Drag & Drop
     # ---------------------
@@ -73,23 +129,23 @@ class Canvas(QGraphicsView):
                                  "or_decomposition", "and_decomposition", "contribution", "means_end"]:
                     # forward a subcanvas
                     it.subarrow_dropped.emit(item_type)
-                    print(f"Canvas: forwarded arrow '{item_type}' to subcanvas {it}")
+                    log.debug("Canvas: forwarded arrow '%s' to subcanvas %s", item_type, it)
                 else:
                     # forward a subcanvas node
                     it.subnode_dropped.emit(item_type, float(local_pt.x()), float(local_pt.y()))
-                    print(f"Canvas: forwarded node '{item_type}' to subcanvas {it} at local {local_pt}")
+                    log.debug("Canvas: forwarded node '%s' to subcanvas %s at local %s", item_type, it, local_pt)
                 event.acceptProposedAction()
                 return
 
         # si no hay subcanvas debajo, dropeo global
         if item_type in ["actor", "agent", "hard_goal", "soft_goal", "plan", "resource"]:
             self.node_dropped.emit(item_type, scene_pos.x(), scene_pos.y())
-            print(f"Canvas: node dropped globally '{item_type}' at scene {scene_pos}")
+            log.debug("Canvas: node dropped globally '%s' at scene %s", item_type, scene_pos)
             event.acceptProposedAction()
         elif item_type in ["simple", "dashed", "dependency_link", "why_link",
                            "or_decomposition", "and_decomposition", "contribution", "means_end"]:
             self.arrow_dropped.emit(item_type)
-            print(f"Canvas: arrow dropped globally '{item_type}'")
+            log.debug("Canvas: arrow dropped globally '%s'", item_type)
             event.acceptProposedAction()
     
     def mousePressEvent(self, event):
@@ -112,7 +168,7 @@ class Canvas(QGraphicsView):
                 
                 # Si encontramos un nodo padre válido, usarlo
                 if parent is not None and not isinstance(parent, BaseEdgeItem):
-                    print(f"🔍 Subcanvas click - usando nodo padre: {parent}")
+                    log.debug("🔍 Subcanvas click - usando nodo padre: %s", parent)
                     self.node_clicked.emit(parent)
                 else:
                     # Si no hay padre válido, ignorar
@@ -174,6 +230,23 @@ class Canvas(QGraphicsView):
                 self.setCursor(Qt.CursorShape.ArrowCursor)
         
         super().mouseMoveEvent(event)
+        # Arrastrando muchos nodos cada edge movida reubica su entrada en el
+        # árbol BSP (prepareGeometryChange): sin índice hasta soltar el ratón
+        if (self._drag_index_method is None
+                and event.buttons() & Qt.MouseButton.LeftButton
+                and EdgeUpdateScheduler.pending() >= self.DRAG_NOINDEX_EDGES):
+            self._drag_index_method = self.scene.itemIndexMethod()
+            self.scene.setItemIndexMethod(QGraphicsScene.ItemIndexMethod.NoIndex)
+        # Las edges de todos los nodos arrastrados se actualizan una vez por evento
+        EdgeUpdateScheduler.flush()
+
+    def mouseReleaseEvent(self, event):
+        super().mouseReleaseEvent(event)
+        EdgeUpdateScheduler.flush()
+        if self._drag_index_method is not None:
+            # Volver al índice original lo reconstruye una sola vez
+            self.scene.setItemIndexMethod(self._drag_index_method)
+            self._drag_index_method = None
     
     # ---------------------
     # Zoom
@@ -186,6 +259,7 @@ class Canvas(QGraphicsView):
             new_zoom = self.zoom_factor * factor
             if self.min_zoom <= new_zoom <= self.max_zoom:
                 self.zoom_factor = new_zoom
+                self._zooming()
                 self.scale(factor, factor)
                 self.zoom_changed.emit(self.zoom_factor)
         else:
@@ -196,6 +270,7 @@ class Canvas(QGraphicsView):
         new_zoom = self.zoom_factor * factor
         if new_zoom <= self.max_zoom:
             self.zoom_factor = new_zoom
+            self._zooming()
             self.scale(factor, factor)
             self.zoom_changed.emit(self.zoom_factor)
 
@@ -204,14 +279,25 @@ class Canvas(QGraphicsView):
         new_zoom = self.zoom_factor * factor
         if new_zoom >= self.min_zoom:
             self.zoom_factor = new_zoom
+            self._zooming()
             self.scale(factor, factor)
             self.zoom_changed.emit(self.zoom_factor)
 
     def reset_zoom(self):
+        self._zooming()
         self.resetTransform()
         self.zoom_factor = 1.0
         self.zoom_changed.emit(self.zoom_factor)
 
+    def _zooming(self):
+        """Con cada escala los pixmaps cacheados se rehacen: se pinta sin caché hasta que el zoom se detiene"""
+        if not self._zoom_settle_timer.isActive():
+            NodeCache.suspend_all(self.scene.items())
+        self._zoom_settle_timer.start()
+
+    def _zoom_settled(self):
+        NodeCache.resume_all(self.scene.items())
+
     def keyPressEvent(self, event):
         """Maneja eventos de teclado para eliminación"""
         # Delegar el manejo de teclas al controlador
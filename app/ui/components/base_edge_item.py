@@ -7,11 +7,15 @@
 # ---------------------------------------------------
 
 from PyQt6.QtWidgets import QGraphicsPathItem, QGraphicsItem
-from PyQt6.QtGui import QPen, QPolygonF, QColor, QPainterPath, QPainter
+from PyQt6.QtGui import QPen, QPolygonF, QColor, QPainterPath, QPainter, QPainterPathStroker
 from PyQt6.QtCore import QPointF, QRectF, Qt
 import math
 
 from app.ui.components.control_point_handle import ControlPointHandle
+from app.ui.components.edge_polyline import EdgePolyline
+from app.ui.frame_stats import FrameStats
+from app.ui.edge_update_scheduler import EdgeUpdateScheduler
+from app.ui.level_of_detail import LevelOfDetail
 
 
 class BaseEdgeItem(QGraphicsPathItem):
@@ -20,10 +24,18 @@ class BaseEdgeItem(QGraphicsPathItem):
     Soporta puntos de control para modificar la forma de la línea (estilo Draw.io).
     """
 
-    def __init__(self, source_node, dest_node, color=QColor(0, 0, 0), dashed=False):
+    # Margen extra del boundingRect para los símbolos de la subclase
+    DECORATION_MARGIN = 0
+    # Zonas de los símbolos que también seleccionan la flecha en shape():
+    # (fracción del recorrido, semilado del cuadrado). Por defecto, la punta
+    DECORATION_ANCHORS = ((1.0, 14.0),)
+
+    def __init__(self, source_node, dest_node, color=QColor(0, 0, 0), dashed=False, model=None):
         super().__init__()
         self.source_node = source_node
         self.dest_node = dest_node
+        # Modelo lógico (BaseEdge): aporta el id persistente de la flecha
+        self.model = model
         self.setFlag(QGraphicsPathItem.GraphicsItemFlag.ItemIsSelectable, True)
         self.setZValue(5)
 
@@ -37,6 +49,8 @@ class BaseEdgeItem(QGraphicsPathItem):
         self._updating_position = False
         # Handle que se está arrastrando actualmente
         self._dragging_handle = None
+        # Callback opcional cuando el usuario cambia la forma (control points)
+        self.geometry_edited_callback = None
 
         # Configurar pen
         self.edge_color = color
@@ -49,12 +63,28 @@ class BaseEdgeItem(QGraphicsPathItem):
         # Cache de últimos puntos calculados
         self._start_point = QPointF(0, 0)
         self._end_point = QPointF(0, 0)
+        # Polilínea de la ruta actual (longitudes y ángulos para las decoraciones)
+        self._polyline = EdgePolyline()
+        # Centros de los nodos con los que se calculó la ruta (coordenadas de la ruta)
+        self._route_anchors = None
+        # boundingRect() y shape() de la ruta actual (None: por calcular)
+        self._bounding_rect = None
+        self._shape_path = None
 
         self.update_position()
         
         # Conectar a los cambios de posición de los nodos
         self._connect_to_nodes()
     
+    @property
+    def element_id(self):
+        """Id persistente de la flecha (el de su modelo)"""
+        return self.model.id if self.model is not None else None
+
+    @element_id.setter
+    def element_id(self, value):
+        self.model.id = value
+
     def _connect_to_nodes(self):
         """Conecta a las señales de cambio de posición y tamaño de los nodos"""
         # Conectar a positionChanged de ambos nodos (si existe)
@@ -85,40 +115,115 @@ class BaseEdgeItem(QGraphicsPathItem):
     
     def _on_node_properties_changed(self, node, properties):
         """Callback cuando cambian las propiedades de un nodo (ej: tamaño/radio)"""
-        # Si el radio cambió, necesitamos actualizar el edge
+        # Si el radio cambió, los puntos de borde cambian: ruta completa
         if 'radius' in properties:
-            self._on_node_moved()
+            EdgeUpdateScheduler.schedule(self, recompute=True)
     
     def _on_node_moved(self):
-        """Callback cuando un nodo conectado se mueve"""
-        if not self._updating_position:
-            # Notificar que la geometría está a punto de cambiar
-            # Esto es CRÍTICO para que Qt sepa que debe recalcular colisiones y redibujar
-            self.prepareGeometryChange()
-            self.update_position()
-            # Forzar redibujado y actualizar bounding rect
-            self.update()
+        """Callback cuando un nodo conectado se mueve: se actualiza una vez por frame"""
+        EdgeUpdateScheduler.schedule(self)
+
+    def apply_scheduled_update(self, recompute: bool):
+        """Actualización pendiente de EdgeUpdateScheduler"""
+        if self._updating_position or not self.source_node or not self.dest_node:
+            return
+
+        if not recompute and not self.control_points and self._route_anchors is not None:
+            src, dst = self._node_anchors()
+            old_src, old_dst = self._route_anchors
+            delta = src - old_src
+            if delta == dst - old_dst:
+                # Los dos nodos se movieron lo mismo: la ruta recta solo se traslada
+                if not delta.isNull():
+                    self._translate_route(delta)
+                return
+
+        # Notificar que la geometría está a punto de cambiar
+        # Esto es CRÍTICO para que Qt sepa que debe recalcular colisiones y redibujar
+        self.prepareGeometryChange()
+        self.update_position()
+        # Forzar redibujado y actualizar bounding rect
+        self.update()
+
+    def _translate_route(self, delta: QPointF):
+        self.prepareGeometryChange()
+        self._start_point = self._start_point + delta
+        self._end_point = self._end_point + delta
+        self._polyline = self._polyline.translated(delta.x(), delta.y())
+        self._route_anchors = (self._route_anchors[0] + delta, self._route_anchors[1] + delta)
+        if self._bounding_rect is not None:
+            self._bounding_rect = self._bounding_rect.translated(delta)
+        if self._shape_path is not None:
+            self._shape_path = self._shape_path.translated(delta)
+        self.setPath(self.path().translated(delta))
+        self.update()
+
+    def _in_same_subcanvas(self) -> bool:
+        """Ambos nodos están en el mismo subcanvas (la ruta usa sus coordenadas locales)"""
+        return (hasattr(self.source_node, 'subcanvas_parent') and
+                self.source_node.subcanvas_parent is not None and
+                hasattr(self.dest_node, 'subcanvas_parent') and
+                self.dest_node.subcanvas_parent is not None and
+                self.source_node.subcanvas_parent == self.dest_node.subcanvas_parent)
+
+    def _node_anchors(self):
+        """Centros actuales de los nodos en las coordenadas de la ruta"""
+        if self._in_same_subcanvas():
+            return self.source_node.pos(), self.dest_node.pos()
+        src, dst = self.source_node.scenePos(), self.dest_node.scenePos()
+        if self.scene():
+            return self.mapFromScene(src), self.mapFromScene(dst)
+        return src, dst
 
     def boundingRect(self):
-        """Rectángulo delimitador que incluye la línea y los handles"""
-        # Obtener todos los puntos relevantes
-        points = [self._start_point, self._end_point] + self.control_points
-        
-        if not points:
-            return QRectF(0, 0, 0, 0)
-        
+        """Rectángulo delimitador que incluye la línea, los handles y los símbolos"""
+        # Qt lo pide en cada pintado y consulta del índice: se calcula una vez por ruta
+        if self._bounding_rect is None:
+            self._bounding_rect = self._build_bounding_rect()
+        return self._bounding_rect
+
+    def shape(self) -> QPainterPath:
+        """Trazo de la línea más las zonas de sus símbolos (para seleccionar)"""
+        if self._shape_path is None:
+            self._shape_path = self._build_shape()
+        return self._shape_path
+
+    def _build_bounding_rect(self) -> QRectF:
+        # Todos los puntos relevantes (inicio, control points y fin)
+        points = self._polyline.points or [self._start_point, self._end_point]
+
         # Calcular bounding box de todos los puntos
-        min_x = min(p.x() for p in points)
-        max_x = max(p.x() for p in points)
-        min_y = min(p.y() for p in points)
-        max_y = max(p.y() for p in points)
-        
-        # Agregar margen para la punta de flecha y handles
-        extra = max(self.pen().width() + 20, ControlPointHandle.HANDLE_SIZE)
-        
-        return QRectF(min_x - extra, min_y - extra, 
+        xs = [p.x() for p in points]
+        ys = [p.y() for p in points]
+        min_x, max_x = min(xs), max(xs)
+        min_y, max_y = min(ys), max(ys)
+
+        # Agregar margen para la punta de flecha, los handles y los símbolos
+        extra = max(self.pen().width() + 20, ControlPointHandle.HANDLE_SIZE) + self.DECORATION_MARGIN
+
+        return QRectF(min_x - extra, min_y - extra,
                       max_x - min_x + extra * 2, max_y - min_y + extra * 2)
 
+    def _build_shape(self) -> QPainterPath:
+        # Trazo continuo con el grosor del pen, como QGraphicsPathItem::shape()
+        # (sin el patrón de guiones: una flecha discontinua se selecciona entera)
+        pen = self.pen()
+        stroker = QPainterPathStroker()
+        stroker.setWidth(max(pen.widthF(), 0.00000001))
+        stroker.setCapStyle(pen.capStyle())
+        stroker.setJoinStyle(pen.joinStyle())
+        stroker.setMiterLimit(pen.miterLimit())
+        shape = stroker.createStroke(self.path())
+
+        # Cuadrados alrededor de la punta y de los símbolos
+        if self._polyline.length > 0:
+            for fraction, half in self.DECORATION_ANCHORS:
+                point, _ = self._polyline.point_at_percentage(fraction)
+                zone = QPainterPath()
+                zone.addRect(QRectF(point.x() - half, point.y() - half, half * 2, half * 2))
+                shape = shape.united(zone)
+        return shape
+
     def _get_node_border_point(self, node, target_pos, use_local_coords=False):
         """Calcula el punto de intersección en el borde del nodo hacia el punto objetivo"""
         if not node:
@@ -165,12 +270,10 @@ class BaseEdgeItem(QGraphicsPathItem):
         if not self.source_node or not self.dest_node:
             return [], QPointF(0, 0), QPointF(0, 0)
 
+        FrameStats.edge_geometry_updates += 1
+
         # Determinar si estamos en un subcanvas
-        in_subcanvas = (hasattr(self.source_node, 'subcanvas_parent') and
-                       self.source_node.subcanvas_parent is not None and
-                       hasattr(self.dest_node, 'subcanvas_parent') and
-                       self.dest_node.subcanvas_parent is not None and
-                       self.source_node.subcanvas_parent == self.dest_node.subcanvas_parent)
+        in_subcanvas = self._in_same_subcanvas()
 
         if in_subcanvas:
             # ✅ AMBOS nodos en el MISMO subcanvas - usar coordenadas LOCALES
@@ -180,6 +283,7 @@ class BaseEdgeItem(QGraphicsPathItem):
             # Calcular puntos de conexión en los bordes usando coordenadas locales
             start_point = self._get_node_border_point(self.source_node, dst_pos, use_local_coords=True)
             end_point = self._get_node_border_point(self.dest_node, src_pos, use_local_coords=True)
+            anchors = (src_pos, dst_pos)
         else:
             # ❌ Nodos en diferentes contextos - usar coordenadas de ESCENA
             src_scene_pos = self.source_node.scenePos()
@@ -188,13 +292,17 @@ class BaseEdgeItem(QGraphicsPathItem):
             start_point = self._get_node_border_point(self.source_node, dst_scene_pos, use_local_coords=False)
             end_point = self._get_node_border_point(self.dest_node, src_scene_pos, use_local_coords=False)
             
+            anchors = (src_scene_pos, dst_scene_pos)
+            
             # Transformar start_point y end_point de escena a local del edge
             if self.scene():
                 start_point = self.mapFromScene(start_point)
                 end_point = self.mapFromScene(end_point)
+                anchors = (self.mapFromScene(src_scene_pos), self.mapFromScene(dst_scene_pos))
 
         self._start_point = start_point
         self._end_point = end_point
+        self._route_anchors = anchors
 
         # Construir lista completa de puntos
         # control_points ya está en coordenadas locales
@@ -221,13 +329,7 @@ class BaseEdgeItem(QGraphicsPathItem):
             if not path_points:
                 return
 
-            # _calculate_path_points ya retorna puntos en coordenadas LOCALES
-            # Crear el path en coordenadas locales directamente
-            path = QPainterPath(path_points[0])
-            for point in path_points[1:]:
-                path.lineTo(point)
-
-            self.setPath(path)
+            self._set_path_points(path_points)
 
             # Actualizar posición de los handles (solo si no se está arrastrando uno)
             if self._dragging_handle is None:
@@ -237,13 +339,6 @@ class BaseEdgeItem(QGraphicsPathItem):
 
     def _update_handles_position(self):
         """Sincroniza la posición visual de los handles con los control_points"""
-        # Determinar si estamos en subcanvas
-        in_subcanvas = (hasattr(self.source_node, 'subcanvas_parent') and
-                       self.source_node.subcanvas_parent is not None and
-                       hasattr(self.dest_node, 'subcanvas_parent') and
-                       self.dest_node.subcanvas_parent is not None and
-                       self.source_node.subcanvas_parent == self.dest_node.subcanvas_parent)
-
         is_selected = self.isSelected()
 
         # Asegurar que hay tantos handles como control points
@@ -280,7 +375,15 @@ class BaseEdgeItem(QGraphicsPathItem):
     
     def _on_handle_released(self):
         """Callback cuando se suelta un handle"""
+        was_dragging = self._dragging_handle is not None
         self._dragging_handle = None
+        if was_dragging:
+            self._notify_geometry_edited()
+
+    def _notify_geometry_edited(self):
+        """Avisa al controlador de que cambió la forma de la flecha"""
+        if self.geometry_edited_callback:
+            self.geometry_edited_callback()
 
     def _on_handle_position_changed(self, handle, new_pos):
         """Callback cuando un handle es arrastrado"""
@@ -306,13 +409,18 @@ class BaseEdgeItem(QGraphicsPathItem):
         if not path_points:
             return
 
-        # _calculate_path_points ya retorna puntos en coordenadas LOCALES
-        # Crear el path en coordenadas locales directamente
-        path = QPainterPath(path_points[0])
-        for point in path_points[1:]:
-            path.lineTo(point)
+        self._set_path_points(path_points)
 
-        self.setPath(path)
+    def _set_path_points(self, path_points):
+        """
+        Guarda la polilínea y crea el path. _calculate_path_points ya retorna
+        puntos en coordenadas LOCALES: el path se crea directamente con ellos.
+        """
+        self._polyline = EdgePolyline(path_points)
+        # Nueva ruta: boundingRect() y shape() se recalculan cuando se pidan
+        self._bounding_rect = None
+        self._shape_path = None
+        self.setPath(self._polyline.to_path())
 
     def get_line(self):
         """
@@ -339,7 +447,7 @@ class BaseEdgeItem(QGraphicsPathItem):
         local_pos = self.mapFromScene(scene_pos)
 
         # Insertar en la posición correcta (más cercano al segmento)
-        path_points, start_point, end_point = self._calculate_path_points()
+        path_points = self._polyline.points
 
         if len(path_points) < 2:
             return
@@ -367,6 +475,7 @@ class BaseEdgeItem(QGraphicsPathItem):
 
         # Recalcular ruta
         self.update_position()
+        self._notify_geometry_edited()
 
     def _point_to_segment_distance(self, point: QPointF, line_start: QPointF, line_end: QPointF) -> float:
         """Calcula la distancia mínima de un punto a un segmento de línea"""
@@ -402,12 +511,14 @@ class BaseEdgeItem(QGraphicsPathItem):
             self.control_points.pop(index)
             self._update_handles_position()
             self.update_position()
+            self._notify_geometry_edited()
 
     def clear_control_points(self):
         """Elimina todos los puntos de control, volviendo a línea recta"""
         self.control_points.clear()
         self._update_handles_position()
         self.update_position()
+        self._notify_geometry_edited()
 
     def get_control_point_at(self, scene_pos: QPointF, tolerance: float = 10.0) -> int:
         """
@@ -442,12 +553,16 @@ class BaseEdgeItem(QGraphicsPathItem):
 
     def paint(self, painter: QPainter, option, widget=None):
         """Dibuja la arista con su punta de flecha"""
+        FrameStats.paint_calls += 1
         if not self.source_node or not self.dest_node:
             return
 
         # NO llamar a update_position() aquí para evitar temblor
         # El path ya debería estar actualizado por _on_handle_position_changed
         
+        if self.paint_simplified(painter, option):
+            return
+
         painter.setRenderHint(QPainter.RenderHint.Antialiasing)
         painter.setPen(self.pen())
 
@@ -457,6 +572,22 @@ class BaseEdgeItem(QGraphicsPathItem):
         # Dibujar punta de flecha
         self._draw_arrow_head(painter)
 
+    def paint_simplified(self, painter: QPainter, option) -> bool:
+        """
+        Con poco zoom la punta de flecha y los símbolos de las subclases quedan
+        por debajo de unos pocos píxeles: dibuja solo la línea y devuelve True.
+        Con zoom suficiente no dibuja nada y devuelve False.
+        """
+        lod = LevelOfDetail.of(painter, option)
+        if LevelOfDetail.shows_decorations(lod):
+            return False
+
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing, not LevelOfDetail.is_minimal(lod))
+        painter.setPen(LevelOfDetail.line_pen(self.pen(), lod))
+        painter.setBrush(Qt.BrushStyle.NoBrush)
+        painter.drawPath(self.path())
+        return True
+
     def _draw_arrow_head(self, painter: QPainter):
         """Dibuja la punta de la flecha al final de la línea."""
         path = self.path()
@@ -545,29 +676,17 @@ class BaseEdgeItem(QGraphicsPathItem):
             except (TypeError, RuntimeError):
                 pass
 
-        # Eliminar handles
+        # Eliminar handles y la actualización pendiente
         self.clear_handles()
+        self.geometry_edited_callback = None
+        EdgeUpdateScheduler.discard(self)
 
     def _get_path_segments(self):
         """
         Retorna una lista de segmentos del path como tuplas (p1, p2, length).
         Cada segmento es una línea recta entre dos puntos consecutivos.
         """
-        path_points, start_point, end_point = self._calculate_path_points()
-        
-        if len(path_points) < 2:
-            return []
-        
-        segments = []
-        for i in range(len(path_points) - 1):
-            p1 = path_points[i]
-            p2 = path_points[i + 1]
-            dx = p2.x() - p1.x()
-            dy = p2.y() - p1.y()
-            length = math.hypot(dx, dy)
-            segments.append((p1, p2, length))
-        
-        return segments
+        return self._polyline.segments()
 
     def _get_point_at_distance(self, distance: float) -> tuple[QPointF, float]:
         """
@@ -577,41 +696,7 @@ class BaseEdgeItem(QGraphicsPathItem):
         Returns:
             tuple: (QPointF del punto, float del ángulo en radianes)
         """
-        segments = self._get_path_segments()
-        
-        if not segments:
-            return QPointF(0, 0), 0.0
-        
-        # Calcular longitud total del path
-        total_length = sum(seg[2] for seg in segments)
-        
-        if total_length == 0:
-            return QPointF(0, 0), 0.0
-        
-        # Si la distancia es mayor que la longitud total, retornar el último punto
-        if distance >= total_length:
-            last_seg = segments[-1]
-            angle = math.atan2(last_seg[1].y() - last_seg[0].y(), 
-                              last_seg[1].x() - last_seg[0].x())
-            return last_seg[1], angle
-        
-        # Encontrar el segmento que contiene el punto deseado
-        accumulated = 0.0
-        for p1, p2, seg_length in segments:
-            if accumulated + seg_length >= distance:
-                # El punto está en este segmento
-                t = (distance - accumulated) / seg_length if seg_length > 0 else 0
-                x = p1.x() + t * (p2.x() - p1.x())
-                y = p1.y() + t * (p2.y() - p1.y())
-                angle = math.atan2(p2.y() - p1.y(), p2.x() - p1.x())
-                return QPointF(x, y), angle
-            accumulated += seg_length
-        
-        # No debería llegar aquí
-        last_seg = segments[-1]
-        angle = math.atan2(last_seg[1].y() - last_seg[0].y(), 
-                          last_seg[1].x() - last_seg[0].x())
-        return last_seg[1], angle
+        return self._polyline.point_at_distance(distance)
 
     def _get_tangent_at_distance(self, distance: float) -> float:
         """
@@ -631,16 +716,4 @@ class BaseEdgeItem(QGraphicsPathItem):
         Returns:
             tuple: (QPointF del punto, float del ángulo en radianes)
         """
-        segments = self._get_path_segments()
-        
-        if not segments:
-            return QPointF(0, 0), 0.0
-        
-        # Calcular longitud total del path
-        total_length = sum(seg[2] for seg in segments)
-        
-        if total_length == 0:
-            return QPointF(0, 0), 0.0
-        
-        target_distance = total_length * percentage
-        return self._get_point_at_distance(target_distance)
+        return self._polyline.point_at_percentage(percentage)
@@ -7,9 +7,17 @@
 
 from PyQt6.QtWidgets import QGraphicsObject, QGraphicsItem
 from PyQt6.QtCore import QRectF, pyqtSignal, Qt, QPointF
-from PyQt6.QtGui import QFont, QColor
+from PyQt6.QtGui import QColor, QPainterPath
 from app.ui.components.subcanvas_item import SubCanvasItem
+from app.ui.components.node_label import NodeLabel
+from app.ui.components.node_shape import NodeShape
+from app.ui.level_of_detail import LevelOfDetail
+from app.ui.node_cache import NodeCache
 
+# Propiedades que mueven o cambian la etiqueta del nodo
+_LABEL_GEOMETRY = NodeLabel.PROPERTIES | {"content_offset_x", "content_offset_y"}
+# Medio ancho del pen de selección (3px)
+_SELECTION_MARGIN = 1.5
 
 class BaseNodeItem(QGraphicsObject):
     nodeDoubleClicked = pyqtSignal(object)
@@ -17,37 +25,86 @@ class BaseNodeItem(QGraphicsObject):
     properties_changed = pyqtSignal(object, dict)
     positionChanged = pyqtSignal()  # Señal para notificar cuando el nodo se mueve
 
+    # Ancho de la franja de redimensionado (8 px a cada lado del borde)
+    RESIZE_BAND_WIDTH = 16.0
+
     def __init__(self, model):
         super().__init__()
         self.model = model
         self.setFlag(QGraphicsObject.GraphicsItemFlag.ItemIsMovable)
         self.setFlag(QGraphicsObject.GraphicsItemFlag.ItemIsSelectable)
+        # itemChange(ItemPositionHasChanged) avisa de todos los movimientos, no solo del nodo agarrado
+        self.setFlag(QGraphicsObject.GraphicsItemFlag.ItemSendsGeometryChanges)
         self.setAcceptHoverEvents(True)
         self._resizing = False
+        # Pintado cacheado en un pixmap mientras el nodo no cambia
+        NodeCache.apply(self)
         self.subcanvas = None
         self._subcanvas_visible = False
+        # Estado guardado (radio, etc.) de un subcanvas cargado colapsado que aún no se construyó
+        self.collapsed_subcanvas_state = None
         self.setZValue(10)
+        # Etiqueta maquetada (se rehace solo cuando cambian sus propiedades)
+        self._label = NodeLabel()
+        # Caminos de hit-test de la figura (se rehacen solo al cambiar el radio)
+        self._shape = NodeShape(self.RESIZE_BAND_WIDTH)
 
         if not hasattr(self.model, 'font_size'): self.model.font_size = 10
         if not hasattr(self.model, 'text_width'): self.model.text_width = 150
         if not hasattr(self.model, 'text_align'): self.model.text_align = 'center'
 
-    def boundingRect(self) -> QRectF:
+    def node_rect(self) -> QRectF:
+        """Rectángulo de la figura (sin la etiqueta)"""
         r = getattr(self.model, "radius", 50)
         return QRectF(-r, -r, 2 * r, 2 * r)
 
-    def _get_distance_to_border(self, pos: QPointF) -> float:
-        r = getattr(self.model, "radius", 50)
-        center_dist = (pos.x()**2 + pos.y()**2) ** 0.5
-        return abs(center_dist - r)
+    def boundingRect(self) -> QRectF:
+        # El pen de selección se sale de la figura; con caché lo que queda fuera se recortaría
+        # La franja de redimensionado de shape() también (RESIZE_BAND_WIDTH / 2)
+        m = max(_SELECTION_MARGIN, self.RESIZE_BAND_WIDTH / 2)
+        rect = self.node_rect().adjusted(-m, -m, m, m)
+        # La etiqueta puede salirse de la figura (text_width mayor que el diámetro)
+        label_rect = self.label_rect()
+        if label_rect.isEmpty():
+            return rect
+        return rect.united(label_rect)
+
+    def label_rect(self) -> QRectF:
+        """Rectángulo de la etiqueta en coordenadas del nodo (con content_offset)"""
+        label_rect = self.label_layout().rect
+        if label_rect.isEmpty():
+            return label_rect
+        offset_x = getattr(self.model, 'content_offset_x', 0)
+        offset_y = getattr(self.model, 'content_offset_y', 0)
+        return label_rect.translated(offset_x, offset_y)
+
+    def label_layout(self) -> NodeLabel:
+        """Etiqueta maquetada con las propiedades actuales del modelo"""
+        return self._label.layout(getattr(self.model, "label", ""),
+                                  getattr(self.model, "font_size", 10),
+                                  getattr(self.model, "text_width", 150),
+                                  getattr(self.model, "text_align", "center"))
+
+    def outline_path(self, r: float) -> QPainterPath:
+        """Contorno de la figura para el radio r"""
+        path = QPainterPath()
+        path.addEllipse(QRectF(-r, -r, 2 * r, 2 * r))
+        return path
+
+    def node_shape(self) -> NodeShape:
+        """Caminos de hit-test para el radio actual"""
+        return self._shape.layout(getattr(self.model, "radius", 50), self.outline_path)
+
+    def shape(self) -> QPainterPath:
+        # La etiqueta que se sale de la figura también selecciona el nodo
+        return self.node_shape().with_label(self.label_rect())
 
     def _get_new_radius_from_pos(self, pos: QPointF) -> float:
         center_dist = (pos.x()**2 + pos.y()**2) ** 0.5
         return max(center_dist, 10.0)
 
     def hoverMoveEvent(self, event):
-        dist = self._get_distance_to_border(event.pos())
-        if dist < 8:
+        if self.node_shape().on_resize_band(event.pos()):
             self.setCursor(Qt.CursorShape.SizeAllCursor)
         else:
             self.setCursor(Qt.CursorShape.ArrowCursor)
@@ -59,14 +116,23 @@ class BaseNodeItem(QGraphicsObject):
 
     def mousePressEvent(self, event):
         if event.button() == Qt.MouseButton.LeftButton:
-            dist = self._get_distance_to_border(event.pos())
-            if dist < 8:
+            if self.node_shape().on_resize_band(event.pos()):
                 self._resizing = True
+                NodeCache.suspend(self)
                 self.setSelected(True)
                 event.accept()
                 return
         super().mousePressEvent(event)
 
+    @property
+    def element_id(self):
+        """Id persistente del nodo (el de su modelo)"""
+        return self.model.id
+
+    @element_id.setter
+    def element_id(self, value):
+        self.model.id = value
+
     def mouseMoveEvent(self, event):
         if self._resizing:
             new_r = self._get_new_radius_from_pos(event.pos())
@@ -80,6 +146,7 @@ class BaseNodeItem(QGraphicsObject):
     def mouseReleaseEvent(self, event):
         if self._resizing and event.button() == Qt.MouseButton.LeftButton:
             self._resizing = False
+            NodeCache.resume(self)
             self.setCursor(Qt.CursorShape.ArrowCursor)
             event.accept()
             return
@@ -95,6 +162,7 @@ class BaseNodeItem(QGraphicsObject):
         self.prepareGeometryChange()
         old_r = getattr(self.model, 'radius', new_r)
         self.model.radius = new_r
+        self.node_shape()
         self.update()
 
         if old_r != new_r:
@@ -124,6 +192,7 @@ class BaseNodeItem(QGraphicsObject):
                 except Exception:
                     pass
                 self._subcanvas_original_pos = QPointF(0, 0)
+                self._restore_collapsed_subcanvas_state()
             else:
                 self.subcanvas.setVisible(True)
                 try:
@@ -161,6 +230,7 @@ class BaseNodeItem(QGraphicsObject):
             except Exception:
                 pass
             self._subcanvas_original_pos = QPointF(0, 0)
+            self._restore_collapsed_subcanvas_state()
         else:
             self.subcanvas.setVisible(True)
             try:
@@ -190,6 +260,7 @@ class BaseNodeItem(QGraphicsObject):
                 pass
             self.subcanvas._update_handle_pos()
             self._subcanvas_original_pos = QPointF(0, 0)
+            self._restore_collapsed_subcanvas_state()
         else:
             if not self.subcanvas.isVisible() and getattr(self.model, "show_subcanvas", False):
                 self.subcanvas.setVisible(True)
@@ -200,6 +271,19 @@ class BaseNodeItem(QGraphicsObject):
         
         return self.subcanvas
 
+    def _restore_collapsed_subcanvas_state(self):
+        """Aplica al subcanvas recién creado el estado guardado mientras estaba colapsado"""
+        state = self.collapsed_subcanvas_state
+        if not state or not self.subcanvas:
+            return
+        self.collapsed_subcanvas_state = None
+
+        if 'radius' in state:
+            self.subcanvas.radius = float(state['radius'])
+        if 'original_radius' in state:
+            self.subcanvas.original_radius = float(state['original_radius'])
+        self.subcanvas._update_handle_pos()
+
     def apply_position_in_subcanvas(self):
         if not hasattr(self.model, 'position_in_subcanvas_x') or not hasattr(self.model, 'position_in_subcanvas_y'):
             return
@@ -230,27 +314,14 @@ class BaseNodeItem(QGraphicsObject):
             'position_in_subcanvas_y': y_norm
         })
 
-    def draw_multiline_text(self, painter, text_color_hex):
-        label = getattr(self.model, "label", "")
-        if not label: return
-
-        text_width = getattr(self.model, "text_width", 150)
+    def draw_multiline_text(self, painter, text_color_hex, lod: float = 1.0):
         font_size = getattr(self.model, "font_size", 10)
-        align_str = getattr(self.model, "text_align", "center")
-        
-        align_flag = Qt.AlignmentFlag.AlignCenter
-        if align_str == "left": align_flag = Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter
-        elif align_str == "right": align_flag = Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter
-        
-        flags = Qt.TextFlag.TextWordWrap | align_flag
-        painter.setPen(QColor(text_color_hex))
-        painter.setFont(QFont("Arial", int(font_size)))
+        # Con poco zoom el texto no se leería: no se dibuja
+        if not LevelOfDetail.shows_text(lod, font_size): return
 
         offset_x = getattr(self.model, 'content_offset_x', 0)
         offset_y = getattr(self.model, 'content_offset_y', 0)
-        rect_height = 500 
-        text_rect = QRectF(-text_width / 2 + offset_x, -rect_height / 2 + offset_y, text_width, rect_height)
-        painter.drawText(text_rect, flags, label)
+        self.label_layout().draw(painter, QColor(text_color_hex), offset_x, offset_y)
 
     def get_serializable_properties(self):
         return {
@@ -270,6 +341,10 @@ class BaseNodeItem(QGraphicsObject):
 
     def update_properties(self, properties: dict):
         """Actualiza las propiedades del nodo desde datos serializados"""
+        if not _LABEL_GEOMETRY.isdisjoint(properties):
+            # La etiqueta forma parte del boundingRect
+            self.prepareGeometryChange()
+
         for key, value in properties.items():
             if hasattr(self.model, key):
                 setattr(self.model, key, value)
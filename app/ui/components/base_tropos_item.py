@@ -7,13 +7,23 @@
 
 from PyQt6.QtWidgets import QGraphicsObject, QGraphicsItem
 from PyQt6.QtCore import QRectF, pyqtSignal, Qt, QPointF
-from PyQt6.QtGui import QFont, QColor
+from PyQt6.QtGui import QColor, QPainterPath
+from app.ui.level_of_detail import LevelOfDetail
+from app.ui.node_cache import NodeCache
+from app.ui.components.node_label import NodeLabel
+from app.ui.components.node_shape import NodeShape
+
+# Medio ancho del pen de selección (3px)
+_SELECTION_MARGIN = 1.5
 
 class BaseTroposItem(QGraphicsObject):
     nodeDoubleClicked = pyqtSignal(object)
     properties_changed = pyqtSignal(object, dict)
     positionChanged = pyqtSignal()  # Señal para notificar cuando el nodo se mueve
 
+    # Ancho de la franja de redimensionado (8 px a cada lado del borde)
+    RESIZE_BAND_WIDTH = 16.0
+
     def __init__(self, model):
         super().__init__()
         self.model = model
@@ -21,9 +31,17 @@ class BaseTroposItem(QGraphicsObject):
         self._independent_model = None
         self.setFlag(QGraphicsObject.GraphicsItemFlag.ItemIsMovable)
         self.setFlag(QGraphicsObject.GraphicsItemFlag.ItemIsSelectable)
+        # itemChange(ItemPositionHasChanged) avisa de todos los movimientos, no solo del nodo agarrado
+        self.setFlag(QGraphicsObject.GraphicsItemFlag.ItemSendsGeometryChanges)
         self.setAcceptHoverEvents(True)
         self.setZValue(10)
         self._resizing = False
+        # Pintado cacheado en un pixmap mientras el nodo no cambia
+        NodeCache.apply(self)
+        # Etiqueta maquetada (se rehace solo cuando cambian sus propiedades)
+        self._label = NodeLabel(bold=True)
+        # Caminos de hit-test de la figura (se rehacen solo al cambiar el radio)
+        self._shape = NodeShape(self.RESIZE_BAND_WIDTH)
         if not hasattr(self.model, 'font_size'): self.model.font_size = 10
     
     def _get_model_for_independent_prop(self, prop_name, default=None):
@@ -36,22 +54,54 @@ class BaseTroposItem(QGraphicsObject):
             return getattr(self._independent_model, prop_name)
         return getattr(self.model, prop_name, default)
 
-    def boundingRect(self) -> QRectF:
+    def node_rect(self) -> QRectF:
+        """Rectángulo de la figura (sin la etiqueta)"""
         r = self._get_model_for_independent_prop("radius", 50)
         return QRectF(-r, -r, 2 * r, 2 * r)
 
-    def _get_distance_to_border(self, pos: QPointF) -> float:
-        r = self._get_model_for_independent_prop("radius", 50)
-        center_dist = (pos.x()**2 + pos.y()**2) ** 0.5
-        return abs(center_dist - r)
+    def boundingRect(self) -> QRectF:
+        # El pen de selección se sale de la figura; con caché lo que queda fuera se recortaría
+        # La franja de redimensionado de shape() también (RESIZE_BAND_WIDTH / 2)
+        m = max(_SELECTION_MARGIN, self.RESIZE_BAND_WIDTH / 2)
+        # La etiqueta puede salirse de la figura (text_width mayor que el diámetro)
+        return self.node_rect().adjusted(-m, -m, m, m).united(self.label_layout().rect)
+
+    def label_layout(self) -> NodeLabel:
+        """Etiqueta maquetada: label del wrapper, formato del modelo independiente"""
+        return self._label.layout(getattr(self.model, "label", ""),
+                                  self._get_model_for_independent_prop("font_size", 10),
+                                  self._get_model_for_independent_prop("text_width", 150),
+                                  self._get_model_for_independent_prop("text_align", "center"))
+
+    def synced_property_changed(self, prop_name):
+        """
+        Callback de CompositeModelWrapper: el otro nodo del par cambió una
+        propiedad compartida. Si es la etiqueta, cambia el boundingRect.
+        """
+        if prop_name in NodeLabel.PROPERTIES:
+            self.prepareGeometryChange()
+        self.update()
+
+    def outline_path(self, r: float) -> QPainterPath:
+        """Contorno de la figura para el radio r"""
+        path = QPainterPath()
+        path.addEllipse(QRectF(-r, -r, 2 * r, 2 * r))
+        return path
+
+    def node_shape(self) -> NodeShape:
+        """Caminos de hit-test para el radio actual (el del modelo independiente)"""
+        return self._shape.layout(self._get_model_for_independent_prop("radius", 50), self.outline_path)
+
+    def shape(self) -> QPainterPath:
+        # La etiqueta que se sale de la figura también selecciona el nodo
+        return self.node_shape().with_label(self.label_layout().rect)
 
     def _get_new_radius_from_pos(self, pos: QPointF) -> float:
         center_dist = (pos.x()**2 + pos.y()**2) ** 0.5
         return max(center_dist, 10.0)
 
     def hoverMoveEvent(self, event):
-        dist = self._get_distance_to_border(event.pos())
-        if dist < 8:
+        if self.node_shape().on_resize_band(event.pos()):
             self.setCursor(Qt.CursorShape.SizeAllCursor)
         else:
             self.setCursor(Qt.CursorShape.ArrowCursor)
@@ -63,14 +113,26 @@ class BaseTroposItem(QGraphicsObject):
 
     def mousePressEvent(self, event):
         if event.button() == Qt.MouseButton.LeftButton:
-            dist = self._get_distance_to_border(event.pos())
-            if dist < 8:
+            if self.node_shape().on_resize_band(event.pos()):
                 self._resizing = True
+                NodeCache.suspend(self)
                 self.setSelected(True)
                 event.accept()
                 return
         super().mousePressEvent(event)
 
+    @property
+    def element_id(self):
+        """
+        Id persistente del nodo. En los composite el wrapper es compartido,
+        así que el id sale del modelo independiente de cada nodo.
+        """
+        return (self._independent_model or self.model).id
+
+    @element_id.setter
+    def element_id(self, value):
+        (self._independent_model or self.model).id = value
+
     def mouseMoveEvent(self, event):
         if self._resizing:
             new_r = self._get_new_radius_from_pos(event.pos())
@@ -84,6 +146,7 @@ class BaseTroposItem(QGraphicsObject):
     def mouseReleaseEvent(self, event):
         if self._resizing and event.button() == Qt.MouseButton.LeftButton:
             self._resizing = False
+            NodeCache.resume(self)
             self.setCursor(Qt.CursorShape.ArrowCursor)
             event.accept()
             return
@@ -105,6 +168,7 @@ class BaseTroposItem(QGraphicsObject):
             self._independent_model.radius = new_r
         else:
             self.model.radius = new_r
+        self.node_shape()
         
         self.update()
 
@@ -115,28 +179,11 @@ class BaseTroposItem(QGraphicsObject):
         event.ignore()
         super().mouseDoubleClickEvent(event)
 
-    def draw_multiline_text(self, painter, text_color_hex):
-        # Label y color se sincronizan, así que usar self.model (wrapper)
-        label = getattr(self.model, "label", "")
-        if not label: return
-        
-        # text_width, font_size, align pueden ser independientes
-        text_width = self._get_model_for_independent_prop("text_width", 150)
+    def draw_multiline_text(self, painter, text_color_hex, lod: float = 1.0):
         font_size = self._get_model_for_independent_prop("font_size", 10)
-        align_str = self._get_model_for_independent_prop("text_align", "center")
-
-        align_flag = Qt.AlignmentFlag.AlignCenter
-        if align_str == "left": align_flag = Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter
-        elif align_str == "right": align_flag = Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter
-
-        painter.setPen(QColor(text_color_hex))
-        font = QFont("Arial", int(font_size))
-        font.setBold(True)
-        painter.setFont(font)
-
-        rect_height = 500
-        text_rect = QRectF(-text_width/2, -rect_height/2, text_width, rect_height)
-        painter.drawText(text_rect, Qt.TextFlag.TextWordWrap | align_flag, label)
+        # Con poco zoom el texto no se leería: no se dibuja
+        if not LevelOfDetail.shows_text(lod, font_size): return
+        self.label_layout().draw(painter, QColor(text_color_hex))
 
     def get_serializable_properties(self):
         # Radius es independiente
@@ -166,6 +213,10 @@ class BaseTroposItem(QGraphicsObject):
     
     def update_properties(self, properties: dict):
         """Actualiza las propiedades del nodo desde datos serializados"""
+        if not NodeLabel.PROPERTIES.isdisjoint(properties):
+            # La etiqueta forma parte del boundingRect
+            self.prepareGeometryChange()
+
         for key, value in properties.items():
             if key == 'radius':
                 self.set_radius(float(value))
@@ -9,22 +9,23 @@ from PyQt6.QtGui import QPainter, QPen, QPolygonF, QPainterPath
 from PyQt6.QtCore import QPointF, Qt, QRectF
 import math
 from app.ui.components.base_edge_item import BaseEdgeItem
+from app.core.models.dependency.and_decomposition_edge import AndDecompositionEdge
+from app.ui.frame_stats import FrameStats
 
 class AndDecompositionArrowItem(BaseEdgeItem):
     """Barra (T) cerca del final + cabeza triangular sin relleno."""
 
-    def __init__(self, source_node, dest_node):
-        super().__init__(source_node, dest_node, color=QPen().color(), dashed=False)
+    # Margen del bounding rect para la cabeza de flecha y la barra T
+    DECORATION_MARGIN = 20
+    # Zonas de selección: punta triangular y barra T al 60%
+    DECORATION_ANCHORS = ((1.0, 14.0), (0.6, 6.0))
 
-    def boundingRect(self):
-        """Extiende el bounding rect para incluir la cabeza de flecha y la barra T."""
-        # Obtener boundingRect base de la línea
-        base_rect = super().boundingRect()
-        # Extra para la cabeza de flecha (~12px) y la barra T
-        extra = 20
-        return base_rect.adjusted(-extra, -extra, extra, extra)
+    def __init__(self, source_node, dest_node):
+        super().__init__(source_node, dest_node, color=QPen().color(), dashed=False,
+                         model=AndDecompositionEdge(source_node.model, dest_node.model))
 
     def paint(self, painter: QPainter, option, widget=None):
+        FrameStats.paint_calls += 1
         if not self.source_node or not self.dest_node:
             return
 
@@ -33,6 +34,10 @@ class AndDecompositionArrowItem(BaseEdgeItem):
         if path.isEmpty():
             return
 
+        # Con poco zoom solo la línea (ver BaseEdgeItem.paint_simplified)
+        if self.paint_simplified(painter, option):
+            return
+
         painter.setRenderHint(QPainter.RenderHint.Antialiasing)
         painter.setPen(self.pen())
 
@@ -63,8 +68,9 @@ class AndDecompositionArrowItem(BaseEdgeItem):
                                  end_point.y() - arrow_size * math.sin(angle))
         
         # Crear un path modificado que termine en la base del triángulo
-        # Obtener todos los puntos del path original (ya en coordenadas locales)
-        path_points, start_point, _ = self._calculate_path_points()
+        # Puntos del path original (cacheados, ya en coordenadas locales)
+        path_points = self._polyline.points
+        start_point = self._start_point
 
         if len(path_points) >= 2:
             # Si hay control points, el último segmento va del último control point al end_point
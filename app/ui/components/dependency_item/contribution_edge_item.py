@@ -10,22 +10,23 @@ from PyQt6.QtGui import QPainter, QFont, QPen, QBrush, QPolygonF
 from PyQt6.QtCore import QPointF, QRectF
 import math
 from app.ui.components.base_edge_item import BaseEdgeItem
+from app.core.models.dependency.contribution_edge import ContributionEdge
+from app.ui.frame_stats import FrameStats
 
 class ContributionArrowItem(BaseEdgeItem):
     """Flecha abierta tipo V y símbolo '+' cerca del cuerpo."""
 
-    def __init__(self, source_node, dest_node):
-        super().__init__(source_node, dest_node, color=QPen().color(), dashed=False)
+    # Margen del bounding rect para la cabeza de flecha y el símbolo '+'
+    DECORATION_MARGIN = 20
+    # Zonas de selección: V abierta y símbolo '+' junto al punto medio
+    DECORATION_ANCHORS = ((1.0, 14.0), (0.5, 24.0))
 
-    def boundingRect(self):
-        """Extiende el bounding rect para incluir la cabeza de flecha y el símbolo '+'."""
-        # Obtener boundingRect base de la línea
-        base_rect = super().boundingRect()
-        # Extra para la V abierta (~12px) y el símbolo '+'
-        extra = 20
-        return base_rect.adjusted(-extra, -extra, extra, extra)
+    def __init__(self, source_node, dest_node):
+        super().__init__(source_node, dest_node, color=QPen().color(), dashed=False,
+                         model=ContributionEdge(source_node.model, dest_node.model))
 
     def paint(self, painter: QPainter, option, widget=None):
+        FrameStats.paint_calls += 1
         if not self.source_node or not self.dest_node:
             return
 
@@ -34,6 +35,10 @@ class ContributionArrowItem(BaseEdgeItem):
         if path.isEmpty():
             return
 
+        # Con poco zoom solo la línea (ver BaseEdgeItem.paint_simplified)
+        if self.paint_simplified(painter, option):
+            return
+
         painter.setRenderHint(QPainter.RenderHint.Antialiasing)
         painter.setPen(self.pen())
 
@@ -7,7 +7,9 @@
 
 from PyQt6.QtGui import QColor
 from app.ui.components.base_edge_item import BaseEdgeItem
+from app.core.models.dependency.dashed_edge import DashedEdge
 
 class DashedArrowItem(BaseEdgeItem):
     def __init__(self, source_node, dest_node):
-        super().__init__(source_node, dest_node, color=QColor(100, 100, 100), dashed=True)
+        super().__init__(source_node, dest_node, color=QColor(100, 100, 100), dashed=True,
+                         model=DashedEdge(source_node.model, dest_node.model))
@@ -11,19 +11,23 @@ from PyQt6.QtCore import QPointF
 import math
 
 from app.ui.components.base_edge_item import BaseEdgeItem
+from app.core.models.dependency.dependency_link_edge import DependencyLinkEdge
+from app.ui.frame_stats import FrameStats
 
 class DependencyLinkArrowItem(BaseEdgeItem):
     """Flecha tipo dependency: línea de centro a centro con triángulo en el medio."""
 
-    def __init__(self, source_node, dest_node):
-        super().__init__(source_node, dest_node, color=QColor(0, 0, 0), dashed=False)
+    # Margen del bounding rect para el triángulo en medio de la línea
+    DECORATION_MARGIN = 15
+    # Zonas de selección: triángulo en el punto medio
+    DECORATION_ANCHORS = ((0.5, 14.0),)
 
-    def boundingRect(self):
-        """Extiende el bounding rect para incluir el triángulo en medio de la línea."""
-        extra = 15  # suficiente para el triángulo
-        return super().boundingRect().adjusted(-extra, -extra, extra, extra)
+    def __init__(self, source_node, dest_node):
+        super().__init__(source_node, dest_node, color=QColor(0, 0, 0), dashed=False,
+                         model=DependencyLinkEdge(source_node.model, dest_node.model))
 
     def paint(self, painter: QPainter, option, widget=None):
+        FrameStats.paint_calls += 1
         if not self.source_node or not self.dest_node:
             return
 
@@ -32,6 +36,10 @@ class DependencyLinkArrowItem(BaseEdgeItem):
         if path.isEmpty():
             return
 
+        # Con poco zoom solo la línea (ver BaseEdgeItem.paint_simplified)
+        if self.paint_simplified(painter, option):
+            return
+
         painter.setRenderHint(QPainter.RenderHint.Antialiasing)
         painter.setPen(self.pen())
 
@@ -11,22 +11,21 @@ from PyQt6.QtCore import QPointF, QRectF
 import math
 
 from app.ui.components.base_edge_item import BaseEdgeItem
+from app.core.models.dependency.means_end_edge import MeansEndEdge
+from app.ui.frame_stats import FrameStats
 
 class MeansEndArrowItem(BaseEdgeItem):
     """Flecha abierta tipo V sin símbolo (means-end)."""
 
-    def __init__(self, source_node, dest_node):
-        super().__init__(source_node, dest_node, color=QPen().color(), dashed=False)
+    # Margen del bounding rect para la cabeza de flecha en V
+    DECORATION_MARGIN = 15
 
-    def boundingRect(self):
-        """Extiende el bounding rect para incluir la cabeza de flecha en V."""
-        # Obtener boundingRect base de la línea
-        base_rect = super().boundingRect()
-        # Extra para la V abierta (~12px)
-        extra = 15
-        return base_rect.adjusted(-extra, -extra, extra, extra)
+    def __init__(self, source_node, dest_node):
+        super().__init__(source_node, dest_node, color=QPen().color(), dashed=False,
+                         model=MeansEndEdge(source_node.model, dest_node.model))
 
     def paint(self, painter: QPainter, option, widget=None):
+        FrameStats.paint_calls += 1
         if not self.source_node or not self.dest_node:
             return
 
@@ -35,6 +34,10 @@ class MeansEndArrowItem(BaseEdgeItem):
         if path.isEmpty():
             return
 
+        # Con poco zoom solo la línea (ver BaseEdgeItem.paint_simplified)
+        if self.paint_simplified(painter, option):
+            return
+
         painter.setRenderHint(QPainter.RenderHint.Antialiasing)
         painter.setPen(self.pen())
         painter.drawPath(path)
@@ -10,19 +10,23 @@ from PyQt6.QtGui import QPainter, QBrush, QColor, QFont, QFontMetrics, QPolygonF
 from PyQt6.QtCore import QPointF, QRectF, Qt
 import math
 from app.ui.components.base_edge_item import BaseEdgeItem
+from app.core.models.dependency.why_link_edge import WhyLinkEdge
+from app.ui.frame_stats import FrameStats
 
 class WhyLinkArrowItem(BaseEdgeItem):
     """Flecha tipo WHY: línea de extremo a extremo con triángulo en el medio y texto 'WHY' encima."""
 
-    def __init__(self, source_node, dest_node):
-        super().__init__(source_node, dest_node, color=QColor(0, 0, 0), dashed=False)
+    # Margen del bounding rect para la flecha y el texto
+    DECORATION_MARGIN = 20
+    # Zonas de selección: triángulo y texto 'WHY' en el punto medio
+    DECORATION_ANCHORS = ((0.5, 26.0),)
 
-    def boundingRect(self):
-        """Extiende el bounding rect para incluir la flecha y el texto."""
-        extra = 20  # suficiente para triángulo + texto
-        return super().boundingRect().adjusted(-extra, -extra, extra, extra)
+    def __init__(self, source_node, dest_node):
+        super().__init__(source_node, dest_node, color=QColor(0, 0, 0), dashed=False,
+                         model=WhyLinkEdge(source_node.model, dest_node.model))
 
     def paint(self, painter: QPainter, option, widget=None):
+        FrameStats.paint_calls += 1
         if not self.source_node or not self.dest_node:
             return
 
@@ -31,6 +35,10 @@ class WhyLinkArrowItem(BaseEdgeItem):
         if path.isEmpty():
             return
 
+        # Con poco zoom solo la línea (ver BaseEdgeItem.paint_simplified)
+        if self.paint_simplified(painter, option):
+            return
+
         painter.setRenderHint(QPainter.RenderHint.Antialiasing)
         painter.setPen(self.pen())
         painter.drawPath(path)
@@ -0,0 +1,82 @@
+# ---------------------------------------------------
+# Proyecto: Asteroid
+# Autor: Daryll Lorenzo Alfonso
+# Año: 2025
+# Licencia: MIT License
+# ---------------------------------------------------
+"""
+Geometría de la polilínea de una edge (inicio -> control points -> fin).
+
+BaseEdgeItem la reconstruye solo cuando recalcula su ruta (un nodo se mueve
+o cambia de radio, o cambia un control point) y el paint() de las
+subclases la consulta sin volver a calcular bordes ni raíces:
+
+- points: puntos en coordenadas locales de la edge.
+- lengths: longitud de cada segmento.
+- cumulative: longitud acumulada hasta cada punto (cumulative[0] == 0).
+- angles: ángulo (radianes) de cada segmento.
+
+point_at_distance() busca el segmento con bisect sobre cumulative.
+"""
+import math
+from bisect import bisect_left
+
+from PyQt6.QtCore import QPointF
+from PyQt6.QtGui import QPainterPath
+
+
+class EdgePolyline:
+    def __init__(self, points=()):
+        self.points = list(points)
+        self.lengths = []
+        self.cumulative = [0.0]
+        self.angles = []
+        for p1, p2 in zip(self.points, self.points[1:]):
+            dx = p2.x() - p1.x()
+            dy = p2.y() - p1.y()
+            self.lengths.append(math.hypot(dx, dy))
+            self.cumulative.append(self.cumulative[-1] + self.lengths[-1])
+            self.angles.append(math.atan2(dy, dx))
+
+    @property
+    def length(self) -> float:
+        return self.cumulative[-1]
+
+    def to_path(self) -> QPainterPath:
+        path = QPainterPath(self.points[0])
+        for point in self.points[1:]:
+            path.lineTo(point)
+        return path
+
+    def translated(self, dx: float, dy: float) -> "EdgePolyline":
+        """La misma polilínea desplazada (longitudes y ángulos no cambian)"""
+        moved = EdgePolyline()
+        offset = QPointF(dx, dy)
+        moved.points = [point + offset for point in self.points]
+        moved.lengths, moved.cumulative, moved.angles = self.lengths, self.cumulative, self.angles
+        return moved
+
+    def segments(self):
+        """Segmentos como tuplas (p1, p2, longitud)"""
+        return list(zip(self.points, self.points[1:], self.lengths))
+
+    def point_at_distance(self, distance: float) -> tuple[QPointF, float]:
+        """Punto a `distance` desde el inicio y ángulo del segmento que lo contiene"""
+        if not self.angles or self.length == 0:
+            return QPointF(0, 0), 0.0
+
+        # Más allá del final: último punto
+        if distance >= self.length:
+            return self.points[-1], self.angles[-1]
+
+        # Primer segmento cuyo final alcanza la distancia
+        i = bisect_left(self.cumulative, distance, 1) - 1
+        p1, p2 = self.points[i], self.points[i + 1]
+        seg_length = self.lengths[i]
+        t = (distance - self.cumulative[i]) / seg_length if seg_length > 0 else 0
+        return QPointF(p1.x() + t * (p2.x() - p1.x()), p1.y() + t * (p2.y() - p1.y())), self.angles[i]
+
+    def point_at_percentage(self, percentage: float) -> tuple[QPointF, float]:
+        if not self.angles or self.length == 0:
+            return QPointF(0, 0), 0.0
+        return self.point_at_distance(self.length * percentage)
@@ -8,12 +8,15 @@ from app.ui.components.base_node_item import BaseNodeItem
 from app.core.models.entity.actor import Actor
 from PyQt6.QtGui import QBrush, QPen, QColor, QFont
 from PyQt6.QtCore import Qt, QPointF
+from app.ui.frame_stats import FrameStats
+from app.ui.level_of_detail import LevelOfDetail
 
 class ActorNodeItem(BaseNodeItem):
     def __init__(self, x=0, y=0, radius=50):
         super().__init__(Actor(x, y, radius))
         
     def paint(self, painter, option, widget=None):
+        FrameStats.paint_calls += 1
         # 1. Configuración de colores
         default_color = QColor(100, 150, 250)
         default_border = QColor(0, 0, 0)
@@ -23,20 +26,26 @@ class ActorNodeItem(BaseNodeItem):
         border_color = QColor(self.model.border_color) if hasattr(self.model, 'border_color') else default_border
         text_color = QColor(self.model.text_color) if hasattr(self.model, 'text_color') else default_text
         
+        # Con poco zoom: figura simple, sin borde ni texto
+        lod = LevelOfDetail.of(painter, option)
+        if LevelOfDetail.is_minimal(lod):
+            LevelOfDetail.draw_minimal_node(painter, self.node_rect(), fill_color, self.isSelected(), ellipse=True)
+            return
+
         # 2. DIBUJAR EL CONTENEDOR
         painter.setBrush(QBrush(fill_color))
         painter.setPen(QPen(border_color, 2))
-        painter.drawEllipse(self.boundingRect())
+        painter.drawEllipse(self.node_rect())
     
         # 3. DIBUJAR EL CONTENIDO (Texto Multilínea)
         # Usamos el método heredado.
-        self.draw_multiline_text(painter, text_color)
+        self.draw_multiline_text(painter, text_color, lod)
     
         # 4. Indicador de selección
         if self.isSelected():
             painter.setPen(QPen(Qt.GlobalColor.yellow, 3))
             painter.setBrush(Qt.BrushStyle.NoBrush)
-            painter.drawEllipse(self.boundingRect())
+            painter.drawEllipse(self.node_rect())
 
     def get_serializable_properties(self):
         base_properties = super().get_serializable_properties()
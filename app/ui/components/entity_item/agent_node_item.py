@@ -8,18 +8,16 @@
 from app.ui.components.base_node_item import BaseNodeItem
 from app.core.models.entity.agent import Agent
 from PyQt6.QtGui import QBrush, QPen, QColor, QFont
-from PyQt6.QtCore import QPointF, Qt
+from PyQt6.QtCore import Qt
+from app.ui.frame_stats import FrameStats
+from app.ui.level_of_detail import LevelOfDetail
 
 class AgentNodeItem(BaseNodeItem):
     def __init__(self, x=0, y=0, radius=50):
         super().__init__(Agent(x, y, radius))
-        
-    def _get_distance_to_border(self, pos: QPointF) -> float:
-        r = getattr(self.model, "radius", 50)
-        center_dist = (pos.x()**2 + pos.y()**2) ** 0.5
-        return abs(center_dist - r)
 
     def paint(self, painter, option, widget=None):
+        FrameStats.paint_calls += 1
         # 1. Colores
         default_color = QColor(250, 150, 100)
         default_border = QColor(0, 0, 0)
@@ -29,13 +27,19 @@ class AgentNodeItem(BaseNodeItem):
         border_color = QColor(self.model.border_color) if hasattr(self.model, 'border_color') else default_border
         text_color = QColor(self.model.text_color) if hasattr(self.model, 'text_color') else default_text
         
+        # Con poco zoom: figura simple, sin borde ni texto
+        lod = LevelOfDetail.of(painter, option)
+        if LevelOfDetail.is_minimal(lod):
+            LevelOfDetail.draw_minimal_node(painter, self.node_rect(), fill_color, self.isSelected(), ellipse=True)
+            return
+
         # 2. DIBUJAR EL CONTENEDOR
         painter.setBrush(QBrush(fill_color))
         painter.setPen(QPen(border_color, 2))
-        painter.drawEllipse(self.boundingRect())
+        painter.drawEllipse(self.node_rect())
     
         # 3. DIBUJAR TEXTO (Multilínea)
-        self.draw_multiline_text(painter, text_color)
+        self.draw_multiline_text(painter, text_color, lod)
 
         # 4. DIBUJAR LA LÍNEA DEL AGENTE
         # La línea debe moverse con el offset igual que el texto.
@@ -55,7 +59,7 @@ class AgentNodeItem(BaseNodeItem):
         if self.isSelected():
             painter.setPen(QPen(Qt.GlobalColor.yellow, 3))
             painter.setBrush(Qt.BrushStyle.NoBrush)
-            painter.drawEllipse(self.boundingRect())
+            painter.drawEllipse(self.node_rect())
 
     def get_serializable_properties(self):
         base_properties = super().get_serializable_properties()
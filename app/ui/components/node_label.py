@@ -0,0 +1,116 @@
+# ---------------------------------------------------
+# Proyecto: Asteroid
+# Autor: Daryll Lorenzo Alfonso
+# Año: 2025
+# Licencia: MIT License
+# ---------------------------------------------------
+"""
+Etiqueta multilínea de un nodo maquetada una sola vez.
+
+painter.drawText(rect, TextWordWrap, ...) vuelve a partir el texto en líneas
+en cada paint. NodeLabel guarda el QTextLayout ya maquetado y lo rehace solo
+cuando cambia (label, font_size, text_width, text_align). El layout
+reproduce el de drawText: líneas en píxeles enteros, alineación por línea y
+el bloque centrado verticalmente en el centro del nodo.
+
+rect es el rectángulo ajustado al texto (coordenadas del nodo, sin el
+content_offset), para que boundingRect() incluya la etiqueta.
+"""
+import math
+
+from PyQt6.QtCore import QPointF, QRectF, Qt
+from PyQt6.QtGui import QFont, QFontMetricsF, QTextLayout, QTextOption
+
+class NodeLabel:
+    FONT_FAMILY = "Arial"
+    # Propiedades del modelo que cambian la etiqueta (y por tanto el boundingRect)
+    PROPERTIES = frozenset(("label", "font_size", "text_width", "text_align"))
+
+    def __init__(self, bold: bool = False):
+        self.bold = bold
+        self._key = None
+        self._layout = None
+        self._font = None
+        self._origin = QPointF()
+        # Columna de text_width a la que se recorta el texto (None si cabe)
+        self._clip = None
+        self.rect = QRectF()
+
+    def layout(self, label, font_size, text_width, text_align) -> "NodeLabel":
+        """Maqueta la etiqueta si cambió alguna de sus propiedades"""
+        key = (label, font_size, text_width, text_align)
+        if key != self._key:
+            self._key = key
+            self._build(label, int(font_size), float(text_width), text_align)
+        return self
+
+    def draw(self, painter, color, offset_x: float = 0.0, offset_y: float = 0.0):
+        if self._layout is None:
+            return
+        painter.setPen(color)
+        painter.setFont(self._font)
+
+        origin = self._origin + QPointF(offset_x, offset_y)
+        if self._clip is None:
+            self._layout.draw(painter, origin)
+            return
+
+        # Como drawText: una palabra más ancha que text_width se recorta
+        painter.save()
+        painter.setClipRect(self._clip.translated(offset_x, offset_y), Qt.ClipOperation.IntersectClip)
+        self._layout.draw(painter, origin)
+        painter.restore()
+
+    # ---------------------
+    # Auxiliares
+    # ---------------------
+    def _build(self, label, font_size: int, text_width: float, text_align):
+        if not label:
+            self._layout, self._font, self._clip, self.rect = None, None, None, QRectF()
+            return
+
+        font = QFont(self.FONT_FAMILY, font_size)
+        font.setBold(self.bold)
+        option = QTextOption()
+        option.setWrapMode(QTextOption.WrapMode.WordWrap)
+
+        # drawText trata '\n' como salto de línea
+        layout = QTextLayout(label.replace("\n", "\u2028"), font)
+        layout.setTextOption(option)
+        # Conserva los glifos ya calculados entre un paint y el siguiente
+        layout.setCacheEnabled(True)
+
+        # Mismo apilado que drawText: líneas en píxeles enteros con el interlineado
+        # de la fuente, y cada línea alineada según su propio ancho
+        leading = QFontMetricsF(font).leading()
+        height = -leading
+        left, right = math.inf, -math.inf
+        layout.beginLayout()
+        while True:
+            line = layout.createLine()
+            if not line.isValid():
+                break
+            line.setLineWidth(text_width)
+            height = math.ceil(height + leading)
+            advance = line.horizontalAdvance()
+            if text_align == "right":
+                x = text_width - advance
+            elif text_align == "left":
+                x = 0.0
+            else:
+                x = (text_width - advance) / 2
+            line.setPosition(QPointF(x, height))
+            # line.height() viene redondeada hacia arriba; drawText suma la altura exacta
+            height += line.ascent() + line.descent()
+            left, right = min(left, x), max(right, x + line.naturalTextWidth())
+        layout.endLayout()
+
+        # Bloque centrado en (0, 0): columna de text_width y altura total
+        self._origin = QPointF(-text_width / 2, -height / 2)
+        self._layout, self._font = layout, font
+        self.rect = QRectF(self._origin.x() + left, self._origin.y(), right - left, height)
+
+        column = QRectF(self._origin.x(), self._origin.y(), text_width, height)
+        self._clip = column if right - left > text_width else None
+        if self._clip is not None:
+            self.rect = self.rect.intersected(column)
@@ -0,0 +1,73 @@
+# ---------------------------------------------------
+# Proyecto: Asteroid
+# Autor: Daryll Lorenzo Alfonso
+# Año: 2025
+# Licencia: MIT License
+# ---------------------------------------------------
+"""
+Caminos de hit-test de la figura de un nodo, construidos una vez por radio.
+
+- fill: contorno relleno de la figura (círculo, rectángulo, nube...).
+- resize_band: franja alrededor del contorno donde se arrastra para
+  redimensionar (los "dist < 8" de antes).
+- shape: fill unido a la franja. shape() del nodo le suma el rectángulo de
+  la etiqueta (with_label) para que la selección, el hover y la goma
+  elástica sigan la figura y su texto, y no el boundingRect.
+
+La franja sobresale resize_band_width / 2 del contorno: el boundingRect del
+nodo tiene que incluirla.
+
+Cada nodo da su contorno con outline_path(r); los caminos se rehacen solo si
+cambia el radio:
+
+    shape = self._shape.layout(r, self.outline_path)
+    if shape.on_resize_band(event.pos()): ...
+"""
+from PyQt6.QtCore import Qt, QRectF
+from PyQt6.QtGui import QPainterPath, QPainterPathStroker
+
+
+class NodeShape:
+    def __init__(self, resize_band_width: float):
+        self.resize_band_width = resize_band_width
+        self._radius = None
+        self.fill = QPainterPath()
+        self.resize_band = QPainterPath()
+        self.shape = QPainterPath()
+        # Último shape con etiqueta: (rectángulo de la etiqueta, camino)
+        self._labelled = None
+
+    def layout(self, radius, outline_path) -> "NodeShape":
+        """Reconstruye los caminos si cambió el radio. outline_path(r) da el contorno"""
+        if radius != self._radius:
+            self._radius = radius
+            self._build(outline_path(float(radius)))
+        return self
+
+    def with_label(self, label_rect) -> QPainterPath:
+        """shape unido al rectángulo de la etiqueta (se rehace si cambia cualquiera de los dos)"""
+        if label_rect.isEmpty():
+            return self.shape
+        if self._labelled is None or self._labelled[0] != label_rect:
+            label = QPainterPath()
+            label.addRect(label_rect)
+            self._labelled = (QRectF(label_rect), self.shape.united(label))
+        return self._labelled[1]
+
+    def on_resize_band(self, pos) -> bool:
+        return self.resize_band.contains(pos)
+
+    # ---------------------
+    # Auxiliares
+    # ---------------------
+    def _build(self, fill: QPainterPath):
+        stroker = QPainterPathStroker()
+        stroker.setWidth(self.resize_band_width)
+        # Esquinas redondeadas: fuera de la figura la franja es la distancia real al contorno
+        stroker.setJoinStyle(Qt.PenJoinStyle.RoundJoin)
+        stroker.setCapStyle(Qt.PenCapStyle.RoundCap)
+
+        self.fill = fill
+        self.resize_band = stroker.createStroke(fill)
+        self.shape = fill.united(self.resize_band)
+        self._labelled = None
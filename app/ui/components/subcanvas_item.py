@@ -10,6 +10,11 @@ from PyQt6.QtWidgets import QGraphicsObject, QGraphicsRectItem, QGraphicsItem
 from PyQt6.QtGui import QBrush, QPen, QPainterPath
 from PyQt6.QtCore import QRectF, pyqtSignal, Qt, QPointF
 import math
+from app.log import get_logger
+from app.ui.frame_stats import FrameStats
+from app.ui.level_of_detail import LevelOfDetail
+
+log = get_logger("subcanvas")
 
 # Lista de tipos de "links" soportados dentro del subcanvas
 ARROW_TYPES = {
@@ -77,8 +82,18 @@ class SubCanvasItem(QGraphicsObject):
         return path
 
     def paint(self, painter, option, widget=None):
-        painter.setRenderHint(painter.RenderHint.Antialiasing)
+        FrameStats.paint_calls += 1
         r = float(self.radius)
+        lod = LevelOfDetail.of(painter, option)
+        if LevelOfDetail.is_minimal(lod):
+            # Con poco zoom el relleno casi transparente no se ve: solo el borde
+            painter.setRenderHint(painter.RenderHint.Antialiasing, False)
+            painter.setPen(LevelOfDetail.line_pen(self.border_pen, lod))
+            painter.setBrush(Qt.BrushStyle.NoBrush)
+            painter.drawEllipse(QRectF(-r, -r, 2.0 * r, 2.0 * r))
+            return
+
+        painter.setRenderHint(painter.RenderHint.Antialiasing)
         painter.setBrush(self.bg_brush)
         painter.setOpacity(0.04)  # ✅ Muy transparente para no interferir
         painter.drawEllipse(QRectF(-r, -r, 2.0 * r, 2.0 * r))
@@ -136,12 +151,12 @@ class SubCanvasItem(QGraphicsObject):
 
         # Si es un tipo de flecha (links nuevos)
         if item_type in ARROW_TYPES:
-            print(f"SubCanvasItem: arrow dropped '{item_type}' (local {pos})")
+            log.debug("SubCanvasItem: arrow dropped '%s' (local %s)", item_type, pos)
             self.subarrow_dropped.emit(item_type)
             event.acceptProposedAction()
             return
 
         # Si no es flecha, lo tratamos como nodo tropos
-        print(f"SubCanvasItem: node dropped '{item_type}' at local ({pos.x():.1f}, {pos.y():.1f})")
+        log.debug("SubCanvasItem: node dropped '%s' at local (%.1f, %.1f)", item_type, pos.x(), pos.y())
         self.subnode_dropped.emit(item_type, float(pos.x()), float(pos.y()))
         event.acceptProposedAction()
\ No newline at end of file
@@ -9,32 +9,24 @@ from app.core.models.tropos_element.hard_goal import HardGoal
 from PyQt6.QtGui import QBrush, QPen, QColor, QPainterPath, QFont
 from PyQt6.QtCore import QRectF, QPointF, Qt
 import math
+from app.ui.frame_stats import FrameStats
+from app.ui.level_of_detail import LevelOfDetail
 
 class HardGoalNodeItem(BaseTroposItem):
     def __init__(self, x=0, y=0, radius=60):
         super().__init__(HardGoal(x, y, radius))
 
-    def _get_distance_to_border(self, pos: QPointF) -> float:
-        # ✅ Usar _independent_model si existe
-        model_for_props = self._independent_model if hasattr(self, '_independent_model') and self._independent_model else self.model
-        r = model_for_props.radius
-        rect = QRectF(-r, -r/2, 2 * r, r)
-        if rect.contains(pos):
-            dist_left = abs(pos.x() - rect.left())
-            dist_right = abs(pos.x() - rect.right())
-            dist_top = abs(pos.y() - rect.top())
-            dist_bottom = abs(pos.y() - rect.bottom())
-            return min(dist_left, dist_right, dist_top, dist_bottom)
-        else:
-            dx = max(rect.left() - pos.x(), 0, pos.x() - rect.right())
-            dy = max(rect.top() - pos.y(), 0, pos.y() - rect.bottom())
-            return math.sqrt(dx*dx + dy*dy)
+    def outline_path(self, r: float) -> QPainterPath:
+        path = QPainterPath()
+        path.addRoundedRect(QRectF(-r, -r/2, 2 * r, r), r/2, r/2)
+        return path
 
     def _get_new_radius_from_pos(self, pos: QPointF) -> float:
         new_r = abs(pos.x())
         return max(new_r, 20.0)
 
     def paint(self, painter, option, widget=None):
+        FrameStats.paint_calls += 1
         default_color = QColor(150, 200, 150)
         default_border = QColor(0, 0, 0)
         default_text = QColor(255, 255, 255)
@@ -47,19 +39,23 @@ class HardGoalNodeItem(BaseTroposItem):
         border_color = QColor(self.model.border_color) if hasattr(self.model, 'border_color') else default_border
         text_color = QColor(self.model.text_color) if hasattr(self.model, 'text_color') else default_text
 
+        # Con poco zoom: figura simple, sin borde ni texto
+        lod = LevelOfDetail.of(painter, option)
+        if LevelOfDetail.is_minimal(lod):
+            r = model_for_props.radius
+            LevelOfDetail.draw_minimal_node(painter, QRectF(-r, -r/2, 2 * r, r), fill_color, self.isSelected())
+            return
+
         painter.setRenderHint(painter.RenderHint.Antialiasing)
         painter.setBrush(QBrush(fill_color))
         painter.setPen(QPen(border_color, 2))
 
-        # ✅ Usar radio del modelo independiente
-        r = model_for_props.radius
-        rect = QRectF(-r, -r/2, 2 * r, r)
-        path = QPainterPath()
-        path.addRoundedRect(rect, r/2, r/2)
+        # Contorno cacheado para el radio del modelo independiente
+        path = self.node_shape().fill
         painter.drawPath(path)
 
         #   DIBUJAR TEXTO MULTILÍNEA
-        self.draw_multiline_text(painter, text_color)
+        self.draw_multiline_text(painter, text_color, lod)
 
         if self.isSelected():
             painter.setPen(QPen(Qt.GlobalColor.yellow, 3))
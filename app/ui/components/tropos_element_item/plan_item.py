@@ -7,48 +7,33 @@
 
 from app.ui.components.base_tropos_item import BaseTroposItem
 from app.core.models.tropos_element.plan import Plan
-from PyQt6.QtGui import QBrush, QPen, QColor, QPolygonF, QFont
+from PyQt6.QtGui import QBrush, QPen, QColor, QPolygonF, QFont, QPainterPath
 from PyQt6.QtCore import QPointF, Qt, QRectF
 import math
+from app.ui.frame_stats import FrameStats
+from app.ui.level_of_detail import LevelOfDetail
 
 class PlanNodeItem(BaseTroposItem):
     def __init__(self, x=0, y=0, radius=50):
         super().__init__(Plan(x, y, radius))
 
-    def _get_distance_to_border(self, pos: QPointF) -> float:
-        # ✅ Usar _independent_model si existe
-        model_for_props = self._independent_model if hasattr(self, '_independent_model') and self._independent_model else self.model
-        r = model_for_props.radius
-        points = [
+    def outline_path(self, r: float) -> QPainterPath:
+        path = QPainterPath()
+        path.addPolygon(QPolygonF(self._hexagon_points(r)))
+        path.closeSubpath()
+        return path
+
+    def _hexagon_points(self, r: float):
+        return [
             QPointF(-r, 0), QPointF(-r/2, -r/2), QPointF(r/2, -r/2),
             QPointF(r, 0), QPointF(r/2, r/2), QPointF(-r/2, r/2)
         ]
-        min_dist = float('inf')
-        n = len(points)
-        for i in range(n):
-            p1 = points[i]
-            p2 = points[(i + 1) % n]
-            dist = self._point_to_segment_distance(pos, p1, p2)
-            min_dist = min(min_dist, dist)
-        return min_dist
-
-    def _point_to_segment_distance(self, p, a, b):
-        ap = QPointF(p.x() - a.x(), p.y() - a.y())
-        ab = QPointF(b.x() - a.x(), b.y() - a.y())
-        ab2 = ab.x() * ab.x() + ab.y() * ab.y()
-        if ab2 == 0:
-            return math.sqrt(ap.x() * ap.x() + ap.y() * ap.y())
-        t = (ap.x() * ab.x() + ap.y() * ab.y()) / ab2
-        t = max(0, min(1, t))
-        projection = QPointF(a.x() + t * ab.x(), a.y() + t * ab.y())
-        dx = p.x() - projection.x()
-        dy = p.y() - projection.y()
-        return math.sqrt(dx*dx + dy*dy)
 
     def _get_new_radius_from_pos(self, pos: QPointF) -> float:
         return max((pos.x()**2 + pos.y()**2) ** 0.5, 15.0)
 
     def paint(self, painter, option, widget=None):
+        FrameStats.paint_calls += 1
         default_color = QColor(150, 180, 250)
         default_border = QColor(0, 0, 0)
         default_text = QColor(255, 255, 255)
@@ -61,19 +46,23 @@ class PlanNodeItem(BaseTroposItem):
         border_color = QColor(self.model.border_color) if hasattr(self.model, 'border_color') else default_border
         text_color = QColor(self.model.text_color) if hasattr(self.model, 'text_color') else default_text
 
+        # Con poco zoom: figura simple, sin borde ni texto
+        lod = LevelOfDetail.of(painter, option)
+        if LevelOfDetail.is_minimal(lod):
+            r = model_for_props.radius
+            LevelOfDetail.draw_minimal_node(painter, QRectF(-r, -r/2, 2 * r, r), fill_color, self.isSelected())
+            return
+
         painter.setBrush(QBrush(fill_color))
         painter.setPen(QPen(border_color, 2))
 
         # ✅ Usar radio del modelo independiente
         r = model_for_props.radius
-        points = [
-            QPointF(-r, 0), QPointF(-r/2, -r/2), QPointF(r/2, -r/2),
-            QPointF(r, 0), QPointF(r/2, r/2), QPointF(-r/2, r/2)
-        ]
+        points = self._hexagon_points(r)
         painter.drawPolygon(QPolygonF(points))
 
         #   DIBUJAR TEXTO MULTILÍNEA
-        self.draw_multiline_text(painter, text_color)
+        self.draw_multiline_text(painter, text_color, lod)
 
         if self.isSelected():
             painter.setPen(QPen(Qt.GlobalColor.yellow, 3))
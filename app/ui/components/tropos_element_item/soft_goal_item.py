@@ -10,17 +10,23 @@ from app.core.models.tropos_element.soft_goal import SoftGoal
 from PyQt6.QtGui import QBrush, QPen, QColor, QPainterPath, QFont
 from PyQt6.QtCore import QRectF, QPointF, Qt
 import math
+from app.ui.frame_stats import FrameStats
+from app.ui.level_of_detail import LevelOfDetail
 
 class SoftGoalNodeItem(BaseTroposItem):
+    # Ancho del área de detección del borde de la nube
+    RESIZE_BAND_WIDTH = 10.0
+
     def __init__(self, x=0, y=0, radius=30):
         super().__init__(SoftGoal(x, y, radius))
         self.model.radius = radius
-        self.path = self._create_cloud_path()
 
-    def _create_cloud_path(self):
-        return self._create_cloud_path_for_radius(float(self.model.radius))
+    @property
+    def path(self) -> QPainterPath:
+        """Nube para el radio actual (cacheada en node_shape())"""
+        return self.node_shape().fill
 
-    def _create_cloud_path_for_radius(self, r: float):
+    def outline_path(self, r: float) -> QPainterPath:
         """Crea un path de nube para un radio específico"""
         path = QPainterPath()
         w = r * 2.8
@@ -36,40 +42,10 @@ class SoftGoalNodeItem(BaseTroposItem):
         path.closeSubpath()
         return path
 
-    def boundingRect(self):
-        # ✅ Usar _independent_model si existe (para nodos composite internos)
-        model_for_props = self._independent_model if hasattr(self, '_independent_model') and self._independent_model else self.model
-        r = model_for_props.radius
-        if not hasattr(self, "path") or self.path.isEmpty():
-            return QRectF(-r, -r, r*2, r*2)
+    def node_rect(self):
+        # Rectángulo de la nube (con el radio del modelo independiente en los composite internos)
         return self.path.boundingRect().adjusted(-2, -2, 2, 2)
 
-    def _get_distance_to_border(self, pos: QPointF) -> float:
-        """Distancia aproximada al borde de la nube."""
-        # ✅ Usar _independent_model si existe
-        model_for_props = self._independent_model if hasattr(self, '_independent_model') and self._independent_model else self.model
-
-        if hasattr(self, 'path') and not self.path.isEmpty():
-            # Crear un stroker para simular el borde
-            from PyQt6.QtGui import QPen, QPainterPathStroker
-            stroker = QPainterPathStroker()
-            stroker.setWidth(10)  # Ancho del área de detección
-
-            # Crear path para el borde
-            stroke_path = stroker.createStroke(self.path)
-
-            # Si el punto está en el borde, distancia = 0
-            if stroke_path.contains(pos):
-                return 0
-            else:
-                # Calcular distancia al bounding rect como aproximación
-                br = self.path.boundingRect()
-                center = br.center()
-                dist_to_center = math.sqrt((pos.x() - center.x())**2 + (pos.y() - center.y())**2)
-                # Aproximación simple
-                return abs(dist_to_center - model_for_props.radius)
-        return super()._get_distance_to_border(pos)
-
     def _get_new_radius_from_pos(self, pos: QPointF) -> float:
         return max((pos.x()**2 + pos.y()**2) ** 0.5, 15.0)
 
@@ -83,9 +59,8 @@ class SoftGoalNodeItem(BaseTroposItem):
         else:
             self.model.radius = new_r
         
-        # ✅ Recrear el path con el nuevo radio
-        r = self._independent_model.radius if self._independent_model else self.model.radius
-        self.path = self._create_cloud_path_for_radius(r)
+        # ✅ Recrear la nube y sus caminos de hit-test con el nuevo radio
+        self.node_shape()
         
         self.update()
         
@@ -94,6 +69,7 @@ class SoftGoalNodeItem(BaseTroposItem):
             self.properties_changed.emit(self, {"radius": new_r})
 
     def paint(self, painter, option, widget=None):
+        FrameStats.paint_calls += 1
         default_color = QColor(220, 220, 180)
         default_border = QColor(0, 0, 0)
         default_text = QColor(0, 0, 0)
@@ -106,6 +82,12 @@ class SoftGoalNodeItem(BaseTroposItem):
         border_color = QColor(self.model.border_color) if hasattr(self.model, 'border_color') else default_border
         text_color = QColor(self.model.text_color) if hasattr(self.model, 'text_color') else default_text
 
+        # Con poco zoom: figura simple, sin borde ni texto
+        lod = LevelOfDetail.of(painter, option)
+        if LevelOfDetail.is_minimal(lod):
+            LevelOfDetail.draw_minimal_node(painter, self.path.boundingRect(), fill_color, self.isSelected(), ellipse=True)
+            return
+
         painter.setRenderHint(painter.RenderHint.Antialiasing)
         painter.setBrush(QBrush(fill_color))
         painter.setPen(QPen(border_color, 2))
@@ -115,7 +97,7 @@ class SoftGoalNodeItem(BaseTroposItem):
 
         # DIBUJAR TEXTO MULTILÍNEA
         # El texto se dibujará centrado sobre la nube
-        self.draw_multiline_text(painter, text_color)
+        self.draw_multiline_text(painter, text_color, lod)
 
         if self.isSelected():
             painter.setPen(QPen(Qt.GlobalColor.yellow, 3))
@@ -0,0 +1,76 @@
+# ---------------------------------------------------
+# Proyecto: Asteroid
+# Autor: Daryll Lorenzo Alfonso
+# Año: 2025
+# Licencia: MIT License
+# ---------------------------------------------------
+"""
+Actualización agrupada de las edges cuando se mueven sus nodos.
+
+Un nodo arrastrado emite positionChanged dos veces por evento de ratón
+(mouseMoveEvent e itemChange) y cada edge conectada recalculaba su ruta en
+cada aviso; con una selección múltiple, una edge entre dos nodos
+seleccionados se recalculaba cuatro veces. Ahora las edges solo se marcan:
+
+    EdgeUpdateScheduler.schedule(edge)                  # un nodo se movió
+    EdgeUpdateScheduler.schedule(edge, recompute=True)  # cambió un radio
+
+y se actualizan una sola vez en flush(): al final de cada mouseMoveEvent
+del Canvas o, para el resto de movimientos, en un QTimer de 0 ms (la
+siguiente vuelta del bucle de eventos). Cada edge decide en
+apply_scheduled_update() si basta con trasladar su ruta (los dos extremos
+se movieron lo mismo) o hay que recalcularla.
+"""
+from PyQt6.QtCore import QCoreApplication, QTimer
+
+
+class EdgeUpdateScheduler:
+    # edge -> True si hay que recalcular la ruta aunque solo se haya trasladado
+    _dirty = {}
+    _timer = None
+
+    @staticmethod
+    def schedule(edge, recompute: bool = False):
+        dirty = EdgeUpdateScheduler._dirty
+        dirty[edge] = dirty.get(edge, False) or recompute
+        EdgeUpdateScheduler._start_timer()
+
+    @staticmethod
+    def discard(edge):
+        """Olvida una edge eliminada (no se actualiza ni se mantiene viva)"""
+        EdgeUpdateScheduler._dirty.pop(edge, None)
+
+    @staticmethod
+    def pending() -> int:
+        return len(EdgeUpdateScheduler._dirty)
+
+    @staticmethod
+    def flush():
+        """Actualiza ahora las edges pendientes"""
+        dirty = EdgeUpdateScheduler._dirty
+        if not dirty:
+            return
+        EdgeUpdateScheduler._dirty = {}
+        for edge, recompute in dirty.items():
+            edge.apply_scheduled_update(recompute)
+
+    # ---------------------
+    # Auxiliares
+    # ---------------------
+    @staticmethod
+    def _start_timer():
+        timer = EdgeUpdateScheduler._timer
+        if timer is None:
+            app = QCoreApplication.instance()
+            if app is None:
+                # Sin bucle de eventos no hay vuelta siguiente: se actualiza ya
+                EdgeUpdateScheduler.flush()
+                return
+            # Hijo de la aplicación: se destruye con ella
+            timer = QTimer(app)
+            timer.setSingleShot(True)
+            timer.setInterval(0)
+            timer.timeout.connect(EdgeUpdateScheduler.flush)
+            EdgeUpdateScheduler._timer = timer
+        if not timer.isActive():
+            timer.start()
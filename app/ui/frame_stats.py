@@ -0,0 +1,27 @@
+# ---------------------------------------------------
+# Proyecto: Asteroid
+# Autor: Daryll Lorenzo Alfonso
+# Año: 2025
+# Licencia: MIT License
+# ---------------------------------------------------
+"""
+Contadores por frame para el HUD de rendimiento (ver app/ui/perf_hud.py).
+
+Los items los incrementan siempre (una suma sobre un atributo de clase);
+el HUD los lee y los pone a cero al terminar cada frame del Canvas.
+"""
+
+
+class FrameStats:
+    # Llamadas a paint() de nodos, edges y subcanvases
+    paint_calls = 0
+    # Recálculos de la geometría de una edge (_calculate_path_points)
+    edge_geometry_updates = 0
+
+    @staticmethod
+    def take():
+        """Devuelve (paint_calls, edge_geometry_updates) y reinicia los contadores"""
+        counts = (FrameStats.paint_calls, FrameStats.edge_geometry_updates)
+        FrameStats.paint_calls = 0
+        FrameStats.edge_geometry_updates = 0
+        return counts
@@ -9,6 +9,9 @@ from PyQt6.QtCore import Qt
 from PyQt6.QtGui import QFont
 import markdown
 from pathlib import Path
+from app.log import get_logger
+
+log = get_logger("help")
 
 class MarkdownViewer(QWidget):
     def __init__(self, parent=None):
@@ -348,7 +351,7 @@ class MarkdownViewer(QWidget):
             self.text_browser.setHtml(html)
             
         except Exception as e:
-            print(f"Error al cargar markdown: {e}")
+            log.error("Error al cargar markdown: %s", e)
             self.show_error(f"Error: {str(e)}")
     
     def show_error(self, message):
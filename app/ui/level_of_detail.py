@@ -0,0 +1,86 @@
+# ---------------------------------------------------
+# Proyecto: Asteroid
+# Autor: Daryll Lorenzo Alfonso
+# Año: 2025
+# Licencia: MIT License
+# ---------------------------------------------------
+"""
+Niveles de detalle (LOD) para el paint() de nodos, edges y subcanvases.
+
+El nivel es la escala del item en pantalla
+(QStyleOptionGraphicsItem.levelOfDetailFromTransform): 1.0 con zoom 100%,
+0.1 con el zoom mínimo del Canvas. Con poco zoom los textos y las
+decoraciones (puntas de flecha, símbolos '+', 'WHY'...) quedan por debajo
+de unos pocos píxeles y solo cuestan tiempo; se omiten y los nodos se
+dibujan como figuras simples sin antialiasing.
+
+    lod = LevelOfDetail.of(painter, option)
+    if LevelOfDetail.is_minimal(lod):
+        LevelOfDetail.draw_minimal_node(painter, rect, fill_color, self.isSelected())
+        return
+"""
+from PyQt6.QtCore import Qt
+from PyQt6.QtGui import QBrush, QColor, QPainter, QPen
+
+
+class LevelOfDetail:
+    # Altura mínima en pantalla (px) de un texto para dibujarlo
+    MIN_TEXT_PIXELS = 4.0
+    # Tamaño mínimo en pantalla (px) de las decoraciones de las edges (~12 unidades)
+    MIN_DECORATION_PIXELS = 3.0
+    DECORATION_SIZE = 12.0
+    # Por debajo de este nivel los nodos son figuras rellenas sin borde ni antialiasing
+    MINIMAL_LOD = 0.2
+
+    @staticmethod
+    def of(painter: QPainter, option) -> float:
+        """Nivel de detalle con el que se pinta el item"""
+        if option is None:
+            return 1.0
+        return option.levelOfDetailFromTransform(painter.worldTransform())
+
+    @staticmethod
+    def shows_text(lod: float, font_size) -> bool:
+        return float(font_size) * lod >= LevelOfDetail.MIN_TEXT_PIXELS
+
+    @staticmethod
+    def shows_decorations(lod: float) -> bool:
+        return LevelOfDetail.DECORATION_SIZE * lod >= LevelOfDetail.MIN_DECORATION_PIXELS
+
+    @staticmethod
+    def is_minimal(lod: float) -> bool:
+        return lod < LevelOfDetail.MINIMAL_LOD
+
+    @staticmethod
+    def draw_minimal_node(painter: QPainter, rect, fill_color, selected: bool, ellipse: bool = False):
+        """Figura rellena sin borde ni texto; el indicador de selección se mantiene"""
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing, False)
+        painter.setPen(Qt.PenStyle.NoPen)
+        painter.setBrush(QBrush(fill_color))
+        draw = painter.drawEllipse if ellipse else painter.drawRect
+        draw(rect)
+
+        if selected:
+            # Pen cosmético: 2px en pantalla sea cual sea el zoom
+            pen = QPen(Qt.GlobalColor.yellow, 2)
+            pen.setCosmetic(True)
+            painter.setPen(pen)
+            painter.setBrush(Qt.BrushStyle.NoBrush)
+            draw(rect)
+
+    @staticmethod
+    def line_pen(pen: QPen, lod: float) -> QPen:
+        """
+        Pen para dibujar una edge como línea simple. Con nivel mínimo la línea
+        queda por debajo del píxel: 1px cosmético con la opacidad que le
+        correspondería por su ancho real, para que no se vea más oscura.
+        """
+        if not LevelOfDetail.is_minimal(lod):
+            return pen
+        color = QColor(pen.color())
+        color.setAlphaF(color.alphaF() * min(1.0, max(pen.widthF(), 1.0) * lod))
+        simple = QPen(pen)
+        simple.setColor(color)
+        simple.setWidth(0)
+        simple.setCosmetic(True)
+        return simple
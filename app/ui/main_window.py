@@ -7,7 +7,7 @@
 
 from PyQt6.QtWidgets import (
     QMainWindow, QWidget, QHBoxLayout, QVBoxLayout, QPushButton,
-    QSplitter, QScrollArea, QGroupBox, QMessageBox, QMenuBar, QMenu
+    QSplitter, QScrollArea, QGroupBox, QMessageBox, QMenuBar, QMenu, QProgressDialog
 )
 from PyQt6.QtCore import pyqtSlot, Qt
 from pathlib import Path
@@ -68,6 +68,16 @@ class MainWindow(QMainWindow):
         # Conectar señal de modificación del proyecto
         self.canvas_controller.project_modified.connect(self.on_project_modified)
 
+        # Progreso y resultado del guardado en segundo plano
+        self.canvas_controller.save_progress.connect(self.on_save_progress)
+        self.canvas_controller.save_finished.connect(self.on_save_finished)
+
+        # Carga progresiva: diálogo con progreso y botón de cancelar
+        self.load_dialog = None
+        self.canvas_controller.load_started.connect(self.on_load_started)
+        self.canvas_controller.load_progress.connect(self.on_load_progress)
+        self.canvas_controller.load_finished.connect(self.on_load_finished)
+
         # ------------------
         # Controles de zoom
         # ------------------
@@ -143,6 +153,45 @@ class MainWindow(QMainWindow):
         """Se llama cuando el estado de modificación del proyecto cambia"""
         self.update_window_title()
 
+    def on_save_progress(self, filename, percent):
+        """Muestra el progreso del guardado en la barra de estado"""
+        self.statusBar().showMessage(f"Guardando {Path(filename).name}... {percent}%")
+
+    def on_save_finished(self, filename, success):
+        """Se llama cuando termina un guardado en segundo plano"""
+        if success:
+            self.statusBar().showMessage(f"Proyecto guardado: {Path(filename).name}", 3000)
+        else:
+            self.statusBar().clearMessage()
+        self.update_window_title()
+
+    def on_load_started(self, filename):
+        """Muestra el diálogo de carga (indeterminado mientras se lee el archivo)"""
+        self.load_dialog = QProgressDialog(f"Cargando {Path(filename).name}...", "Cancelar", 0, 0, self)
+        self.load_dialog.setWindowTitle("Cargar proyecto")
+        self.load_dialog.setWindowModality(Qt.WindowModality.WindowModal)
+        self.load_dialog.setMinimumDuration(0)
+        self.load_dialog.setAutoClose(False)
+        self.load_dialog.setAutoReset(False)
+        self.load_dialog.canceled.connect(self.canvas_controller.cancel_import)
+        self.load_dialog.show()
+
+    def on_load_progress(self, filename, percent):
+        """Construcción de los items: progreso determinado"""
+        if self.load_dialog:
+            self.load_dialog.setMaximum(100)
+            self.load_dialog.setValue(percent)
+
+    def on_load_finished(self, filename, success):
+        """Se llama cuando termina (o se cancela) una carga en segundo plano"""
+        if self.load_dialog:
+            self.load_dialog.canceled.disconnect(self.canvas_controller.cancel_import)
+            self.load_dialog.close()
+            self.load_dialog = None
+        if success:
+            self.statusBar().showMessage(f"Proyecto cargado: {Path(filename).name}", 3000)
+        self.update_window_title()
+
     def update_window_title(self):
         """Actualiza el título de la ventana con el estado del proyecto"""
         base_title = "Asteroid"
@@ -178,6 +227,12 @@ class MainWindow(QMainWindow):
         save_action = file_menu.addAction('&Guardar proyecto...')
         save_action.setShortcut('Ctrl+S')
         save_action.triggered.connect(self.save_project)
+
+        # Guardado incremental: Ctrl+S solo añade los cambios al journal del archivo
+        journal_action = file_menu.addAction('Guardado &incremental')
+        journal_action.setCheckable(True)
+        journal_action.setChecked(self.canvas_controller.journaled_saves)
+        journal_action.toggled.connect(self.canvas_controller.set_journaled_saves)
         
         # Separador
         file_menu.addSeparator()
@@ -195,6 +250,18 @@ class MainWindow(QMainWindow):
         export_pdf_action.setShortcut('Ctrl+P')
         export_pdf_action.triggered.connect(self.export_pdf)
 
+        # ---------------------------
+        # Menú Ver
+        # ---------------------------
+        view_menu = menubar.addMenu('&Ver')
+
+        # HUD de rendimiento: FPS, tiempo de pintado, items y contadores por frame
+        hud_action = view_menu.addAction('&Rendimiento (HUD)')
+        hud_action.setShortcut('F12')
+        hud_action.setCheckable(True)
+        hud_action.setChecked(self.canvas.hud.enabled)
+        hud_action.toggled.connect(self.canvas.set_hud_visible)
+
         # ---------------------------
         # Menú Ayuda
         # ---------------------------
@@ -224,13 +291,16 @@ class MainWindow(QMainWindow):
     def load_project(self):
         """Carga un proyecto .astr"""
         if self.check_unsaved_changes():
-            success = self.canvas_controller.import_from_astr()
-            if success:
-                self.update_window_title()
+            # El resultado llega por load_finished
+            self.canvas_controller.import_from_astr_async()
 
     def save_project(self) -> bool:
         """Guarda el proyecto actual como .astr"""
-        success = self.canvas_controller.export_to_astr()
+        # En guardado incremental se reutiliza el archivo actual sin preguntar
+        filename = None
+        if self.canvas_controller.journaled_saves:
+            filename = self.canvas_controller._current_file_path
+        success = self.canvas_controller.export_to_astr(filename)
         if success:
             self.update_window_title()
         return success
@@ -275,7 +345,12 @@ class MainWindow(QMainWindow):
         )
         
         if reply == QMessageBox.StandardButton.Save:
-            return self.save_project()
+            if not self.save_project():
+                return False
+            # El guardado termina en segundo plano: continuar solo si llegó al
+            # disco (si falló, el proyecto sigue modificado y no se descarta)
+            self.canvas_controller.wait_for_pending_saves()
+            return not self.canvas_controller.is_modified
         elif reply == QMessageBox.StandardButton.Discard:
             return True
         else:  # Cancel
@@ -284,6 +359,9 @@ class MainWindow(QMainWindow):
     def closeEvent(self, event):
         """Maneja el cierre de la aplicación"""
         if self.check_unsaved_changes():
+            # No cerrar con un guardado a medio escribir ni con una carga a medias
+            self.canvas_controller.cancel_import()
+            self.canvas_controller.wait_for_pending_saves()
             event.accept()
         else:
             event.ignore()
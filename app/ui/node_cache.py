@@ -0,0 +1,94 @@
+# ---------------------------------------------------
+# Proyecto: Asteroid
+# Autor: Daryll Lorenzo Alfonso
+# Año: 2025
+# Licencia: MIT License
+# ---------------------------------------------------
+"""
+Caché de pintado de los nodos.
+
+Un nodo quieto se pinta siempre igual, así que se pone en
+DeviceCoordinateCache: Qt guarda su dibujo en un pixmap (en QPixmapCache) y
+al desplazar la vista o mover otros items solo lo copia. El pixmap se
+invalida con cada update() del nodo, que ya hacen update_properties(),
+set_radius() y synced_property_changed() (callbacks de los wrappers
+composite); la selección la invalida Qt.
+
+Mientras el pixmap cambia en cada frame no compensa: redimensionar un nodo
+o hacer zoom (un pixmap nuevo por escala) obligaría a repintar y además
+reservar el pixmap. En esos casos la caché se suspende y se restaura al
+terminar:
+
+    NodeCache.suspend(node)      # p. ej. al empezar a redimensionar
+    ...
+    NodeCache.resume(node)
+
+scene.render() también usaría los pixmaps (ajustados a píxeles enteros del
+dispositivo); las exportaciones pintan sin caché:
+
+    with NodeCache.uncached(scene.items()):
+        scene.render(painter, source=rect)
+"""
+from contextlib import contextmanager
+
+from PyQt6.QtWidgets import QGraphicsItem
+from PyQt6.QtGui import QPixmapCache
+
+_CACHED = QGraphicsItem.CacheMode.DeviceCoordinateCache
+_UNCACHED = QGraphicsItem.CacheMode.NoCache
+
+
+class NodeCache:
+    # Tiempo sin cambios de zoom tras el que se vuelve a cachear (ms)
+    ZOOM_SETTLE_MS = 250
+    # Límite de QPixmapCache (KB). El de Qt (10 MB) solo da para unos
+    # cientos de nodos a zoom 100% y al desplazar se descartarían en bucle
+    PIXMAP_CACHE_KB = 64 * 1024
+
+    @staticmethod
+    def configure():
+        """Ajusta el límite de QPixmapCache (una vez, al crear el canvas)"""
+        if QPixmapCache.cacheLimit() < NodeCache.PIXMAP_CACHE_KB:
+            QPixmapCache.setCacheLimit(NodeCache.PIXMAP_CACHE_KB)
+
+    @staticmethod
+    def apply(item):
+        """Activa la caché en un nodo nuevo"""
+        item._cache_suspended = False
+        item.setCacheMode(_CACHED)
+
+    @staticmethod
+    def suspend(item) -> bool:
+        """Pinta el nodo sin caché; False si ya lo estaba (o no es un nodo)"""
+        if getattr(item, "_cache_suspended", True):
+            return False
+        item._cache_suspended = True
+        item.setCacheMode(_UNCACHED)
+        return True
+
+    @staticmethod
+    def resume(item):
+        # Un nodo que se está redimensionando sigue sin caché hasta soltarlo
+        if getattr(item, "_cache_suspended", False) and not getattr(item, "_resizing", False):
+            item._cache_suspended = False
+            item.setCacheMode(_CACHED)
+
+    @staticmethod
+    def suspend_all(items):
+        for item in items:
+            NodeCache.suspend(item)
+
+    @staticmethod
+    def resume_all(items):
+        for item in items:
+            NodeCache.resume(item)
+
+    @staticmethod
+    @contextmanager
+    def uncached(items):
+        """Suspende la caché de los nodos durante el bloque (p. ej. una exportación)"""
+        suspended = [item for item in items if NodeCache.suspend(item)]
+        try:
+            yield
+        finally:
+            NodeCache.resume_all(suspended)
@@ -0,0 +1,179 @@
+# ---------------------------------------------------
+# Proyecto: Asteroid
+# Autor: Daryll Lorenzo Alfonso
+# Año: 2025
+# Licencia: MIT License
+# ---------------------------------------------------
+"""
+HUD de rendimiento del Canvas (menú Ver > Rendimiento).
+
+Muestra en la esquina superior izquierda de la vista:
+- frames por segundo y duración del último paintEvent;
+- items de la escena por clase (nodos, edges, handles, subcanvases), con
+  las edges desglosadas por subclase de BaseEdgeItem;
+- llamadas a paint() y recálculos de geometría de edges del último frame
+  (contadores de FrameStats).
+
+Con el HUD oculto solo cuestan los incrementos de FrameStats.
+"""
+import time
+from collections import deque
+
+from PyQt6.QtCore import QRect, QTimer, Qt
+from PyQt6.QtGui import QColor, QFont, QFontMetrics
+
+from app.ui.frame_stats import FrameStats
+from app.ui.components.base_edge_item import BaseEdgeItem
+from app.ui.components.base_node_item import BaseNodeItem
+from app.ui.components.base_tropos_item import BaseTroposItem
+from app.ui.components.control_point_handle import ControlPointHandle
+from app.ui.components.subcanvas_item import SubCanvasItem
+
+# Categorías del recuento de items (nombre, clases)
+_ITEM_CLASSES = (
+    ("nodos", (BaseNodeItem, BaseTroposItem)),
+    ("edges", (BaseEdgeItem,)),
+    ("handles", (ControlPointHandle,)),
+    ("subcanvas", (SubCanvasItem,)),
+)
+
+
+def _edge_kind(item) -> str:
+    """Nombre corto de la subclase de edge: DependencyLinkArrowItem -> DependencyLink"""
+    name = type(item).__name__
+    for suffix in ("ArrowItem", "EdgeItem", "Item"):
+        if name.endswith(suffix) and name != suffix:
+            return name[:-len(suffix)]
+    return name
+
+
+class PerfHud:
+    # Cada cuánto se recuentan los items de la escena y se refresca el HUD sin actividad
+    COUNT_INTERVAL = 0.5
+    REFRESH_MS = 250
+    MARGIN = 8
+    PADDING = 6
+
+    def __init__(self, view):
+        self.view = view
+        self.enabled = False
+
+        self._frames = deque(maxlen=240)   # instantes de fin de cada frame
+        self.last_paint_ms = 0.0
+        self.frame_paint_calls = 0
+        self.frame_edge_geometry_updates = 0
+
+        self._counts = {}
+        self._edge_counts = {}
+        self._counted_at = 0.0
+
+        self._font = QFont("monospace", 9)
+        self._font.setStyleHint(QFont.StyleHint.Monospace)
+        self._metrics = QFontMetrics(self._font)
+        self._rect = QRect()
+
+        self._timer = QTimer()
+        self._timer.setInterval(self.REFRESH_MS)
+        self._timer.timeout.connect(self.refresh)
+
+    def set_enabled(self, enabled: bool):
+        self.enabled = enabled
+        if enabled:
+            self._frames.clear()
+            self._counted_at = 0.0
+            FrameStats.take()
+            self._timer.start()
+        else:
+            self._timer.stop()
+        self.view.viewport().update()
+
+    def refresh(self):
+        """Repinta solo la zona del HUD"""
+        if not self.enabled:
+            return
+        if self._rect.isEmpty():
+            self.view.viewport().update()
+        else:
+            self.view.viewport().update(self._rect.adjusted(-1, -1, 1, 1))
+
+    # ---------------------
+    # Medición
+    # ---------------------
+    def end_frame(self, started: float, exposed: QRect):
+        """Cierra un paintEvent que empezó en `started` (time.perf_counter)"""
+        now = time.perf_counter()
+        # Los repintados del propio HUD no cuentan como frames del canvas
+        if not self._rect.isEmpty() and self._rect.adjusted(-1, -1, 1, 1).contains(exposed):
+            return
+
+        self.last_paint_ms = (now - started) * 1000.0
+        self._frames.append(now)
+        self.frame_paint_calls, self.frame_edge_geometry_updates = FrameStats.take()
+
+    def fps(self) -> float:
+        """Frames en el último segundo"""
+        now = time.perf_counter()
+        while self._frames and now - self._frames[0] > 1.0:
+            self._frames.popleft()
+        return float(len(self._frames))
+
+    def item_counts(self) -> dict:
+        """Items de la escena por categoría (recontados como mucho cada COUNT_INTERVAL)"""
+        now = time.perf_counter()
+        if now - self._counted_at >= self.COUNT_INTERVAL:
+            counts = {name: 0 for name, _ in _ITEM_CLASSES}
+            counts["otros"] = 0
+            edge_counts = {}
+            for item in self.view.scene.items():
+                for name, classes in _ITEM_CLASSES:
+                    if isinstance(item, classes):
+                        counts[name] += 1
+                        break
+                else:
+                    counts["otros"] += 1
+                if isinstance(item, BaseEdgeItem):
+                    kind = _edge_kind(item)
+                    edge_counts[kind] = edge_counts.get(kind, 0) + 1
+            self._counts = counts
+            # Las más numerosas primero
+            self._edge_counts = dict(sorted(edge_counts.items(), key=lambda entry: (-entry[1], entry[0])))
+            self._counted_at = now
+        return self._counts
+
+    # ---------------------
+    # Dibujo
+    # ---------------------
+    def edge_counts(self) -> dict:
+        """Edges de la escena por subclase (se recuentan junto con item_counts)"""
+        self.item_counts()
+        return self._edge_counts
+
+    def lines(self) -> list:
+        counts = self.item_counts()
+        edge_counts = self.edge_counts()
+        return [
+            f"FPS {self.fps():5.1f}   paint {self.last_paint_ms:6.2f} ms",
+            "items " + "  ".join(f"{name} {count}" for name, count in counts.items()),
+            "edges " + ("  ".join(f"{kind} {count}" for kind, count in edge_counts.items()) or "-"),
+            f"frame: paint() {self.frame_paint_calls}   geometría edges {self.frame_edge_geometry_updates}",
+        ]
+
+    def draw(self, painter):
+        """Dibuja el HUD en coordenadas del viewport (se llama desde drawForeground)"""
+        lines = self.lines()
+        line_height = self._metrics.height()
+        width = max(self._metrics.horizontalAdvance(line) for line in lines) + 2 * self.PADDING
+        height = line_height * len(lines) + 2 * self.PADDING
+        self._rect = QRect(self.MARGIN, self.MARGIN, width, height)
+
+        painter.save()
+        painter.resetTransform()
+        painter.setPen(Qt.PenStyle.NoPen)
+        painter.setBrush(QColor(0, 0, 0, 170))
+        painter.drawRect(self._rect)
+        painter.setFont(self._font)
+        painter.setPen(QColor(255, 255, 255))
+        for index, line in enumerate(lines):
+            y = self.MARGIN + self.PADDING + index * line_height + self._metrics.ascent()
+            painter.drawText(self.MARGIN + self.PADDING, y, line)
+        painter.restore()
@@ -16,6 +16,7 @@ from app.ui.components.tropos_element_item.plan_item import PlanNodeItem
 from app.ui.components.tropos_element_item.resource_item import ResourceNodeItem
 from app.ui.components.entity_item.actor_node_item import ActorNodeItem
 from app.ui.components.entity_item.agent_node_item import AgentNodeItem
+from app.ui.node_cache import NodeCache
 
 # Arrow/link items (deben aceptar (source_node, dest_node) en su constructor)
 from app.ui.components.dependency_item.dependency_link_edge_item import DependencyLinkArrowItem
@@ -24,6 +25,9 @@ from app.ui.components.dependency_item.or_decomposition_edge_item import OrDecom
 from app.ui.components.dependency_item.and_decomposition_edge_item import AndDecompositionArrowItem
 from app.ui.components.dependency_item.contribution_edge_item import ContributionArrowItem
 from app.ui.components.dependency_item.means_end_edge_item import MeansEndArrowItem
+from app.log import get_logger
+
+log = get_logger("sidebar")
 
 
 class DraggableLabel(QLabel):
@@ -98,15 +102,16 @@ class DraggableLabel(QLabel):
                 node.setPos(node_center_x, node_center_y)
                 scene.addItem(node)
     
-            # Renderizar nodo
-            rect = scene.itemsBoundingRect()
+            # Renderizar nodo (encuadrando la figura: la etiqueta puede ser más ancha)
+            rect = node.mapRectToScene(node.node_rect()) if node else scene.itemsBoundingRect()
             if rect.isNull() or rect.width() == 0 or rect.height() == 0:
                 rect = QRectF(0, 0, W, H)
-            scene.render(painter, QRectF(0, 0, W, H), rect)
+            with NodeCache.uncached(scene.items()):
+                scene.render(painter, QRectF(0, 0, W, H), rect)
     
             # 2️⃣ Calcular límites reales del nodo y dibujar líneas
             if node:
-                node_bounds = node.boundingRect()
+                node_bounds = node.node_rect()
                 # El boundingRect es relativo al nodo → lo convertimos a coordenadas de escena
                 node_left = node_center_x + node_bounds.left()
                 node_right = node_center_x + node_bounds.right()
@@ -125,6 +130,8 @@ class DraggableLabel(QLabel):
                 painter.drawLine(int(node_right + margin), y, W - 8, y)
     
         else:
+            # Área a renderizar: la figura del nodo (la etiqueta puede ser más ancha)
+            frame = None
             # === Nodos normales ===
             if self.item_type in node_map:
                 NodeClass = node_map[self.item_type]
@@ -134,6 +141,7 @@ class DraggableLabel(QLabel):
                 except TypeError:
                     node = NodeClass(0, 0)
                 scene.addItem(node)
+                frame = node.mapRectToScene(node.node_rect())
     
             # === Flechas normales ===
             elif self.item_type in arrow_map:
@@ -150,13 +158,14 @@ class DraggableLabel(QLabel):
                     arrow = ArrowClass(src_node, dst_node)
                     scene.addItem(arrow)
                 except Exception as e:
-                    print(f"⚠️ Sidebar preview error for {self.item_type}: {e}")
+                    log.warning("⚠️ Sidebar preview error for %s: %s", self.item_type, e)
     
             # Render general
-            rect = scene.itemsBoundingRect()
+            rect = frame if frame is not None else scene.itemsBoundingRect()
             if rect.isNull() or rect.width() == 0 or rect.height() == 0:
                 rect = QRectF(0, 0, W, H)
-            scene.render(painter, QRectF(0, 0, W, H), rect)
+            with NodeCache.uncached(scene.items()):
+                scene.render(painter, QRectF(0, 0, W, H), rect)
     
         painter.end()
         return pixmap
@@ -170,7 +179,7 @@ class DraggableLabel(QLabel):
             try:
                 self.on_click()
             except Exception as e:
-                print(f"⚠️ Error al ejecutar on_click de {self.item_type}: {e}")
+                log.warning("⚠️ Error al ejecutar on_click de %s: %s", self.item_type, e)
             return
         # si no hay callback, iniciar drag normal
         if event.button() == Qt.MouseButton.LeftButton:
@@ -291,9 +300,9 @@ class Sidebar(QWidget):
     def _start_composite(self, node_type):
         """Callback de los botones composite: delega al controller si existe."""
         if not self.controller:
-            print("Sidebar: composite clicked but no controller attached.")
+            log.warning("Sidebar: composite clicked but no controller attached.")
             return
         try:
             self.controller.start_composite_dependency_mode(node_type)
         except Exception as e:
-            print(f"⚠️ Error starting composite mode for {node_type}: {e}")
+            log.warning("⚠️ Error starting composite mode for %s: %s", node_type, e)
@@ -4,71 +4,72 @@
 # Año: 2025
 # Licencia: MIT License
 # ---------------------------------------------------
-from typing import Dict, List, Any
-from PyQt6.QtCore import QPointF
+from typing import Any, Dict, List
+from app.core.astr_document import AstrDocument
+from app.log import get_logger
+
+log = get_logger("format")
+
+
+class AstrFormat(AstrDocument):
+    """
+    Serialización de los items de la escena (nodos y edges de la interfaz).
+
+    La lectura, escritura e índices del documento se heredan de AstrDocument.
+    """
 
-class AstrFormat:
     @staticmethod
     def serialize_scene(nodes: List, edges: List) -> Dict[str, Any]:
-        """Serializa la escena completa a formato JSON"""
-        scene_data = {
-            "version": "1.4",
-            "metadata": {
-                "created_by": "Asteroid",
-                "node_count": len(nodes),
-                "edge_count": len(edges)
-            },
-            "nodes": [],
-            "edges": []
-        }
-        
-        node_id_map = {}
-        
-        # Serializar nodos
-        # Primero, identificar nodos composite para evitar duplicarlos
-        serialized_nodes = set()
-        node_id_map = {}
-        idx = 0
-        
+        """
+        Serializa la escena completa a formato JSON.
+
+        Los ids son los ids persistentes de los modelos (element_id), así que
+        no cambian de un guardado a otro.
+        """
+        scene_data = AstrDocument.new_document()
+
+        # Serializar nodos (con su parent_id si están en un subcanvas)
         for node in nodes:
-            # Si el nodo tiene un CompositeModelWrapper, verificar si ya fue serializado
-            if hasattr(node, 'model') and hasattr(node.model, 'get_external_model'):
-                # Es un nodo composite
-                external_model = node.model.get_external_model()
-                if external_model in serialized_nodes:
-                    # Ya serializamos el nodo externo, saltar este interno
-                    continue
-            
-            node_data = AstrFormat._serialize_node(node, idx)
-            node_id_map[node] = idx
-            serialized_nodes.add(id(node.model) if hasattr(node, 'model') else idx)
-            scene_data["nodes"].append(node_data)
-            idx += 1
-
-        # Actualizar parent_id para nodos en subcanvas
-        for node, node_id in node_id_map.items():
-            if hasattr(node, 'subcanvas_parent') and node.subcanvas_parent:
-                parent_node = node.subcanvas_parent.parentItem()
-                if parent_node in node_id_map:
-                    scene_data["nodes"][node_id]["parent_id"] = node_id_map[parent_node]
-        
-        # Actualizar parent_id para edges en subcanvas
+            scene_data["nodes"].append(AstrFormat.serialize_node_record(node))
+
+        # Serializar edges cuyos extremos están en la escena
+        serialized_nodes = set(nodes)
         for edge in edges:
-            edge_data = AstrFormat._serialize_edge(edge, node_id_map)
-            if edge_data:
-                if hasattr(edge, 'parentItem') and edge.parentItem():
-                    parent_item = edge.parentItem()
-                    if hasattr(parent_item, 'subnode_dropped'): 
-                        parent_node = parent_item.parentItem()
-                        if parent_node in node_id_map:
-                            edge_data["parent_id"] = node_id_map[parent_node]
-                
-                scene_data["edges"].append(edge_data)
-            
+            if edge.source_node in serialized_nodes and edge.dest_node in serialized_nodes:
+                scene_data["edges"].append(AstrFormat.serialize_edge_record(edge))
+
+        scene_data["metadata"]["node_count"] = len(scene_data["nodes"])
+        scene_data["metadata"]["edge_count"] = len(scene_data["edges"])
         return scene_data
 
     @staticmethod
-    def _serialize_node(node, node_id: int) -> Dict[str, Any]:
+    def serialize_node_record(node) -> Dict[str, Any]:
+        """Serializa un nodo con su id y el parent_id de su subcanvas"""
+        node_data = AstrFormat._serialize_node(node, node.element_id)
+
+        if hasattr(node, 'subcanvas_parent') and node.subcanvas_parent:
+            parent_node = node.subcanvas_parent.parentItem()
+            if parent_node is not None and hasattr(parent_node, 'element_id'):
+                node_data["parent_id"] = parent_node.element_id
+
+        return node_data
+
+    @staticmethod
+    def serialize_edge_record(edge) -> Dict[str, Any]:
+        """Serializa una edge con su id y el parent_id de su subcanvas"""
+        edge_data = AstrFormat._serialize_edge(edge)
+
+        if hasattr(edge, 'parentItem') and edge.parentItem():
+            parent_item = edge.parentItem()
+            if hasattr(parent_item, 'subnode_dropped'):
+                parent_node = parent_item.parentItem()
+                if parent_node is not None and hasattr(parent_node, 'element_id'):
+                    edge_data["parent_id"] = parent_node.element_id
+
+        return edge_data
+
+    @staticmethod
+    def _serialize_node(node, node_id) -> Dict[str, Any]:
         """Serializa un nodo individual"""
         pos = node.pos()
         node_data = {
@@ -95,7 +96,7 @@ class AstrFormat:
                     'text_align': getattr(node.model, 'text_align', 'center'),
                 }
         except Exception as e:
-            print(f"Error serializando propiedades: {e}")
+            log.error("Error serializando propiedades: %s", e)
             node_data["properties"] = {}
 
         # Información del subcanvas
@@ -105,12 +106,19 @@ class AstrFormat:
                 "radius": float(node.subcanvas.radius),
                 "original_radius": float(getattr(node.subcanvas, 'original_radius', node.subcanvas.radius))
             }
+        elif getattr(node, 'collapsed_subcanvas_state', None):
+            # Subcanvas colapsado que todavía no se construyó: se conserva lo cargado
+            node_data["subcanvas"] = dict(node.collapsed_subcanvas_state, visible=False)
 
         # Información del modelo completa
         if hasattr(node, 'model'):
             # Si es un CompositeModelWrapper, guardar información de ambos modelos
             if hasattr(node.model, 'get_internal_model'):
                 internal_model = node.model.get_internal_model()
+                external_model = node.model.get_external_model()
+                # El gemelo es el modelo del wrapper que no pertenece a este nodo
+                own_model = getattr(node, '_independent_model', None) or external_model
+                twin_model = internal_model if own_model is external_model else external_model
                 node_data["model_properties"] = {
                     "show_subcanvas": getattr(node.model, 'show_subcanvas', False),
                     "x": float(getattr(node.model, 'x', 0)),
@@ -135,7 +143,9 @@ class AstrFormat:
                     "text_align": getattr(node.model, 'text_align', 'center'),
                     
                     # Marcar como nodo composite
-                    "is_composite": True
+                    "is_composite": True,
+                    # Id del otro nodo del par externo/interno
+                    "composite_pair": getattr(twin_model, 'id', None)
                 }
             else:
                 # Nodo normal (no composite)
@@ -162,15 +172,13 @@ class AstrFormat:
         return node_data
 
     @staticmethod
-    def _serialize_edge(edge, node_id_map: Dict) -> Dict[str, Any]:
+    def _serialize_edge(edge) -> Dict[str, Any]:
         """Serializa una edge individual"""
-        if edge.source_node not in node_id_map or edge.dest_node not in node_id_map:
-            return None
-
         edge_data = {
+            "id": edge.element_id,
             "type": AstrFormat._get_edge_type(edge),
-            "source_id": node_id_map.get(edge.source_node, -1),
-            "target_id": node_id_map.get(edge.dest_node, -1),
+            "source_id": edge.source_node.element_id,
+            "target_id": edge.dest_node.element_id,
             "properties": {},
             "parent_id": None,
             "control_points": []
@@ -0,0 +1,288 @@
+# ---------------------------------------------------
+# Proyecto: Asteroid
+# Autor: Daryll Lorenzo Alfonso
+# Año: 2025
+# Licencia: MIT License
+# ---------------------------------------------------
+"""
+Journal de cambios append-only para guardados incrementales.
+
+Junto al snapshot (proyecto.astr / proyecto.astrb) se mantiene un archivo
+hermano proyecto.astr.journal con una operación JSON por línea:
+
+    {"op": "move", "kind": "node", "id": "5f0c...", "data": {...registro completo...}}
+    {"op": "delete", "kind": "edge", "id": "a41e..."}
+
+Operaciones: add, move, resize, property y delete. Las que no son delete
+llevan el registro completo del elemento (el mismo que escribe
+AstrFormat.serialize_scene), así que reaplicarlas es idempotente: el documento
+final es el snapshot con cada registro reemplazado/añadido/borrado por id.
+
+Cuando el journal supera COMPACT_THRESHOLD bytes se compacta en segundo plano:
+snapshot + journal se reescriben como un snapshot nuevo y el journal se queda
+solo con las líneas añadidas mientras tanto.
+"""
+import json
+import os
+import threading
+from typing import Any, Dict, List
+
+from app.utils.astr_format import AstrFormat
+from app.log import get_logger
+
+log = get_logger("journal")
+
+SUFFIX = ".journal"
+
+# Operaciones válidas del journal
+OPERATIONS = ("add", "move", "resize", "property", "delete")
+
+
+class ChangeJournal:
+    # Tamaño del journal a partir del cual se compacta en segundo plano
+    COMPACT_THRESHOLD = 2 * 1024 * 1024
+
+    def __init__(self):
+        self._snapshot_path = None
+        # item -> (kind, op) pendientes desde el último guardado
+        self._pending: Dict[Any, tuple] = {}
+        self._lock = threading.Lock()
+        self._compaction = None
+
+    # ---------------------
+    # Archivos
+    # ---------------------
+    @staticmethod
+    def journal_path(snapshot_path: str) -> str:
+        return snapshot_path + SUFFIX
+
+    @staticmethod
+    def discard(snapshot_path: str):
+        """Elimina el journal de un snapshot (tras escribir un snapshot completo)"""
+        try:
+            os.remove(ChangeJournal.journal_path(snapshot_path))
+        except FileNotFoundError:
+            pass
+
+    @staticmethod
+    def read_scene(snapshot_path: str) -> Dict[str, Any]:
+        """Lee el snapshot y le aplica su journal si existe"""
+        scene_data = AstrFormat.read_file(snapshot_path)
+
+        path = ChangeJournal.journal_path(snapshot_path)
+        if os.path.exists(path):
+            ops = ChangeJournal.read_ops(path)
+            if ops:
+                log.info("🔧 Aplicando %s cambios del journal: %s", len(ops), path)
+                ChangeJournal.replay(scene_data, ops)
+
+        return scene_data
+
+    @staticmethod
+    def read_ops(path: str, limit: int = None) -> List[Dict[str, Any]]:
+        """
+        Lee las operaciones del journal (hasta `limit` bytes si se indica).
+        Una última línea incompleta (guardado interrumpido) se ignora.
+        """
+        with open(path, 'rb') as f:
+            raw = f.read() if limit is None else f.read(limit)
+
+        ops = []
+        for line in raw.splitlines():
+            if not line.strip():
+                continue
+            try:
+                op = json.loads(line)
+            except ValueError:
+                log.warning("⚠️ Línea incompleta en el journal, se ignora el resto: %s", path)
+                break
+            ops.append(op)
+        return ops
+
+    @staticmethod
+    def replay(scene_data: Dict[str, Any], ops: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Aplica las operaciones sobre un documento ya cargado (solo diccionarios).
+        Los borrados de nodos arrastran a sus hijos y a las edges que los tocan.
+        """
+        nodes = {node['id']: node for node in scene_data.get('nodes', [])}
+        edges = {}
+        for index, edge in enumerate(scene_data.get('edges', [])):
+            edges[edge.get('id', ('legacy', index))] = edge
+
+        deleted_nodes = set()
+        for op in ops:
+            table = nodes if op['kind'] == 'node' else edges
+            if op['op'] == 'delete':
+                table.pop(op['id'], None)
+                if op['kind'] == 'node':
+                    deleted_nodes.add(op['id'])
+            else:
+                table[op['id']] = op['data']
+                if op['kind'] == 'node':
+                    deleted_nodes.discard(op['id'])
+
+        if deleted_nodes:
+            # Cascada: descendientes de los nodos borrados
+            children = {}
+            for node_id, node in nodes.items():
+                if node.get('parent_id') is not None:
+                    children.setdefault(node['parent_id'], []).append(node_id)
+
+            stack = list(deleted_nodes)
+            while stack:
+                for child_id in children.get(stack.pop(), []):
+                    if child_id not in deleted_nodes:
+                        deleted_nodes.add(child_id)
+                        stack.append(child_id)
+
+            for node_id in deleted_nodes:
+                nodes.pop(node_id, None)
+
+            edges = {
+                edge_id: edge for edge_id, edge in edges.items()
+                if edge.get('source_id') not in deleted_nodes
+                and edge.get('target_id') not in deleted_nodes
+                and edge.get('parent_id') not in deleted_nodes
+            }
+
+        scene_data['nodes'] = list(nodes.values())
+        scene_data['edges'] = list(edges.values())
+        metadata = scene_data.setdefault('metadata', {})
+        metadata['node_count'] = len(scene_data['nodes'])
+        metadata['edge_count'] = len(scene_data['edges'])
+        return scene_data
+
+    # ---------------------
+    # Estado en memoria
+    # ---------------------
+    @property
+    def snapshot_path(self):
+        return self._snapshot_path
+
+    def reset(self, snapshot_path: str = None):
+        """
+        Empieza a llevar el journal de `snapshot_path` (None: sin snapshot,
+        el próximo guardado será completo). Descarta los cambios pendientes.
+        """
+        self.wait_for_compaction()
+        self._snapshot_path = snapshot_path
+        self._pending.clear()
+
+    def record(self, op: str, item, kind: str = "node"):
+        """Anota un cambio de un item; varios cambios del mismo item se funden en uno"""
+        previous = self._pending.get(item)
+
+        if op == "delete":
+            if previous and previous[1] == "add":
+                # Nunca llegó al disco: basta con olvidarlo
+                del self._pending[item]
+            else:
+                self._pending[item] = (kind, op)
+            return
+
+        if previous is None or previous[1] not in ("add", "delete"):
+            self._pending[item] = (kind, op)
+
+    def forget(self, items):
+        """Descarta los cambios pendientes de items que ya están en el snapshot tal cual"""
+        for item in items:
+            self._pending.pop(item, None)
+
+    def has_pending(self) -> bool:
+        return bool(self._pending)
+
+    def can_append(self, snapshot_path: str) -> bool:
+        """True si los cambios pendientes pueden añadirse al journal de ese archivo"""
+        return (
+            self._snapshot_path is not None
+            and os.path.abspath(snapshot_path) == os.path.abspath(self._snapshot_path)
+            and os.path.exists(self._snapshot_path)
+        )
+
+    @staticmethod
+    def _build_op(item, kind: str, op: str) -> Dict[str, Any]:
+        """Convierte un cambio pendiente en una línea del journal"""
+        if op == "delete":
+            return {"op": op, "kind": kind, "id": item.element_id}
+
+        if kind == "node":
+            data = AstrFormat.serialize_node_record(item)
+        else:
+            data = AstrFormat.serialize_edge_record(item)
+        return {"op": op, "kind": kind, "id": data["id"], "data": data}
+
+    # ---------------------
+    # Guardado incremental
+    # ---------------------
+    def append_pending(self) -> int:
+        """Añade los cambios pendientes al journal. Devuelve cuántas operaciones escribió."""
+        lines = []
+        for item, (kind, op) in self._pending.items():
+            lines.append(json.dumps(self._build_op(item, kind, op), ensure_ascii=False))
+        self._pending.clear()
+
+        if lines:
+            payload = ("\n".join(lines) + "\n").encode('utf-8')
+            with self._lock:
+                with open(self.journal_path(self._snapshot_path), 'ab') as f:
+                    f.write(payload)
+                    f.flush()
+                    os.fsync(f.fileno())
+
+        return len(lines)
+
+    def needs_compaction(self) -> bool:
+        try:
+            return os.path.getsize(self.journal_path(self._snapshot_path)) > self.COMPACT_THRESHOLD
+        except (OSError, TypeError):
+            return False
+
+    def compact_in_background(self):
+        """Lanza la compactación en un hilo si no hay otra en curso"""
+        if self._compaction is not None and self._compaction.is_alive():
+            return
+        self._compaction = threading.Thread(
+            target=self._compact, args=(self._snapshot_path,), name="astr-journal-compaction"
+        )
+        self._compaction.start()
+
+    def wait_for_compaction(self):
+        """Espera a que termine la compactación en curso (antes de reescribir el snapshot)"""
+        if self._compaction is not None:
+            self._compaction.join()
+            self._compaction = None
+
+    def _compact(self, snapshot_path: str):
+        """Reescribe snapshot + journal como un snapshot nuevo"""
+        journal = self.journal_path(snapshot_path)
+        try:
+            with self._lock:
+                limit = os.path.getsize(journal)
+
+            scene_data = AstrFormat.read_file(snapshot_path)
+            self.replay(scene_data, self.read_ops(journal, limit))
+
+            # Mismo directorio y extensión para que write_file elija el formato
+            directory, name = os.path.split(snapshot_path)
+            temp_path = os.path.join(directory, ".compact-" + name)
+            AstrFormat.write_file(scene_data, temp_path)
+
+            with self._lock:
+                with open(journal, 'rb') as f:
+                    f.seek(limit)
+                    tail = f.read()
+                os.replace(temp_path, snapshot_path)
+
+                # Reaplicar el journal viejo sobre el snapshot nuevo es inocuo
+                # (las operaciones son idempotentes), así que basta con recortarlo
+                temp_journal = journal + ".tmp"
+                with open(temp_journal, 'wb') as f:
+                    f.write(tail)
+                    f.flush()
+                    os.fsync(f.fileno())
+                os.replace(temp_journal, journal)
+
+            log.info("✅ Journal compactado en %s", snapshot_path)
+        except Exception as e:
+            log.error("❌ Error compactando journal de %s: %s", snapshot_path, e)
@@ -0,0 +1,190 @@
+# ---------------------------------------------------
+# Proyecto: Asteroid
+# Autor: Daryll Lorenzo Alfonso
+# Año: 2025
+# Licencia: MIT License
+# ---------------------------------------------------
+"""
+Diagnóstico de memoria del ciclo de vida de la escena.
+
+- object_counts(): objetos vivos de Asteroid por clase y categoría (modelos,
+  items, handles, wrappers composite y callbacks) con sus bytes.
+- lifecycle(): repite cargar -> limpiar sobre un proyecto y compara los
+  objetos vivos y los snapshots de tracemalloc entre ciclos. Tras el primer
+  ciclo (cachés, imports) el estado debe ser estable: ninguna clase crece.
+
+Desde la línea de comandos:
+
+    python -m app.cli memory proyecto.astr --cycles 5
+
+Los bytes son los de los objetos de Python (objeto + __dict__); la memoria
+de la parte C++ de los items de Qt no se cuenta.
+"""
+import functools
+import gc
+import sys
+import tracemalloc
+import types
+from typing import Any, Dict
+
+from PyQt6.QtCore import QCoreApplication, QEvent
+from app.core.models.composite_model_wrapper import CompositeModelWrapper
+from app.ui.components.control_point_handle import ControlPointHandle
+from app.ui.components.subcanvas_item import ResizeHandle
+from app.ui.components.base_edge_item import BaseEdgeItem
+from app.ui.components.base_node_item import BaseNodeItem
+from app.ui.components.base_tropos_item import BaseTroposItem
+from app.ui.components.subcanvas_item import SubCanvasItem
+
+# Categorías por clase (en orden: la primera que coincide)
+_CATEGORY_CLASSES = (
+    ("wrappers", (CompositeModelWrapper,)),
+    ("handles", (ControlPointHandle, ResizeHandle)),
+    ("items", (BaseNodeItem, BaseTroposItem, BaseEdgeItem, SubCanvasItem)),
+)
+
+_APP_PREFIX = "app."
+
+
+class MemoryDiagnostics:
+    # Crecimiento de memoria trazada por ciclo que se tolera (fragmentación, cachés de Qt)
+    MAX_GROWTH_BYTES_PER_CYCLE = 256 * 1024
+    TOP_ALLOCATIONS = 10
+
+    @staticmethod
+    def collect():
+        """
+        Libera lo pendiente: los proxies de las conexiones eliminadas se borran
+        con deleteLater, así que primero se procesan esos eventos y luego el gc.
+        """
+        QCoreApplication.sendPostedEvents(None, QEvent.Type.DeferredDelete.value)
+        gc.collect()
+
+    @staticmethod
+    def object_counts() -> Dict[str, Dict[str, Any]]:
+        """Objetos vivos de Asteroid: {clase: {"category", "count", "bytes"}}"""
+        MemoryDiagnostics.collect()
+        counts = {}
+        for obj in gc.get_objects():
+            category = MemoryDiagnostics._category(obj)
+            if category is None:
+                continue
+            name = type(obj).__name__ if category != "callbacks" else MemoryDiagnostics._callback_name(obj)
+            entry = counts.setdefault(name, {"category": category, "count": 0, "bytes": 0})
+            entry["count"] += 1
+            entry["bytes"] += MemoryDiagnostics._size(obj)
+        return counts
+
+    @staticmethod
+    def category_totals(counts: Dict[str, Dict[str, Any]]) -> Dict[str, Dict[str, int]]:
+        totals = {}
+        for entry in counts.values():
+            total = totals.setdefault(entry["category"], {"count": 0, "bytes": 0})
+            total["count"] += entry["count"]
+            total["bytes"] += entry["bytes"]
+        return totals
+
+    @staticmethod
+    def format_counts(counts: Dict[str, Dict[str, Any]]) -> str:
+        lines = [f"{'clase':<40} {'categoría':<10} {'objetos':>8} {'bytes':>10}"]
+        for name, entry in sorted(counts.items(), key=lambda item: -item[1]["bytes"]):
+            lines.append(f"{name:<40} {entry['category']:<10} {entry['count']:>8} {entry['bytes']:>10}")
+        return "\n".join(lines)
+
+    @staticmethod
+    def lifecycle(controller, filename: str, cycles: int = 3) -> Dict[str, Any]:
+        """
+        Repite `cycles` veces cargar (con todos los subcanvases construidos) y
+        limpiar el canvas. Compara el estado tras el primer ciclo con el del
+        último: clases que crecen ("leaked") y memoria trazada.
+        """
+        started_tracing = not tracemalloc.is_tracing()
+        if started_tracing:
+            tracemalloc.start()
+
+        try:
+            history, first_counts, first_snapshot = [], None, None
+            for cycle in range(1, max(2, cycles) + 1):
+                if not controller.import_from_astr(filename):
+                    raise RuntimeError(getattr(controller, "last_error", None) or "No se pudo cargar el proyecto")
+                controller.hydrate_all_subcanvases()
+                loaded = len(controller.nodes) + len(controller.edges)
+                controller.clear_canvas()
+
+                counts = MemoryDiagnostics.object_counts()
+                snapshot = tracemalloc.take_snapshot()
+                history.append({
+                    "cycle": cycle,
+                    "loaded_elements": loaded,
+                    "objects": sum(entry["count"] for entry in counts.values()),
+                    "traced_bytes": tracemalloc.get_traced_memory()[0],
+                    "categories": MemoryDiagnostics.category_totals(counts),
+                })
+                if first_counts is None:
+                    first_counts, first_snapshot = counts, snapshot
+        finally:
+            if started_tracing:
+                tracemalloc.stop()
+
+        leaked = {}
+        for name, entry in counts.items():
+            growth = entry["count"] - first_counts.get(name, {}).get("count", 0)
+            if growth > 0:
+                leaked[name] = growth
+
+        growth_bytes = history[-1]["traced_bytes"] - history[0]["traced_bytes"]
+        allowed = MemoryDiagnostics.MAX_GROWTH_BYTES_PER_CYCLE * (len(history) - 1)
+        stats = snapshot.compare_to(first_snapshot, "lineno")[:MemoryDiagnostics.TOP_ALLOCATIONS]
+        return {
+            "cycles": history,
+            "leaked": leaked,
+            "traced_growth_bytes": growth_bytes,
+            "top_growth": [str(stat) for stat in stats],
+            "steady": not leaked and growth_bytes <= allowed,
+        }
+
+    # ---------------------
+    # Auxiliares
+    # ---------------------
+    @staticmethod
+    def _category(obj):
+        cls = type(obj)
+        if cls is functools.partial:
+            return "callbacks" if MemoryDiagnostics._is_app_callable(obj.func) else None
+        if cls is types.FunctionType:
+            # Closures anidadas de Asteroid (callbacks de wrappers, handlers de subcanvas...);
+            # los métodos con super() también tienen __closure__ (celda __class__)
+            is_nested = obj.__closure__ and "<locals>" in obj.__qualname__
+            return "callbacks" if is_nested and (obj.__module__ or "").startswith(_APP_PREFIX) else None
+        if not cls.__module__.startswith(_APP_PREFIX):
+            return None
+
+        for category, classes in _CATEGORY_CLASSES:
+            if isinstance(obj, classes):
+                return category
+        if cls.__module__.startswith("app.core.models."):
+            return "models"
+        return "other"
+
+    @staticmethod
+    def _is_app_callable(func) -> bool:
+        func = getattr(func, "__func__", func)
+        return (getattr(func, "__module__", None) or "").startswith(_APP_PREFIX)
+
+    @staticmethod
+    def _callback_name(obj) -> str:
+        if isinstance(obj, functools.partial):
+            func = getattr(obj.func, "__func__", obj.func)
+            return f"partial({getattr(func, '__qualname__', repr(func))})"
+        return obj.__qualname__
+
+    @staticmethod
+    def _size(obj) -> int:
+        size = sys.getsizeof(obj)
+        if isinstance(obj, types.FunctionType):
+            return size
+        try:
+            size += sys.getsizeof(vars(obj))
+        except TypeError:
+            pass
+        return size
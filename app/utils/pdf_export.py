@@ -5,6 +5,8 @@
 # Licencia: MIT License
 # ---------------------------------------------------
 
+import os
+import tempfile
 from typing import List, Dict, Any, Optional
 from pathlib import Path
 from reportlab.lib import colors
@@ -18,6 +20,12 @@ from reportlab.lib.enums import TA_CENTER, TA_LEFT
 from PyQt6.QtGui import QPixmap, QPainter, QColor
 from PyQt6.QtWidgets import QFileDialog, QMessageBox
 from PyQt6.QtCore import QBuffer, QIODevice
+from app.log import get_logger
+from app.profiling import profiled
+from app.ui.node_cache import NodeCache
+from app.ui.edge_update_scheduler import EdgeUpdateScheduler
+
+log = get_logger("pdf")
 
 
 class PDFGenerator:
@@ -26,6 +34,7 @@ class PDFGenerator:
     def __init__(self, canvas_controller):
         self.canvas_controller = canvas_controller
     
+    @profiled("export-pdf")
     def export_to_pdf(self, with_additional_info: bool = True, filename: str = None) -> bool:
         """
         Exporta el diagrama actual a PDF
@@ -37,6 +46,7 @@ class PDFGenerator:
         Returns:
             True si la exportación fue exitosa
         """
+        diagram_image = None
         try:
             # Obtener nombre de archivo
             if not filename:
@@ -88,39 +98,49 @@ class PDFGenerator:
             
             # Agregar información adicional si se solicita
             if with_additional_info:
+                # Las tablas listan también el contenido de subcanvases que aún no se construyó
+                self.canvas_controller.hydrate_all_subcanvases()
                 story.append(PageBreak())
                 self._add_additional_info(story, styles)
             
             # Construir PDF
             doc.build(story)
             
-            print(f"✅ PDF exportado exitosamente: {filename}")
-            QMessageBox.information(
-                self.canvas_controller.canvas,
-                "Exportación completada",
-                f"PDF exportado exitosamente:\n{filename}"
-            )
+            log.info("✅ PDF exportado exitosamente: %s", filename)
+            if self.canvas_controller.interactive:
+                QMessageBox.information(
+                    self.canvas_controller.canvas,
+                    "Exportación completada",
+                    f"PDF exportado exitosamente:\n{filename}"
+                )
             
             return True
             
         except Exception as e:
-            print(f"❌ Error exportando a PDF: {e}")
-            QMessageBox.critical(
-                self.canvas_controller.canvas,
-                "Error",
-                f"No se pudo exportar el PDF:\n{e}"
-            )
+            log.error("❌ Error exportando a PDF: %s", e)
+            self.canvas_controller.report_error(f"No se pudo exportar el PDF:\n{e}")
             return False
+        finally:
+            # La imagen temporal solo hace falta hasta doc.build()
+            if diagram_image:
+                try:
+                    os.remove(diagram_image)
+                except OSError:
+                    pass
     
     def _capture_canvas_image(self) -> Optional[str]:
         """
-        Captura el canvas como imagen y retorna la ruta temporal
+        Captura el canvas como imagen y retorna la ruta temporal (un archivo
+        propio por llamada: el render por lotes exporta varios PDF a la vez).
+        Quien la pide la borra.
 
         Returns:
             Ruta de la imagen temporal o None si falla
         """
         try:
             canvas = self.canvas_controller.canvas
+            # Edges con actualización pendiente (nodos recién movidos)
+            EdgeUpdateScheduler.flush()
 
             # ✅ Obtener los límites reales de todos los items + margen para evitar cortes
             scene_rect = canvas.scene.itemsBoundingRect()
@@ -137,17 +157,21 @@ class PDFGenerator:
             painter.setRenderHint(QPainter.RenderHint.SmoothPixmapTransform)
 
             # ✅ Renderizar usando el rect expandido para capturar todos los elementos completos
-            canvas.scene.render(painter, source=expanded_rect)
+            with NodeCache.uncached(canvas.scene.items()):
+                canvas.scene.render(painter, source=expanded_rect)
             painter.end()
 
             # Guardar como PNG temporal
-            temp_path = Path(__file__).parent.parent.parent / "temp_diagram.png"
-            pixmap.save(str(temp_path), "PNG")
+            with tempfile.NamedTemporaryFile(suffix=".png", delete=False) as temp_file:
+                temp_path = temp_file.name
+            if not pixmap.save(temp_path, "PNG"):
+                os.remove(temp_path)
+                return None
 
-            return str(temp_path)
+            return temp_path
             
         except Exception as e:
-            print(f"❌ Error capturando imagen del canvas: {e}")
+            log.error("❌ Error capturando imagen del canvas: %s", e)
             return None
     
     def _add_additional_info(self, story: list, styles):
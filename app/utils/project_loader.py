@@ -0,0 +1,65 @@
+# ---------------------------------------------------
+# Proyecto: Asteroid
+# Autor: Daryll Lorenzo Alfonso
+# Año: 2025
+# Licencia: MIT License
+# ---------------------------------------------------
+"""
+Carga de proyectos fuera del hilo de la interfaz (primera fase).
+
+Leer el archivo (JSON, binario o comprimido, más su journal), validarlo e
+indexarlo no necesita items de Qt, así que se hace en un QRunnable. El
+documento preparado vuelve por señales al hilo GUI, donde CanvasController
+construye los items por tramos (ver import_from_astr_async).
+"""
+from typing import Any, Dict
+
+from PyQt6.QtCore import QObject, QRunnable, pyqtSignal
+from app.core.astr_validator import AstrValidator
+from app.utils.astr_format import AstrFormat
+from app.utils.change_journal import ChangeJournal
+from app.profiling import profiled
+
+
+class ProjectLoadSignals(QObject):
+    prepared = pyqtSignal(str, object)    # archivo, documento preparado
+    failed = pyqtSignal(str, str)         # archivo, mensaje de error
+
+
+class ProjectLoadTask(QRunnable):
+    def __init__(self, filename: str):
+        super().__init__()
+        self.filename = filename
+        self.signals = ProjectLoadSignals()
+
+    @staticmethod
+    @profiled("load-prepare")
+    def prepare(filename: str) -> Dict[str, Any]:
+        """
+        Lee, valida e indexa un proyecto (sin Qt). Si hay errores de validación
+        el documento no se indexa: "issues" dice por qué no se puede cargar.
+        """
+        scene_data = ChangeJournal.read_scene(filename)
+        issues = AstrValidator.validate(scene_data)
+        prepared = {"scene_data": scene_data, "issues": issues, "index": None, "stable_ids": False}
+        if AstrValidator.errors(issues):
+            return prepared
+
+        # Los ids persistentes se conservan; en los archivos anteriores a
+        # STABLE_IDS_VERSION (índices numéricos) los elementos reciben ids nuevos
+        prepared["stable_ids"] = AstrFormat.has_stable_ids(scene_data)
+        if not prepared["stable_ids"]:
+            AstrFormat.assign_fresh_ids(scene_data)
+
+        # Indexar el documento en una sola pasada
+        prepared["index"] = AstrFormat.index_scene(scene_data)
+        return prepared
+
+    def run(self):
+        try:
+            prepared = ProjectLoadTask.prepare(self.filename)
+        except Exception as e:
+            self.signals.failed.emit(self.filename, str(e))
+            return
+
+        self.signals.prepared.emit(self.filename, prepared)
@@ -0,0 +1,52 @@
+# ---------------------------------------------------
+# Proyecto: Asteroid
+# Autor: Daryll Lorenzo Alfonso
+# Año: 2025
+# Licencia: MIT License
+# ---------------------------------------------------
+"""
+Guardado de proyectos fuera del hilo de la interfaz.
+
+El hilo GUI solo toma el snapshot de datos planos (AstrFormat.serialize_scene);
+la codificación, la escritura en el archivo temporal, el fsync y el rename
+atómico se hacen en un QRunnable. El resultado vuelve por señales, que Qt
+entrega en el hilo GUI.
+"""
+from PyQt6.QtCore import QObject, QRunnable, pyqtSignal
+from app.utils.astr_format import AstrFormat
+from app.utils.change_journal import ChangeJournal
+from app.profiling import profiled
+
+
+class ProjectSaveSignals(QObject):
+    progress = pyqtSignal(str, int)          # archivo, porcentaje
+    finished = pyqtSignal(str, bool, str)    # archivo, éxito, mensaje de error
+
+
+class ProjectSaveTask(QRunnable):
+    def __init__(self, scene_data: dict, filename: str):
+        super().__init__()
+        self.scene_data = scene_data
+        self.filename = filename
+        self.signals = ProjectSaveSignals()
+
+    @profiled("save-write")
+    def write(self):
+        """Codifica y escribe el snapshot (el perfil "save" solo cubre la parte del hilo GUI)"""
+        self._report_progress(0.0)
+        AstrFormat.write_file(self.scene_data, self.filename, progress=self._report_progress)
+
+        # El snapshot nuevo ya contiene todo lo que hubiera en el journal
+        ChangeJournal.discard(self.filename)
+
+    def _report_progress(self, fraction: float):
+        self.signals.progress.emit(self.filename, int(fraction * 100))
+
+    def run(self):
+        try:
+            self.write()
+        except Exception as e:
+            self.signals.finished.emit(self.filename, False, str(e))
+            return
+
+        self.signals.finished.emit(self.filename, True, "")
@@ -0,0 +1,75 @@
+# ---------------------------------------------------
+# Proyecto: Asteroid
+# Autor: Daryll Lorenzo Alfonso
+# Año: 2025
+# Licencia: MIT License
+# ---------------------------------------------------
+"""
+Benchmark del cargador de proyectos .astr (CanvasController.import_from_astr).
+
+Genera documentos sintéticos de distintos tamaños con DiagramGenerator (el
+formato actual, con ids persistentes), los carga en un canvas offscreen y
+muestra el tiempo por elemento. Con un cargador lineal el
+tiempo por elemento debe mantenerse aproximadamente constante.
+
+Uso:
+    python -m benchmarks.bench_loader
+    python -m benchmarks.bench_loader --sizes 1000 10000 100000
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from benchmarks.diagram_generator import DiagramGenerator
+
+
+def run(sizes):
+    from PyQt6.QtWidgets import QApplication
+    app = QApplication.instance() or QApplication(sys.argv)
+
+    from app.ui.canvas import Canvas
+    from app.controllers.canvas_controller import CanvasController
+
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in sizes:
+            scene_data = DiagramGenerator.for_element_count(size)
+            elements = len(scene_data["nodes"]) + len(scene_data["edges"])
+            path = os.path.join(tmp, f"bench_{size}.astr")
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(scene_data, f)
+
+            canvas = Canvas()
+            controller = CanvasController(canvas)
+            start = time.perf_counter()
+            controller.import_from_astr(path)
+            elapsed = time.perf_counter() - start
+            controller.clear_canvas()
+
+            results.append((elements, elapsed))
+            canvas.deleteLater()
+            app.processEvents()
+
+    base_per_element = results[0][1] / results[0][0]
+    print(f"{'elementos':>10} {'segundos':>10} {'µs/elem':>10} {'relativo':>9}")
+    for elements, elapsed in results:
+        per_element = elapsed / elements
+        print(f"{elements:>10} {elapsed:>10.3f} {per_element * 1e6:>10.1f} {per_element / base_per_element:>8.2f}x")
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark del cargador .astr")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000],
+                        help="Cantidad aproximada de elementos por documento")
+    args = parser.parse_args(argv)
+    run(args.sizes)
+
+
+if __name__ == "__main__":
+    main()
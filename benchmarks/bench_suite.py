@@ -0,0 +1,318 @@
+# ---------------------------------------------------
+# Proyecto: Asteroid
+# Autor: Daryll Lorenzo Alfonso
+# Año: 2025
+# Licencia: MIT License
+# ---------------------------------------------------
+"""
+Suite de benchmarks de Asteroid con baselines JSON.
+
+Para cada tamaño genera un diagrama (DiagramGenerator, semilla fija) y mide:
+
+    serialize      AstrFormat.serialize_scene de la escena cargada
+    encode-json    AstrDocument.encode a .astr
+    encode-binary  AstrDocument.encode a .astrb
+    read-json      AstrDocument.read_file de un .astr
+    read-binary    AstrDocument.read_file de un .astrb
+    import         CanvasController.import_from_astr
+    render         QGraphicsScene.render de toda la escena a una QImage
+    drag           DRAG_STEPS movimientos del nodo con más edges (edges actualizadas)
+    delete         delete_node de DELETE_COUNT contenedores (cascada de hijos y edges)
+
+Cada caso se repite --repeat veces y se guarda el mínimo. Uso:
+
+    python -m benchmarks.bench_suite --sizes 1000 10000
+    python -m benchmarks.bench_suite --save baseline.json
+    python -m benchmarks.bench_suite --compare baseline.json
+
+En el repositorio no hay baselines: dependen de la máquina, así que se graba
+una antes del cambio (--save) y se compara con ella después. Con --compare el
+código de salida es 1 si algún caso supera su umbral (tiempo actual / tiempo
+de la baseline). Los umbrales se guardan en la baseline, así que se pueden
+ajustar a mano caso por caso.
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt6.QtCore import QPointF, QRectF, QT_VERSION_STR
+from PyQt6.QtGui import QImage, QPainter
+from PyQt6.QtWidgets import QApplication
+
+from app.core.astr_document import AstrDocument
+from app.utils.astr_format import AstrFormat
+from app.ui.canvas import Canvas
+from app.ui.node_cache import NodeCache
+from app.ui.edge_update_scheduler import EdgeUpdateScheduler
+from app.controllers.canvas_controller import CanvasController
+from benchmarks.diagram_generator import DiagramGenerator
+
+CASES = ("serialize", "encode-json", "encode-binary", "read-json", "read-binary",
+         "import", "render", "drag", "delete")
+
+SCHEMA_VERSION = 1
+
+# Umbral de regresión (actual / baseline); los casos con más ruido toleran más
+DEFAULT_THRESHOLD = 1.25
+THRESHOLDS = {"render": 1.5, "drag": 1.5, "delete": 1.5}
+# Diferencias menores que esto no cuentan como regresión (ruido del reloj)
+MIN_REGRESSION_SECONDS = 0.005
+
+DRAG_STEPS = 100
+DELETE_COUNT = 5
+RENDER_SIZE = (1920, 1080)
+SEED = 42
+
+
+def _timed(function, repeat: int):
+    """Mínimo de `repeat` ejecuciones (segundos) y el resultado de la última"""
+    best, result = None, None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = function()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+class BenchmarkRun:
+    """Ejecuta los casos sobre un diagrama de un tamaño"""
+
+    def __init__(self, app, size: int, workdir: str, repeat: int):
+        self.app = app
+        self.size = size
+        self.repeat = repeat
+        self.scene_data = DiagramGenerator.for_element_count(size, seed=SEED)
+        self.elements = len(self.scene_data["nodes"]) + len(self.scene_data["edges"])
+
+        self.json_path = os.path.join(workdir, f"bench_{size}.astr")
+        self.binary_path = os.path.join(workdir, f"bench_{size}.astrb")
+        AstrDocument.write_file(self.scene_data, self.json_path)
+        AstrDocument.write_file(self.scene_data, self.binary_path)
+
+        self.canvas = Canvas()
+        self.controller = CanvasController(self.canvas)
+        self.controller.interactive = False
+
+    def close(self):
+        self.controller.clear_canvas()
+        self.canvas.deleteLater()
+        self.app.processEvents()
+
+    def run(self, cases):
+        """Segundos de cada caso; import siempre se ejecuta primero (los demás usan la escena cargada)"""
+        results = {"import": self.bench_import()}
+        for case in cases:
+            if case not in results:
+                results[case] = getattr(self, "bench_" + case.replace("-", "_"))()
+        return {case: results[case] for case in cases}
+
+    # ---------------------
+    # Casos
+    # ---------------------
+    def bench_import(self):
+        def load():
+            if not self.controller.import_from_astr(self.json_path):
+                raise RuntimeError(f"No se pudo cargar {self.json_path}")
+        seconds, _ = _timed(load, self.repeat)
+        return seconds
+
+    def bench_serialize(self):
+        seconds, _ = _timed(
+            lambda: AstrFormat.serialize_scene(self.controller.nodes, self.controller.edges), self.repeat)
+        return seconds
+
+    def bench_encode_json(self):
+        seconds, _ = _timed(lambda: AstrDocument.encode(self.scene_data, "bench.astr"), self.repeat)
+        return seconds
+
+    def bench_encode_binary(self):
+        seconds, _ = _timed(lambda: AstrDocument.encode(self.scene_data, "bench.astrb"), self.repeat)
+        return seconds
+
+    def bench_read_json(self):
+        seconds, _ = _timed(lambda: AstrDocument.read_file(self.json_path), self.repeat)
+        return seconds
+
+    def bench_read_binary(self):
+        seconds, _ = _timed(lambda: AstrDocument.read_file(self.binary_path), self.repeat)
+        return seconds
+
+    def bench_render(self):
+        scene = self.canvas.scene
+        source = scene.itemsBoundingRect()
+        image = QImage(*RENDER_SIZE, QImage.Format.Format_ARGB32_Premultiplied)
+
+        def render():
+            image.fill(0xFFFFFFFF)
+            painter = QPainter(image)
+            painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+            scene.render(painter, QRectF(image.rect()), source)
+            painter.end()
+
+        # Se mide el pintado real de los items, no la copia de sus pixmaps
+        with NodeCache.uncached(scene.items()):
+            seconds, _ = _timed(render, self.repeat)
+        return seconds
+
+    def bench_drag(self):
+        # El nodo de primer nivel con más edges conectadas
+        degree = {}
+        for edge in self.controller.edges:
+            for node in (edge.source_node, edge.dest_node):
+                degree[node] = degree.get(node, 0) + 1
+        top_level = [node for node in self.controller.nodes if node.parentItem() is None]
+        node = max(top_level, key=lambda candidate: degree.get(candidate, 0))
+        origin = node.pos()
+
+        # Como mouseMoveEvent del Canvas: mover el item, avisar a sus edges y
+        # actualizarlas al final del evento
+        def drag():
+            for step in range(DRAG_STEPS):
+                node.setPos(origin + QPointF(step, step * 0.5))
+                node.positionChanged.emit()
+                EdgeUpdateScheduler.flush()
+            node.setPos(origin)
+            node.positionChanged.emit()
+            EdgeUpdateScheduler.flush()
+
+        seconds, _ = _timed(drag, self.repeat)
+        return seconds
+
+    def bench_delete(self):
+        # Cada repetición elimina otros contenedores de la misma escena
+        containers = [node for node in self.controller.nodes
+                      if node.parentItem() is None and getattr(node, "subcanvas", None) is not None]
+        batches = [containers[start:start + DELETE_COUNT]
+                   for start in range(0, DELETE_COUNT * self.repeat, DELETE_COUNT)]
+        batches = [batch for batch in batches if batch]
+
+        best = None
+        for batch in batches:
+            start = time.perf_counter()
+            for node in batch:
+                self.controller.delete_node(node)
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+        return best
+
+
+# ---------------------
+# Baselines
+# ---------------------
+def _environment():
+    return {
+        "python": platform.python_version(),
+        "qt": QT_VERSION_STR,
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "processor": platform.processor(),
+    }
+
+
+def run_suite(sizes, cases, repeat: int):
+    app = QApplication.instance() or QApplication(sys.argv)
+
+    results = {}
+    with tempfile.TemporaryDirectory() as workdir:
+        for size in sizes:
+            bench = BenchmarkRun(app, size, workdir, repeat)
+            try:
+                for case, seconds in bench.run(cases).items():
+                    results[f"{case}@{size}"] = {
+                        "case": case,
+                        "size": size,
+                        "elements": bench.elements,
+                        "seconds": round(seconds, 6),
+                        "threshold": THRESHOLDS.get(case, DEFAULT_THRESHOLD),
+                    }
+            finally:
+                bench.close()
+
+    return {
+        "schema": SCHEMA_VERSION,
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "environment": _environment(),
+        "repeat": repeat,
+        "seed": SEED,
+        "results": results,
+    }
+
+
+def compare(report, baseline, threshold: float = None):
+    """
+    Compara un informe con una baseline. Devuelve [(clave, actual, baseline,
+    ratio, umbral, regresión)] de los casos presentes en ambos.
+    """
+    rows = []
+    for key, current in report["results"].items():
+        reference = baseline.get("results", {}).get(key)
+        if reference is None:
+            continue
+        limit = threshold or reference.get("threshold", DEFAULT_THRESHOLD)
+        ratio = current["seconds"] / reference["seconds"] if reference["seconds"] > 0 else 1.0
+        regression = (ratio > limit
+                      and current["seconds"] - reference["seconds"] > MIN_REGRESSION_SECONDS)
+        rows.append((key, current["seconds"], reference["seconds"], ratio, limit, regression))
+    return rows
+
+
+def print_report(report, out=None):
+    out = out or sys.stdout
+    out.write(f"{'caso':<15} {'tamaño':>8} {'elementos':>10} {'segundos':>10} {'µs/elem':>10}\n")
+    for entry in report["results"].values():
+        per_element = entry["seconds"] / max(entry["elements"], 1) * 1e6
+        out.write(f"{entry['case']:<15} {entry['size']:>8} {entry['elements']:>10} "
+                  f"{entry['seconds']:>10.4f} {per_element:>10.2f}\n")
+
+
+def print_comparison(rows, out=None):
+    out = out or sys.stdout
+    out.write(f"\n{'caso@tamaño':<22} {'actual':>10} {'baseline':>10} {'ratio':>7} {'umbral':>7}\n")
+    for key, current, reference, ratio, limit, regression in rows:
+        mark = "  REGRESIÓN" if regression else ""
+        out.write(f"{key:<22} {current:>10.4f} {reference:>10.4f} {ratio:>6.2f}x {limit:>6.2f}x{mark}\n")
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Suite de benchmarks de Asteroid")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000],
+                        help="Cantidad aproximada de elementos por diagrama")
+    parser.add_argument("--cases", nargs="+", choices=CASES, default=list(CASES))
+    parser.add_argument("--repeat", type=int, default=3, help="Repeticiones por caso (se guarda el mínimo)")
+    parser.add_argument("--save", metavar="JSON", help="Guarda los resultados como baseline")
+    parser.add_argument("--compare", metavar="JSON", help="Compara con una baseline (código 1 si hay regresiones)")
+    parser.add_argument("--threshold", type=float, default=None,
+                        help="Umbral común para --compare (por defecto, el de cada caso en la baseline)")
+    args = parser.parse_args(argv)
+
+    report = run_suite(args.sizes, args.cases, max(1, args.repeat))
+    print_report(report)
+
+    if args.save:
+        os.makedirs(os.path.dirname(os.path.abspath(args.save)), exist_ok=True)
+        with open(args.save, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+        print(f"\nBaseline guardada en {args.save}")
+
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        rows = compare(report, baseline, args.threshold)
+        print_comparison(rows)
+        regressions = [row for row in rows if row[-1]]
+        if regressions:
+            print(f"\n{len(regressions)} regresiones respecto a {args.compare}")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
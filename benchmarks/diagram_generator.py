@@ -0,0 +1,265 @@
+# ---------------------------------------------------
+# Proyecto: Asteroid
+# Autor: Daryll Lorenzo Alfonso
+# Año: 2025
+# Licencia: MIT License
+# ---------------------------------------------------
+"""
+Generador de diagramas i*/Tropos sintéticos para los benchmarks.
+
+Los documentos se parecen a los que guarda Asteroid (versión 1.4, ids
+persistentes, composite_pair) y son reproducibles: la misma semilla da el
+mismo documento. Cada actor/agente tiene un subcanvas con sus elementos
+(metas, softgoals, planes y recursos) conectados en árbol por
+descomposiciones, means-end y contribuciones; entre actores hay
+dependencias simples (dependum externo) y composite (dependum externo más su
+gemelo dentro del subcanvas del dependee).
+
+Uso:
+    scene_data = DiagramGenerator.generate(actors=40, agents=10, goals_per_subcanvas=25)
+    scene_data = DiagramGenerator.for_element_count(10000, seed=7)
+
+    python -m benchmarks.diagram_generator 10000 -o diagrama.astr
+"""
+import argparse
+import math
+import random
+from typing import Any, Dict, List, Sequence
+
+from app.core.astr_document import AstrDocument
+
+# Elementos que viven en los subcanvases (con su peso relativo)
+ELEMENT_TYPES = ("hard_goal", "soft_goal", "plan", "resource")
+ELEMENT_WEIGHTS = (4, 2, 3, 1)
+
+# Edges entre elementos de un mismo subcanvas
+INTERNAL_EDGE_TYPES = ("and_decomposition", "or_decomposition", "means_end", "contribution")
+
+# Tipos de dependum de las dependencias entre actores
+DEPENDUM_TYPES = ("hard_goal", "soft_goal", "plan", "resource")
+
+_COLORS = {
+    "actor": "#2ecc71", "agent": "#9b59b6",
+    "hard_goal": "#3498db", "soft_goal": "#1abc9c", "plan": "#e67e22", "resource": "#95a5a6",
+}
+
+# Separación entre actores en la rejilla de la escena
+_GRID_SPACING = 900.0
+_GRID_COLUMNS = 40
+
+
+class DiagramGenerator:
+
+    @staticmethod
+    def generate(actors: int = 10, agents: int = 2, goals_per_subcanvas: int = 20,
+                 dependencies_per_actor: int = 1, composite_dependencies_per_actor: int = 1,
+                 edge_types: Sequence[str] = INTERNAL_EDGE_TYPES,
+                 control_point_ratio: float = 0.1, control_points_per_edge: int = 2,
+                 collapsed_ratio: float = 0.0, seed: int = 0) -> Dict[str, Any]:
+        """
+        Genera un documento .astr.
+
+        Args:
+            actors, agents: contenedores con subcanvas
+            goals_per_subcanvas: elementos dentro de cada subcanvas
+            dependencies_per_actor: dependencias simples (dependum + 2 dependency_link) por contenedor
+            composite_dependencies_per_actor: dependencias composite por contenedor
+            edge_types: tipos de las edges internas de los subcanvases
+            control_point_ratio: fracción de edges con control points
+            control_points_per_edge: control points de esas edges
+            collapsed_ratio: fracción de subcanvases guardados colapsados
+            seed: semilla del generador aleatorio
+        """
+        rng = random.Random(seed)
+        nodes: List[Dict[str, Any]] = []
+        edges: List[Dict[str, Any]] = []
+
+        def new_id():
+            return "%032x" % rng.getrandbits(128)
+
+        def add_edge(edge_type, source, target, parent_id=None):
+            edge_data = {
+                "id": new_id(),
+                "type": edge_type,
+                "source_id": source["id"],
+                "target_id": target["id"],
+                "properties": {},
+                "parent_id": parent_id,
+                "control_points": [],
+            }
+            if rng.random() < control_point_ratio:
+                edge_data["control_points"] = DiagramGenerator._control_points(
+                    rng, source["position"], target["position"], control_points_per_edge)
+            edges.append(edge_data)
+
+        # ---- Contenedores y su contenido ----
+        containers = []
+        subcanvas_radius = DiagramGenerator.subcanvas_radius(goals_per_subcanvas)
+        for index in range(actors + agents):
+            node_type = "actor" if index < actors else "agent"
+            x = (index % _GRID_COLUMNS) * _GRID_SPACING
+            y = (index // _GRID_COLUMNS) * _GRID_SPACING
+            visible = rng.random() >= collapsed_ratio
+            container = DiagramGenerator._node(
+                new_id(), node_type, x, y, radius=50.0,
+                label=f"{node_type.capitalize()} {index}", show_subcanvas=visible)
+            container["subcanvas"] = {"visible": visible, "radius": subcanvas_radius,
+                                      "original_radius": subcanvas_radius}
+            nodes.append(container)
+            containers.append(container)
+
+            elements = []
+            for position in DiagramGenerator._spiral(goals_per_subcanvas, subcanvas_radius - 30.0):
+                element_type = rng.choices(ELEMENT_TYPES, ELEMENT_WEIGHTS)[0]
+                element = DiagramGenerator._node(
+                    new_id(), element_type, position[0], position[1], radius=20.0,
+                    label=f"{element_type.replace('_', ' ')} {len(nodes)}", parent_id=container["id"])
+                nodes.append(element)
+
+                # Árbol: cada elemento se conecta con uno anterior del mismo subcanvas
+                if elements and edge_types:
+                    add_edge(rng.choice(edge_types), element, rng.choice(elements), parent_id=container["id"])
+                elements.append(element)
+
+        # ---- Dependencias entre contenedores ----
+        if len(containers) > 1:
+            for index, depender in enumerate(containers):
+                for _ in range(dependencies_per_actor):
+                    dependee = DiagramGenerator._other(rng, containers, index)
+                    x, y = DiagramGenerator._between(rng, depender["position"], dependee["position"])
+                    dependum = DiagramGenerator._node(new_id(), rng.choice(DEPENDUM_TYPES), x, y, radius=40.0,
+                                                      label=f"dependum {len(nodes)}")
+                    nodes.append(dependum)
+                    add_edge("dependency_link", depender, dependum)
+                    add_edge("dependency_link", dependum, dependee)
+
+                for _ in range(composite_dependencies_per_actor):
+                    dependee = DiagramGenerator._other(rng, containers, index)
+                    node_type = rng.choice(DEPENDUM_TYPES)
+                    x, y = DiagramGenerator._between(rng, depender["position"], dependee["position"])
+                    angle = rng.uniform(-math.pi, math.pi)
+                    internal_x, internal_y = 0.6 * math.cos(angle), 0.6 * math.sin(angle)
+                    external_id, internal_id = new_id(), new_id()
+                    composite = {
+                        "is_composite": True,
+                        "internal_position_in_subcanvas_x": internal_x,
+                        "internal_position_in_subcanvas_y": internal_y,
+                    }
+                    label = f"composite {len(nodes)}"
+                    external = DiagramGenerator._node(external_id, node_type, x, y, radius=50.0, label=label,
+                                                      model_extra=dict(composite, composite_pair=internal_id))
+                    internal = DiagramGenerator._node(internal_id, node_type,
+                                                      internal_x * subcanvas_radius, internal_y * subcanvas_radius,
+                                                      radius=50.0, label=label, parent_id=dependee["id"],
+                                                      model_extra=dict(composite, composite_pair=external_id))
+                    nodes.extend((external, internal))
+                    add_edge("dependency_link", depender, external)
+                    add_edge("dependency_link", external, dependee)
+
+        scene_data = AstrDocument.new_document(nodes, edges)
+        scene_data["metadata"]["created_by"] = "Asteroid benchmark"
+        return scene_data
+
+    @staticmethod
+    def for_element_count(element_count: int, goals_per_subcanvas: int = 20, agent_ratio: float = 0.2,
+                          dependencies_per_actor: int = 1, composite_dependencies_per_actor: int = 1,
+                          **options) -> Dict[str, Any]:
+        """Documento con aproximadamente `element_count` elementos (nodos + edges)"""
+        # Cada contenedor aporta: 1 + N elementos + (N - 1) edges internas
+        # + 3 por dependencia simple + 4 por dependencia composite
+        per_container = (2 * goals_per_subcanvas + 3 * dependencies_per_actor
+                         + 4 * composite_dependencies_per_actor)
+        containers = max(2, round(element_count / per_container))
+        agents = int(containers * agent_ratio)
+        return DiagramGenerator.generate(
+            actors=containers - agents, agents=agents, goals_per_subcanvas=goals_per_subcanvas,
+            dependencies_per_actor=dependencies_per_actor,
+            composite_dependencies_per_actor=composite_dependencies_per_actor, **options)
+
+    @staticmethod
+    def subcanvas_radius(element_count: int) -> float:
+        """Radio de subcanvas que deja sitio a `element_count` elementos de radio 20"""
+        return max(150.0, 30.0 * math.sqrt(element_count) + 60.0)
+
+    # ---------------------
+    # Auxiliares
+    # ---------------------
+    @staticmethod
+    def _node(node_id: str, node_type: str, x: float, y: float, radius: float, label: str,
+              parent_id: str = None, show_subcanvas: bool = False, model_extra: Dict = None) -> Dict[str, Any]:
+        model_properties = {
+            "show_subcanvas": show_subcanvas,
+            "x": x, "y": y, "radius": radius,
+            "label": label,
+            "color": _COLORS[node_type], "border_color": "#2c3e50", "text_color": "#ffffff",
+            "position_in_subcanvas_x": 0.0, "position_in_subcanvas_y": 0.0,
+            "content_offset_x": 0.0, "content_offset_y": 0.0,
+            "text_width": 150.0, "text_align": "center",
+        }
+        if model_extra:
+            model_properties.update(model_extra)
+        return {
+            "id": node_id,
+            "type": node_type,
+            "position": {"x": x, "y": y},
+            "properties": {"radius": radius, "label": label, "text_width": 150.0, "text_align": "center"},
+            "parent_id": parent_id,
+            "model_properties": model_properties,
+        }
+
+    @staticmethod
+    def _spiral(count: int, radius: float):
+        """Posiciones repartidas en un disco (espiral de Fermat) alrededor del origen"""
+        golden_angle = math.pi * (3.0 - math.sqrt(5.0))
+        for index in range(count):
+            distance = radius * math.sqrt((index + 0.5) / max(count, 1))
+            angle = index * golden_angle
+            yield round(distance * math.cos(angle), 2), round(distance * math.sin(angle), 2)
+
+    @staticmethod
+    def _control_points(rng: random.Random, source: Dict, target: Dict, count: int) -> List[Dict[str, float]]:
+        """Puntos a lo largo del segmento source-target con un desvío lateral"""
+        dx, dy = target["x"] - source["x"], target["y"] - source["y"]
+        length = math.hypot(dx, dy) or 1.0
+        normal_x, normal_y = -dy / length, dx / length
+        points = []
+        for index in range(count):
+            t = (index + 1) / (count + 1)
+            offset = rng.uniform(-0.25, 0.25) * length
+            points.append({"x": round(source["x"] + dx * t + normal_x * offset, 2),
+                           "y": round(source["y"] + dy * t + normal_y * offset, 2)})
+        return points
+
+    @staticmethod
+    def _other(rng: random.Random, containers: List[Dict], index: int) -> Dict:
+        """Otro contenedor, preferentemente cercano en la rejilla"""
+        offset = rng.choice((1, 1, 1, _GRID_COLUMNS, rng.randrange(1, len(containers))))
+        other = (index + offset) % len(containers)
+        return containers[other if other != index else (index + 1) % len(containers)]
+
+    @staticmethod
+    def _between(rng: random.Random, a: Dict, b: Dict):
+        t = rng.uniform(0.35, 0.65)
+        return (round(a["x"] + (b["x"] - a["x"]) * t, 2),
+                round(a["y"] + (b["y"] - a["y"]) * t + rng.uniform(-120.0, 120.0), 2))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Genera un diagrama i*/Tropos sintético")
+    parser.add_argument("elements", type=int, help="Cantidad aproximada de elementos (nodos + edges)")
+    parser.add_argument("--output", "-o", required=True, help="Archivo de salida (.astr, .astrb, .astr.gz...)")
+    parser.add_argument("--goals", type=int, default=20, help="Elementos por subcanvas")
+    parser.add_argument("--control-points", type=float, default=0.1, help="Fracción de edges con control points")
+    parser.add_argument("--collapsed", type=float, default=0.0, help="Fracción de subcanvases colapsados")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    scene_data = DiagramGenerator.for_element_count(
+        args.elements, goals_per_subcanvas=args.goals, control_point_ratio=args.control_points,
+        collapsed_ratio=args.collapsed, seed=args.seed)
+    AstrDocument.write_file(scene_data, args.output)
+    print(f"{args.output}: {len(scene_data['nodes'])} nodos, {len(scene_data['edges'])} edges")
+
+
+if __name__ == "__main__":
+    main()
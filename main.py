@@ -5,16 +5,29 @@
 # Licencia: MIT License
 # ---------------------------------------------------
 
+import argparse
 import sys
 from PyQt6.QtWidgets import QApplication
+from app.log import configure_logging
+from app.profiling import configure_profiling, flush_render_profile
 from app.ui.main_window import MainWindow
 
 
 def main():
-    app = QApplication(sys.argv)
+    parser = argparse.ArgumentParser(add_help=False)
+    parser.add_argument("--profile", default=None)
+    args, qt_argv = parser.parse_known_args(sys.argv[1:])
+
+    # Silencioso salvo que se pida con ASTEROID_LOG (p. ej. ASTEROID_LOG=info)
+    configure_logging()
+    # Perfiles de carga/guardado/exportación/pintado con --profile DIR o ASTEROID_PROFILE=DIR
+    configure_profiling(args.profile)
+    app = QApplication(sys.argv[:1] + qt_argv)
     window = MainWindow()
     window.show()
-    sys.exit(app.exec())
+    status = app.exec()
+    flush_render_profile()
+    sys.exit(status)
 
 
 if __name__ == "__main__":
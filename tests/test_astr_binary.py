@@ -0,0 +1,59 @@
+# ---------------------------------------------------
+# Proyecto: Asteroid
+# Autor: Daryll Lorenzo Alfonso
+# Año: 2025
+# Licencia: MIT License
+# ---------------------------------------------------
+"""Ida y vuelta del contenedor binario (.astrb) con columnas irregulares."""
+import unittest
+
+from app.core.astr_binary import AstrBinaryFormat
+from app.core.astr_document import AstrDocument
+
+
+def _node(node_id, properties, parent_id=None):
+    return {"id": node_id, "type": "plan", "parent_id": parent_id, "properties": properties}
+
+
+def _round_trip(nodes, edges=()):
+    scene_data = {"version": AstrDocument.VERSION, "metadata": {}, "nodes": list(nodes), "edges": list(edges)}
+    return AstrBinaryFormat.decode(AstrBinaryFormat.encode(scene_data))
+
+
+class AstrBinaryRoundTripTest(unittest.TestCase):
+
+    def assertNodesRoundTrip(self, nodes):
+        decoded = _round_trip(nodes)["nodes"]
+        self.assertEqual([n["properties"] for n in decoded], [n["properties"] for n in nodes])
+        return decoded
+
+    def test_all_null_column(self):
+        self.assertNodesRoundTrip([_node("a", {"label": None}), _node("b", {"label": None})])
+
+    def test_null_and_absent_rows_in_string_column(self):
+        self.assertNodesRoundTrip([_node("a", {"label": "x"}), _node("b", {"label": None}), _node("c", {})])
+
+    def test_list_on_some_rows(self):
+        self.assertNodesRoundTrip([_node("a", {"tags": [1, 2]}), _node("b", {}), _node("c", {"tags": None})])
+
+    def test_mixed_str_int_column(self):
+        self.assertNodesRoundTrip([_node("a", {"value": "x"}), _node("b", {"value": 3}), _node("c", {})])
+
+    def test_mixed_int_float_column_keeps_large_ints(self):
+        big = 2 ** 24 + 1
+        decoded = self.assertNodesRoundTrip([_node("a", {"value": 0.5}), _node("b", {"value": big})])
+        self.assertEqual(int(decoded[1]["properties"]["value"]), big)
+
+    def test_references_and_control_points(self):
+        nodes = [_node("a", {"label": "a"}), _node("b", {"label": "b"}, parent_id="a")]
+        edges = [{"id": "e", "type": "simple", "source_id": "a", "target_id": "b", "parent_id": None,
+                  "properties": {}, "control_points": [{"x": 1.5, "y": -2.0}]}]
+        decoded = _round_trip(nodes, edges)
+        self.assertEqual(decoded["nodes"][1]["parent_id"], "a")
+        edge = decoded["edges"][0]
+        self.assertEqual((edge["id"], edge["source_id"], edge["target_id"]), ("e", "a", "b"))
+        self.assertEqual(edge["control_points"], [{"x": 1.5, "y": -2.0}])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,56 @@
+# ---------------------------------------------------
+# Proyecto: Asteroid
+# Autor: Daryll Lorenzo Alfonso
+# Año: 2025
+# Licencia: MIT License
+# ---------------------------------------------------
+"""Documentos antiguos frente a los actuales: la versión decide cómo se tratan los ids."""
+import unittest
+
+from app.core.astr_document import AstrDocument
+from app.core.astr_validator import AstrValidator
+
+
+def _document(version, node_ids, edge_id):
+    nodes = [{"id": node_ids[0], "type": "actor", "parent_id": None, "position": {"x": 0, "y": 0}},
+             {"id": node_ids[1], "type": "plan", "parent_id": node_ids[0], "position": {"x": 10, "y": 0}}]
+    edge = {"type": "means_end", "source_id": node_ids[1], "target_id": node_ids[1], "parent_id": node_ids[0]}
+    if edge_id is not None:
+        edge["id"] = edge_id
+    return {"version": version, "metadata": {}, "nodes": nodes, "edges": [edge]}
+
+
+class DocumentVersionTest(unittest.TestCase):
+
+    def test_version_of(self):
+        self.assertEqual(AstrDocument.version_of({"version": "1.4"}), (1, 4))
+        self.assertEqual(AstrDocument.version_of({}), (0,))
+        self.assertEqual(AstrDocument.version_of({"version": "x"}), (0,))
+
+    def test_legacy_document_gets_fresh_ids(self):
+        scene_data = _document("1.4", [0, 1], None)
+        self.assertEqual(AstrValidator.errors(AstrValidator.validate(scene_data)), [])
+        self.assertFalse(AstrDocument.has_stable_ids(scene_data))
+
+        AstrDocument.assign_fresh_ids(scene_data)
+        self.assertTrue(AstrDocument.has_stable_ids(scene_data))
+        parent, child = scene_data["nodes"]
+        edge = scene_data["edges"][0]
+        self.assertEqual(child["parent_id"], parent["id"])
+        self.assertEqual((edge["source_id"], edge["parent_id"]), (child["id"], parent["id"]))
+        self.assertIsInstance(edge["id"], str)
+        self.assertEqual(AstrValidator.errors(AstrValidator.validate(scene_data)), [])
+
+    def test_legacy_string_ids_are_replaced_too(self):
+        # La versión, no la forma de los ids, decide si son persistentes
+        self.assertFalse(AstrDocument.has_stable_ids(_document("1.4", ["a", "b"], "e")))
+
+    def test_current_document_requires_string_ids(self):
+        self.assertTrue(AstrDocument.has_stable_ids(_document(AstrDocument.VERSION, ["a", "b"], "e")))
+        errors = AstrValidator.errors(AstrValidator.validate(_document(AstrDocument.VERSION, [0, 1], None)))
+        paths = {issue["path"] for issue in errors}
+        self.assertLessEqual({"nodes[0].id", "nodes[1].id", "edges[0].id"}, paths)
+
+
+if __name__ == "__main__":
+    unittest.main()
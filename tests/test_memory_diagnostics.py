@@ -0,0 +1,61 @@
+# ---------------------------------------------------
+# Proyecto: Asteroid
+# Autor: Daryll Lorenzo Alfonso
+# Año: 2025
+# Licencia: MIT License
+# ---------------------------------------------------
+"""Ciclos cargar -> limpiar sobre un diagrama pequeño: el estado debe ser estable."""
+import os
+import tempfile
+import unittest
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt6.QtWidgets import QApplication
+from app.controllers.canvas_controller import CanvasController
+from app.core.astr_document import AstrDocument
+from app.ui.canvas import Canvas
+from app.ui.components.base_node_item import BaseNodeItem
+from app.utils.memory_diagnostics import MemoryDiagnostics
+from benchmarks.diagram_generator import DiagramGenerator
+
+
+class MemoryLifecycleTest(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.app = QApplication.instance() or QApplication([])
+        cls.canvas = Canvas()
+        cls.controller = CanvasController(cls.canvas)
+        cls.controller.interactive = False
+        cls.directory = tempfile.TemporaryDirectory()
+        cls.filename = os.path.join(cls.directory.name, "diagram.astr")
+        scene_data = DiagramGenerator.generate(actors=3, agents=1, goals_per_subcanvas=6, collapsed_ratio=0.5)
+        AstrDocument.write_file(scene_data, cls.filename)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.directory.cleanup()
+
+    def test_load_clear_cycles_are_steady(self):
+        report = MemoryDiagnostics.lifecycle(self.controller, self.filename, cycles=3)
+        self.assertEqual(report["leaked"], {})
+        self.assertTrue(report["steady"], report["top_growth"])
+        self.assertGreater(report["cycles"][0]["loaded_elements"], 0)
+
+    def test_methods_using_super_are_not_callbacks(self):
+        # Tienen __closure__ (celda __class__) pero no son closures anidadas
+        self.assertIsNotNone(BaseNodeItem.__init__.__closure__)
+        self.assertIsNone(MemoryDiagnostics._category(BaseNodeItem.__init__))
+
+    def test_nested_closures_are_callbacks(self):
+        def make_callback(value):
+            return lambda: value
+
+        callback = make_callback(1)
+        callback.__module__ = "app.tests"
+        self.assertEqual(MemoryDiagnostics._category(callback), "callbacks")
+
+
+if __name__ == "__main__":
+    unittest.main()